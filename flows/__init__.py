@@ -6,6 +6,6 @@ and machine learning pipelines showcased in the portfolio.
 """
 
 from .data_flows import load_and_process_data
-from .ml_flows import train_model, evaluate_model
+from .ml_flows import train_model, tune_model, benchmark_engines, evaluate_model, batch_predict
 from .etl_flows import extract_transform_load
 from .visualization_flows import generate_visualizations 
\ No newline at end of file
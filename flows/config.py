@@ -43,6 +43,24 @@ ML_TRAINING_FLOW = FlowConfig(
     tags=["ml", "training", "portfolio"],
 )
 
+ML_TUNING_FLOW = FlowConfig(
+    name="ml-tuning",
+    description="Search model hyperparameters and train the best models",
+    tags=["ml", "tuning", "portfolio"],
+)
+
+ML_BENCHMARK_FLOW = FlowConfig(
+    name="ml-benchmark",
+    description="Compare training time and accuracy of model engines",
+    tags=["ml", "benchmark", "portfolio"],
+)
+
+BATCH_PREDICTION_FLOW = FlowConfig(
+    name="batch-prediction",
+    description="Score datasets with trained models in parallel chunks",
+    tags=["ml", "prediction", "portfolio"],
+)
+
 ML_EVALUATION_FLOW = FlowConfig(
     name="ml-evaluation",
     description="Evaluate machine learning models and generate metrics",
@@ -68,37 +86,236 @@ DATASETS = {
         "url": "https://raw.githubusercontent.com/IBM/telco-customer-churn-on-icp4d/master/data/Telco-Customer-Churn.csv",
         "description": "Telco customer churn dataset",
         "target": "Churn",
+        "key": "customerID",
+        "sha256": None,
     },
     "housing": {
         "filename": "housing.csv",
         "url": "https://raw.githubusercontent.com/ageron/handson-ml2/master/datasets/housing/housing.csv",
         "description": "California housing dataset",
         "target": "median_house_value",
+        "key": None,
+        "sha256": None,
     },
     "iris": {
         "filename": "iris.csv",
         "url": "https://raw.githubusercontent.com/mwaskom/seaborn-data/master/iris.csv",
         "description": "Iris flower dataset",
         "target": "species",
+        "key": None,
+        "sha256": None,
     },
 }
 
-# Model configurations
+# Download settings for raw datasets. A dataset entry may pin its content with
+# a hex "sha256" digest; downloads that do not match are discarded.
+DOWNLOAD_SETTINGS = {
+    "stream": True,
+    "chunk_size": 1024 * 1024,  # 1 MB
+    "timeout_seconds": 60,
+}
+
+# Storage settings for processed datasets. Parquet keeps dtypes (including
+# categoricals) across the round trip; "csv" is still supported.
+STORAGE_SETTINGS = {
+    "format": "parquet",
+    "compression": "snappy",
+}
+
+# Profiling settings for analyze_dataset. Above the row threshold, quantiles
+# come from a uniform row sample and distinct counts from HyperLogLog.
+PROFILING_SETTINGS = {
+    "approximate_threshold_rows": 1_000_000,
+    "sample_size": 100_000,
+    "hll_precision": 14,
+}
+
+# Task caching settings. Bump "code_version" to invalidate cached results
+# when something outside the flows package (e.g. a library upgrade) changes.
+CACHE_SETTINGS = {
+    "code_version": "1",
+    "expiration_hours": 24,
+}
+
+# Incremental processing settings. The watermark records how far into the
+# raw file a dataset has been processed; the fingerprint is a hash of the
+# bytes just before that offset, used to detect rewritten (not appended) files.
+# The hashes of the processed rows (8 bytes per distinct row) are kept next to
+# it, so rows appended again in a later run are dropped as duplicates.
+INCREMENTAL_SETTINGS = {
+    "chunksize": 100_000,
+    "fingerprint_bytes": 4096,
+}
+
+# Dtype optimization settings for clean_dataset. String columns with at most
+# "max_categories" distinct values (and no more than "max_category_ratio" of
+# the row count) are stored as categoricals. Integers are downcast no further
+# than "min_integer_dtype": arithmetic on int8/int16 columns (tenure * 12, sums
+# of products) silently wraps around, so narrower widths are opt-in.
+DTYPE_SETTINGS = {
+    "max_categories": 50,
+    "max_category_ratio": 0.5,
+    "min_integer_dtype": "int32",
+}
+
+# Database settings. Multi-row INSERT statements are sized so rows * columns
+# stays under "max_parameters". Engines are pooled per connection string
+# (a SQLAlchemy URL or the name of a SqlAlchemyConnector block).
+DATABASE_SETTINGS = {
+    "batch_size": 10_000,
+    "max_parameters": 30_000,
+    "staging_suffix": "__staging",
+    "pool_size": 5,
+    "max_overflow": 10,
+    "pool_pre_ping": True,
+    "pool_recycle_seconds": 1800,
+}
+
+# HTTP extraction settings for URL sources. "pipe_chunks" bounds how many
+# downloaded chunks may wait for the parser.
+HTTP_SETTINGS = {
+    "http2": True,
+    "timeout_seconds": 60,
+    "max_connections": 20,
+    "max_concurrent_pages": 8,
+    "chunk_size": 256 * 1024,
+    "pipe_chunks": 16,
+}
+
+# Partitioned Parquet dataset settings. Files are split at "max_rows_per_file"
+# rows and row groups (the unit of predicate pushdown) at "max_rows_per_group".
+PARTITION_SETTINGS = {
+    "max_rows_per_file": 1_000_000,
+    "max_rows_per_group": 128 * 1024,
+    "max_partitions": 1024,
+}
+
+# Model training settings. Algorithms are trained in parallel worker
+# processes that share a budget of "max_cores" CPU cores (all cores if None);
+# each algorithm gets an equal share for its CV folds and final fit.
+# "final_model" selects what is deployed after cross-validation: "refit"
+# fits the model once more on the full training set, "ensemble" reuses the
+# fold models (averaging their predictions) and skips that extra fit.
+TRAINING_SETTINGS = {
+    "max_cores": None,
+    "max_parallel_models": 4,
+    "final_model": "refit",
+}
+
+# Preprocessed CV fold cache. Transformed fold matrices of at least
+# "mmap_threshold_mb" are memory-mapped when loaded. When new folds are stored,
+# caches unused for "max_age_days" are removed, then the least recently used
+# ones until the cache takes at most "max_size_mb" (None disables either limit).
+FOLD_CACHE_SETTINGS = {
+    "cache_dir": BASE_DATA_DIR / "cache" / "folds",
+    "mmap_threshold_mb": 64,
+    "max_age_days": 14,
+    "max_size_mb": 2048,
+}
+
+# Hyperparameter search (see flows/tuning.py). "method" is "grid", "random",
+# "halving" or "hyperband"; halving starts candidates on at least
+# "min_samples" rows per fold and keeps the best 1/"eta" at each rung.
+# Trials whose mean score after "prune_after_folds" folds is below the
+# median of earlier trials are stopped. Trial results are cached under
+# "cache_dir", so interrupted searches resume.
+TUNING_SETTINGS = {
+    "cache_dir": BASE_DATA_DIR / "cache" / "trials",
+    "method": "random",
+    "n_trials": 20,
+    "eta": 3,
+    "min_samples": 100,
+    "prune_after_folds": 2,
+    "random_state": 42,
+}
+
+# Batch prediction. Inputs are scored in chunks of "chunksize" rows by up to
+# "max_workers" processes (the training core budget if None); predictions
+# go to "output_dir" unless an output path is given.
+BATCH_PREDICTION_SETTINGS = {
+    "chunksize": 100_000,
+    "max_workers": None,
+    "output_dir": BASE_DATA_DIR / "predictions",
+}
+
+# Model configurations. "search_spaces" declares the hyperparameters searched
+# per algorithm: a list of values or a {"low", "high", "log", "type"} range.
+# "engines" selects the implementation of algorithms that have several (see
+# ENGINES in ml_flows): "hist" gradient boosting bins the features and
+# handles categories natively, and trains much faster than "classic".
 MODELS = {
     "customer_churn": {
         "algorithms": ["random_forest", "gradient_boosting", "logistic_regression"],
         "metrics": ["accuracy", "precision", "recall", "f1", "roc_auc"],
         "cv_folds": 5,
+        "engines": {"gradient_boosting": "hist"},
+        "search_spaces": {
+            "random_forest": {
+                "n_estimators": [100, 200, 400],
+                "max_depth": [None, 5, 10, 20],
+                "min_samples_split": {"low": 2, "high": 20, "type": "int"},
+            },
+            "gradient_boosting": {
+                "n_estimators": [100, 200],
+                "learning_rate": {"low": 0.01, "high": 0.3, "log": True},
+                "max_depth": [2, 3, 4],
+            },
+            "hist_gradient_boosting": {
+                "learning_rate": {"low": 0.01, "high": 0.3, "log": True},
+                "max_leaf_nodes": [15, 31, 63],
+                "min_samples_leaf": {"low": 5, "high": 50, "type": "int"},
+                "l2_regularization": {"low": 1e-4, "high": 10.0, "log": True},
+            },
+            "logistic_regression": {
+                "C": {"low": 0.01, "high": 100.0, "log": True},
+            },
+        },
     },
     "housing": {
         "algorithms": ["random_forest", "gradient_boosting", "linear_regression"],
         "metrics": ["rmse", "mae", "r2"],
         "cv_folds": 5,
+        "engines": {"gradient_boosting": "hist"},
+        "search_spaces": {
+            "random_forest": {
+                "n_estimators": [100, 200, 400],
+                "max_depth": [None, 10, 20],
+                "min_samples_split": {"low": 2, "high": 20, "type": "int"},
+            },
+            "gradient_boosting": {
+                "n_estimators": [100, 200, 400],
+                "learning_rate": {"low": 0.01, "high": 0.3, "log": True},
+                "max_depth": [3, 4, 5],
+            },
+            "hist_gradient_boosting": {
+                "learning_rate": {"low": 0.01, "high": 0.3, "log": True},
+                "max_leaf_nodes": [15, 31, 63],
+                "min_samples_leaf": {"low": 5, "high": 50, "type": "int"},
+                "l2_regularization": {"low": 1e-4, "high": 10.0, "log": True},
+            },
+            "linear_regression": {
+                "fit_intercept": [True, False],
+            },
+        },
     },
     "iris": {
         "algorithms": ["random_forest", "svm", "knn"],
         "metrics": ["accuracy", "precision", "recall", "f1"],
         "cv_folds": 5,
+        "search_spaces": {
+            "random_forest": {
+                "n_estimators": [50, 100, 200],
+                "max_depth": [None, 3, 5],
+            },
+            "svm": {
+                "C": {"low": 0.01, "high": 100.0, "log": True},
+                "kernel": ["rbf", "linear"],
+            },
+            "knn": {
+                "n_neighbors": {"low": 1, "high": 30, "type": "int"},
+                "weights": ["uniform", "distance"],
+            },
+        },
     },
 }
 
@@ -106,4 +323,6 @@ MODELS = {
 DEPLOYMENT_SETTINGS = {
     "work_queue_name": "portfolio",
     "interval_seconds": 3600 * 24,  # Daily
+    # Scheduled runs revalidate raw datasets with conditional GET requests
+    "refresh_datasets": True,
 } 
\ No newline at end of file
@@ -2,11 +2,13 @@
 Data processing flows for the Streamlit portfolio.
 """
 
+import os
+import json
+import hashlib
 import pandas as pd
 import numpy as np
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Union, Tuple
-from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler, OneHotEncoder
 from sklearn.compose import ColumnTransformer
 from sklearn.pipeline import Pipeline
@@ -15,25 +17,57 @@ from sklearn.impute import SimpleImputer
 from prefect import flow, task, get_run_logger
 from prefect.artifacts import create_markdown_artifact
 from prefect.tasks import task_input_hash
-from datetime import timedelta
+from datetime import datetime, timedelta
 
-from .config import DATA_PROCESSING_FLOW, DATASETS
+from .config import (
+    DATA_PROCESSING_FLOW,
+    DATASETS,
+    DEPLOYMENT_SETTINGS,
+    CACHE_SETTINGS,
+    INCREMENTAL_SETTINGS,
+    PROCESSED_DATA_DIR,
+    STORAGE_SETTINGS,
+)
+from .dtypes import (
+    apply_dtype_plan,
+    dtype_plan_fits,
+    merge_column_summaries,
+    plan_dtypes,
+    plan_dtypes_for_frame,
+    summarize_columns,
+)
+from .encoding import detect_binary_columns, encode_binary_columns
+from .profiling import profile_dataframe
+from .splitting import assign_splits_by_hash, split_indices
 from .utils import (
     download_dataset,
     load_dataset,
+    iter_dataset_chunks,
+    processed_dataset_path,
     save_dataset,
+    DatasetWriter,
+    content_cache_key,
     log_flow_run_info,
 )
 
+# Cached stages are keyed by source content, so they can be kept for a while
+CACHE_EXPIRATION = timedelta(hours=CACHE_SETTINGS["expiration_hours"])
+
 
-@task(cache_key_fn=task_input_hash, cache_expiration=timedelta(hours=24))
-def analyze_dataset(df: pd.DataFrame, dataset_name: str) -> Dict:
+@task(cache_key_fn=content_cache_key, cache_expiration=CACHE_EXPIRATION)
+def analyze_dataset(
+    df: pd.DataFrame,
+    dataset_name: str,
+    approximate: Optional[bool] = None,
+) -> Dict:
     """
     Analyze a dataset and return summary statistics.
     
     Args:
         df: DataFrame to analyze
         dataset_name: Name of the dataset
+        approximate: Whether to use approximate quantiles and distinct counts
+            (defaults to PROFILING_SETTINGS based on the row count)
         
     Returns:
         Dictionary with dataset analysis
@@ -41,40 +75,9 @@ def analyze_dataset(df: pd.DataFrame, dataset_name: str) -> Dict:
     logger = get_run_logger()
     logger.info(f"Analyzing dataset {dataset_name} with shape {df.shape}")
     
-    # Basic statistics
-    analysis = {
-        "dataset_name": dataset_name,
-        "shape": df.shape,
-        "columns": list(df.columns),
-        "dtypes": {col: str(dtype) for col, dtype in df.dtypes.items()},
-        "missing_values": df.isnull().sum().to_dict(),
-        "missing_percentage": (df.isnull().sum() / len(df) * 100).to_dict(),
-    }
-    
-    # Numeric columns statistics
-    numeric_cols = df.select_dtypes(include=["number"]).columns
-    if len(numeric_cols) > 0:
-        analysis["numeric_stats"] = {
-            col: {
-                "min": df[col].min(),
-                "max": df[col].max(),
-                "mean": df[col].mean(),
-                "median": df[col].median(),
-                "std": df[col].std(),
-            }
-            for col in numeric_cols
-        }
-    
-    # Categorical columns statistics
-    categorical_cols = df.select_dtypes(include=["object", "category"]).columns
-    if len(categorical_cols) > 0:
-        analysis["categorical_stats"] = {
-            col: {
-                "unique_values": df[col].nunique(),
-                "top_values": df[col].value_counts().head(5).to_dict(),
-            }
-            for col in categorical_cols
-        }
+    analysis = profile_dataframe(df, dataset_name, approximate=approximate)
+    numeric_cols = list(analysis.get("numeric_stats", {}))
+    categorical_cols = list(analysis.get("categorical_stats", {}))
     
     # Create artifact
     create_markdown_artifact(
@@ -92,14 +95,126 @@ def analyze_dataset(df: pd.DataFrame, dataset_name: str) -> Dict:
     return analysis
 
 
-@task
-def clean_dataset(df: pd.DataFrame, dataset_name: str) -> pd.DataFrame:
+def _fill_strategies(
+    numeric_cols: List[str],
+    categorical_cols: List[str],
+    dataset_name: str,
+) -> Dict[str, str]:
+    """
+    Get the missing-value fill strategy for each column of a dataset.
+    
+    Args:
+        numeric_cols: Numeric columns of the dataset
+        categorical_cols: Categorical columns of the dataset
+        dataset_name: Name of the dataset
+        
+    Returns:
+        Dictionary mapping column names to "median" or "mode"
+    """
+    if dataset_name == "customer_churn":
+        # Fill missing numeric values with median, categorical values with mode
+        strategies = {col: "median" for col in numeric_cols}
+        strategies.update({col: "mode" for col in categorical_cols})
+        return strategies
+    
+    elif dataset_name == "housing":
+        # Handle specific columns
+        return {col: "median" for col in ["total_bedrooms"] if col in numeric_cols}
+    
+    return {}
+
+
+def _median_from_counts(counts: pd.Series) -> float:
+    """
+    Compute the exact median of a column from its value counts.
+    
+    Args:
+        counts: Value counts of the column
+        
+    Returns:
+        Median value
+    """
+    counts = counts.sort_index()
+    cumulative = counts.cumsum().to_numpy()
+    total = cumulative[-1]
+    
+    # Positions of the middle element(s) in the sorted column
+    lower = counts.index[np.searchsorted(cumulative, (total - 1) // 2, side="right")]
+    upper = counts.index[np.searchsorted(cumulative, total // 2, side="right")]
+    return (lower + upper) / 2
+
+
+def _transform_frame(
+    df: pd.DataFrame,
+    dataset_name: str,
+    yes_no_columns: Optional[List[str]] = None,
+) -> pd.DataFrame:
+    """
+    Apply the dataset-specific transformations to a DataFrame in place.
+    
+    Args:
+        df: DataFrame to transform (modified in place)
+        dataset_name: Name of the dataset
+        yes_no_columns: Yes/No columns to encode (detected from df if None)
+        
+    Returns:
+        Transformed DataFrame
+    """
+    # Yes/No columns stored as booleans by clean_dataset become 0/1
+    encode_binary_columns(df, [col for col in df.columns if df[col].dtype == "boolean"])
+    
+    if dataset_name == "customer_churn":
+        # Convert Yes/No to 1/0 for the target and all Yes/No columns at once
+        if yes_no_columns is None:
+            yes_no_columns = detect_binary_columns(df)
+        
+        target_cols = ["Churn"] if "Churn" in df.columns else []
+        encode_binary_columns(df, target_cols + [col for col in yes_no_columns if col != "Churn"])
+        
+        # Convert TotalCharges to numeric
+        if "TotalCharges" in df.columns:
+            df["TotalCharges"] = pd.to_numeric(df["TotalCharges"], errors="coerce")
+            
+        # Create tenure groups
+        if "tenure" in df.columns:
+            df["tenure_group"] = pd.cut(
+                df["tenure"],
+                bins=[0, 12, 24, 36, 48, 60, 72],
+                labels=["0-1 year", "1-2 years", "2-3 years", "3-4 years", "4-5 years", "5+ years"]
+            )
+    
+    elif dataset_name == "housing":
+        # Create new features
+        if all(col in df.columns for col in ["total_rooms", "households"]):
+            df["rooms_per_household"] = df["total_rooms"] / df["households"]
+        
+        if all(col in df.columns for col in ["total_bedrooms", "total_rooms"]):
+            df["bedrooms_ratio"] = df["total_bedrooms"] / df["total_rooms"]
+        
+        if all(col in df.columns for col in ["population", "households"]):
+            df["population_per_household"] = df["population"] / df["households"]
+        
+        # Log transform skewed features
+        if "median_house_value" in df.columns:
+            df["median_house_value_log"] = np.log1p(df["median_house_value"])
+    
+    return df
+
+
+@task(cache_key_fn=content_cache_key, cache_expiration=CACHE_EXPIRATION)
+def clean_dataset(
+    df: pd.DataFrame,
+    dataset_name: str,
+    downcast: bool = True,
+) -> pd.DataFrame:
     """
     Clean a dataset by handling missing values, duplicates, and outliers.
     
     Args:
         df: DataFrame to clean
         dataset_name: Name of the dataset
+        downcast: Whether to convert columns to compact dtypes (categoricals,
+            nullable booleans and narrow numbers)
         
     Returns:
         Cleaned DataFrame
@@ -107,40 +222,42 @@ def clean_dataset(df: pd.DataFrame, dataset_name: str) -> pd.DataFrame:
     logger = get_run_logger()
     logger.info(f"Cleaning dataset {dataset_name}")
     
-    # Make a copy to avoid modifying the original
-    df_clean = df.copy()
-    
-    # Remove duplicates
-    initial_rows = len(df_clean)
-    df_clean = df_clean.drop_duplicates()
+    # Remove duplicates (returns a new frame, leaving the original untouched)
+    initial_rows = len(df)
+    df_clean = df.drop_duplicates()
     duplicates_removed = initial_rows - len(df_clean)
     logger.info(f"Removed {duplicates_removed} duplicate rows")
     
     # Handle missing values based on dataset
-    if dataset_name == "customer_churn":
-        # For customer churn dataset
-        # Fill missing numeric values with median
-        numeric_cols = df_clean.select_dtypes(include=["number"]).columns
-        for col in numeric_cols:
-            if df_clean[col].isnull().sum() > 0:
-                df_clean[col] = df_clean[col].fillna(df_clean[col].median())
-        
-        # Fill missing categorical values with mode
-        categorical_cols = df_clean.select_dtypes(include=["object", "category"]).columns
-        for col in categorical_cols:
-            if df_clean[col].isnull().sum() > 0:
-                df_clean[col] = df_clean[col].fillna(df_clean[col].mode()[0])
-    
-    elif dataset_name == "housing":
-        # For housing dataset
-        # Handle specific columns
-        if "total_bedrooms" in df_clean.columns and df_clean["total_bedrooms"].isnull().sum() > 0:
-            df_clean["total_bedrooms"] = df_clean["total_bedrooms"].fillna(df_clean["total_bedrooms"].median())
+    strategies = _fill_strategies(
+        df_clean.select_dtypes(include=["number"]).columns.tolist(),
+        df_clean.select_dtypes(include=["object", "category"]).columns.tolist(),
+        dataset_name,
+    )
+    missing = df_clean.isnull().sum()
+    fill_values = {
+        col: df_clean[col].median() if strategy == "median" else df_clean[col].mode()[0]
+        for col, strategy in strategies.items()
+        if missing[col] > 0
+    }
+    if fill_values:
+        df_clean = df_clean.fillna(fill_values)
     
     # Log missing values after cleaning
     missing_after = df_clean.isnull().sum().sum()
     logger.info(f"Missing values after cleaning: {missing_after}")
     
+    # Downcast to compact dtypes
+    memory_before = df_clean.memory_usage(deep=True).sum()
+    dtype_plan = plan_dtypes_for_frame(df_clean) if downcast else {}
+    if dtype_plan:
+        df_clean = apply_dtype_plan(df_clean, dtype_plan)
+    memory_after = df_clean.memory_usage(deep=True).sum()
+    logger.info(
+        f"Downcast {len(dtype_plan)} columns: memory {memory_before / 1e6:.1f} MB -> "
+        f"{memory_after / 1e6:.1f} MB"
+    )
+    
     # Create artifact
     create_markdown_artifact(
         markdown=f"## Dataset Cleaning: {dataset_name}\n\n"
@@ -148,14 +265,18 @@ def clean_dataset(df: pd.DataFrame, dataset_name: str) -> pd.DataFrame:
                 f"- **Cleaned Shape**: {df_clean.shape}\n"
                 f"- **Duplicates Removed**: {duplicates_removed}\n"
                 f"- **Missing Values Before**: {df.isnull().sum().sum()}\n"
-                f"- **Missing Values After**: {missing_after}",
+                f"- **Missing Values After**: {missing_after}\n"
+                f"- **Columns Downcast**: {len(dtype_plan)}\n"
+                f"- **Memory Before**: {memory_before / 1e6:.2f} MB\n"
+                f"- **Memory After**: {memory_after / 1e6:.2f} MB "
+                f"({1 - memory_after / max(memory_before, 1):.0%} saved)",
         key=f"dataset-cleaning-{dataset_name}",
     )
     
     return df_clean
 
 
-@task
+@task(cache_key_fn=content_cache_key, cache_expiration=CACHE_EXPIRATION)
 def transform_dataset(df: pd.DataFrame, dataset_name: str) -> pd.DataFrame:
     """
     Transform a dataset by creating new features, encoding categorical variables, etc.
@@ -171,50 +292,7 @@ def transform_dataset(df: pd.DataFrame, dataset_name: str) -> pd.DataFrame:
     logger.info(f"Transforming dataset {dataset_name}")
     
     # Make a copy to avoid modifying the original
-    df_transformed = df.copy()
-    
-    # Dataset-specific transformations
-    if dataset_name == "customer_churn":
-        # Convert Yes/No to 1/0 for target variable
-        if "Churn" in df_transformed.columns:
-            df_transformed["Churn"] = df_transformed["Churn"].map({"Yes": 1, "No": 0})
-        
-        # Convert categorical Yes/No columns to 1/0
-        yes_no_columns = [
-            col for col in df_transformed.columns
-            if df_transformed[col].dtype == "object" and 
-            set(df_transformed[col].dropna().unique()).issubset({"Yes", "No"})
-        ]
-        
-        for col in yes_no_columns:
-            df_transformed[col] = df_transformed[col].map({"Yes": 1, "No": 0})
-        
-        # Convert TotalCharges to numeric
-        if "TotalCharges" in df_transformed.columns:
-            df_transformed["TotalCharges"] = pd.to_numeric(df_transformed["TotalCharges"], errors="coerce")
-            
-        # Create tenure groups
-        if "tenure" in df_transformed.columns:
-            df_transformed["tenure_group"] = pd.cut(
-                df_transformed["tenure"],
-                bins=[0, 12, 24, 36, 48, 60, 72],
-                labels=["0-1 year", "1-2 years", "2-3 years", "3-4 years", "4-5 years", "5+ years"]
-            )
-    
-    elif dataset_name == "housing":
-        # Create new features
-        if all(col in df_transformed.columns for col in ["total_rooms", "households"]):
-            df_transformed["rooms_per_household"] = df_transformed["total_rooms"] / df_transformed["households"]
-        
-        if all(col in df_transformed.columns for col in ["total_bedrooms", "total_rooms"]):
-            df_transformed["bedrooms_ratio"] = df_transformed["total_bedrooms"] / df_transformed["total_rooms"]
-        
-        if all(col in df_transformed.columns for col in ["population", "households"]):
-            df_transformed["population_per_household"] = df_transformed["population"] / df_transformed["households"]
-        
-        # Log transform skewed features
-        if "median_house_value" in df_transformed.columns:
-            df_transformed["median_house_value_log"] = np.log1p(df_transformed["median_house_value"])
+    df_transformed = _transform_frame(df.copy(), dataset_name)
     
     # Create artifact
     create_markdown_artifact(
@@ -228,26 +306,36 @@ def transform_dataset(df: pd.DataFrame, dataset_name: str) -> pd.DataFrame:
     return df_transformed
 
 
-@task
+@task(cache_key_fn=content_cache_key, cache_expiration=CACHE_EXPIRATION)
 def split_dataset(
     df: pd.DataFrame, 
     dataset_name: str,
     test_size: float = 0.2,
     val_size: float = 0.1,
-    random_state: int = 42
-) -> Dict[str, pd.DataFrame]:
+    random_state: int = 42,
+    stratify: bool = False,
+    return_indices: bool = False,
+) -> Dict[str, Union[pd.DataFrame, np.ndarray]]:
     """
     Split a dataset into train, validation, and test sets.
     
+    Rows are assigned in a single pass from a hash of the dataset's row key
+    (or of the whole row), so the same row always lands in the same split.
+    By default the split is not stratified, which gives the same assignment
+    as the chunked and incremental path; stratified positions are ranked over
+    the whole dataset and change as rows are appended.
+    
     Args:
         df: DataFrame to split
         dataset_name: Name of the dataset
         test_size: Proportion of data to use for testing
         val_size: Proportion of data to use for validation
         random_state: Random seed for reproducibility
+        stratify: Whether to stratify by the target
+        return_indices: Return row positions instead of DataFrames
         
     Returns:
-        Dictionary with train, validation, and test DataFrames
+        Dictionary with train, validation, and test DataFrames (or row positions)
     """
     logger = get_run_logger()
     logger.info(f"Splitting dataset {dataset_name}")
@@ -258,47 +346,449 @@ def split_dataset(
     if target not in df.columns:
         raise ValueError(f"Target column '{target}' not found in dataset")
     
-    # Split features and target
-    X = df.drop(columns=[target])
-    y = df[target]
-    
-    # First split: train+val and test
-    X_train_val, X_test, y_train_val, y_test = train_test_split(
-        X, y, test_size=test_size, random_state=random_state, stratify=y if y.dtype == "object" else None
-    )
-    
-    # Second split: train and validation
-    val_ratio = val_size / (1 - test_size)
-    X_train, X_val, y_train, y_val = train_test_split(
-        X_train_val, y_train_val, test_size=val_ratio, random_state=random_state, 
-        stratify=y_train_val if y_train_val.dtype == "object" else None
+    indices = split_indices(
+        df,
+        key=DATASETS[dataset_name].get("key"),
+        test_size=test_size,
+        val_size=val_size,
+        random_state=random_state,
+        stratify=target if stratify else None,
     )
+    sizes = {name: len(index) for name, index in indices.items()}
     
-    # Combine features and target
-    train_df = pd.concat([X_train, y_train], axis=1)
-    val_df = pd.concat([X_val, y_val], axis=1)
-    test_df = pd.concat([X_test, y_test], axis=1)
-    
-    logger.info(f"Train set shape: {train_df.shape}")
-    logger.info(f"Validation set shape: {val_df.shape}")
-    logger.info(f"Test set shape: {test_df.shape}")
+    logger.info(f"Split sizes: {sizes}")
     
     # Create artifact
     create_markdown_artifact(
         markdown=f"## Dataset Split: {dataset_name}\n\n"
                 f"- **Original Shape**: {df.shape}\n"
-                f"- **Train Shape**: {train_df.shape} ({len(train_df) / len(df):.1%})\n"
-                f"- **Validation Shape**: {val_df.shape} ({len(val_df) / len(df):.1%})\n"
-                f"- **Test Shape**: {test_df.shape} ({len(test_df) / len(df):.1%})\n"
+                f"- **Train Rows**: {sizes['train']} ({sizes['train'] / len(df):.1%})\n"
+                f"- **Validation Rows**: {sizes['val']} ({sizes['val'] / len(df):.1%})\n"
+                f"- **Test Rows**: {sizes['test']} ({sizes['test'] / len(df):.1%})\n"
+                f"- **Stratified**: {stratify}\n"
                 f"- **Target Column**: {target}",
         key=f"dataset-split-{dataset_name}",
     )
     
+    if return_indices:
+        return indices
+    
+    return {name: df.take(index) for name, index in indices.items()}
+
+
+@task(cache_key_fn=content_cache_key, cache_expiration=CACHE_EXPIRATION)
+def compute_chunk_statistics(
+    dataset_path: Path,
+    dataset_name: str,
+    chunksize: int,
+) -> Dict:
+    """
+    Compute the global statistics needed to process a dataset chunk by chunk.
+    
+    The first pass fixes a consistent dtype for every column and finds the
+    yes/no columns, missing counts and the value ranges used to plan compact
+    dtypes. Columns that need filling are then re-read on their own to compute
+    exact medians and modes from value counts.
+    
+    Args:
+        dataset_path: Path to the raw dataset file
+        dataset_name: Name of the dataset
+        chunksize: Number of rows per chunk
+        
+    Returns:
+        Dictionary with row count, dtypes, fill values, yes/no columns and
+        the dtype plan
+    """
+    logger = get_run_logger()
+    logger.info(f"Computing chunk statistics for {dataset_name} (chunksize={chunksize})")
+    
+    n_rows = 0
+    columns = None
+    missing = None
+    numeric_cols = None
+    float_cols = set()
+    yes_no_columns = None
+    summary = None
+    
+    for chunk in iter_dataset_chunks(dataset_path, chunksize):
+        n_rows += len(chunk)
+        if columns is None:
+            columns = list(chunk.columns)
+        
+        chunk_missing = chunk.isnull().sum()
+        missing = chunk_missing if missing is None else missing + chunk_missing
+        
+        # A column is numeric only if it is numeric in every chunk
+        chunk_numeric = set(chunk.select_dtypes(include=["number"]).columns)
+        numeric_cols = chunk_numeric if numeric_cols is None else numeric_cols & chunk_numeric
+        float_cols |= set(chunk.select_dtypes(include=["float"]).columns)
+        
+        # A column is yes/no only if it is yes/no in every chunk
+        candidates = yes_no_columns if yes_no_columns is not None else columns
+        yes_no_columns = detect_binary_columns(chunk, columns=candidates)
+        
+        summary = merge_column_summaries(summary, summarize_columns(chunk))
+    
+    if columns is None:
+        raise ValueError(f"Dataset {dataset_name} is empty")
+    
+    dtypes = {
+        col: ("float64" if col in float_cols else "int64") if col in numeric_cols else "object"
+        for col in columns
+    }
+    
+    # Exact fill values from the value counts of the columns with missing data
+    strategies = _fill_strategies(
+        [col for col in columns if col in numeric_cols],
+        [col for col in columns if col not in numeric_cols],
+        dataset_name,
+    )
+    fill_columns = [col for col in strategies if missing[col] > 0]
+    fill_values = {}
+    if fill_columns:
+        counts = {col: pd.Series(dtype="int64") for col in fill_columns}
+        for chunk in iter_dataset_chunks(
+            dataset_path, chunksize, columns=fill_columns, dtype={col: dtypes[col] for col in fill_columns}
+        ):
+            for col in fill_columns:
+                counts[col] = counts[col].add(chunk[col].value_counts(), fill_value=0)
+        
+        for col in fill_columns:
+            if strategies[col] == "median":
+                fill_values[col] = _median_from_counts(counts[col])
+            else:
+                fill_values[col] = counts[col].idxmax()
+    
+    # Same compact dtypes as clean_dataset, planned from the merged summaries
+    dtype_plan = plan_dtypes(summary, n_rows, fill_values)
+    
+    logger.info(f"Scanned {n_rows} rows; fill values: {fill_values}")
+    
     return {
-        "train": train_df,
-        "val": val_df,
-        "test": test_df,
+        "n_rows": n_rows,
+        "columns": columns,
+        "dtypes": dtypes,
+        "missing_values": missing.to_dict(),
+        "fill_values": fill_values,
+        "yes_no_columns": yes_no_columns,
+        "dtype_plan": dtype_plan,
+    }
+
+
+def prepare_chunk(chunk: pd.DataFrame, dataset_name: str, statistics: Dict) -> pd.DataFrame:
+    """
+    Clean and transform a chunk of raw rows with global statistics.
+    
+    Applies the steps of clean_dataset and transform_dataset except removing
+    duplicates, so raw rows come out like the rows of the processed splits.
+    
+    Args:
+        chunk: Raw rows (may be modified in place)
+        dataset_name: Name of the dataset
+        statistics: Dataset statistics (see compute_chunk_statistics)
+    
+    Returns:
+        Cleaned and transformed rows
+    """
+    if statistics["fill_values"]:
+        chunk = chunk.fillna(statistics["fill_values"])
+    chunk = apply_dtype_plan(chunk, statistics.get("dtype_plan", {}))
+    return _transform_frame(chunk, dataset_name, statistics["yes_no_columns"])
+
+
+@task
+def process_dataset_chunks(
+    dataset_path: Path,
+    dataset_name: str,
+    statistics: Dict,
+    chunksize: int,
+    test_size: float = 0.2,
+    val_size: float = 0.1,
+    random_state: int = 42,
+    start_offset: int = 0,
+    append: bool = False,
+) -> Dict[str, Path]:
+    """
+    Clean, transform and split a dataset chunk by chunk.
+    
+    Each chunk is cleaned with the global fill values, converted to the
+    planned compact dtypes, transformed and its rows are streamed straight
+    into the train/val/test split files, so peak memory is bounded by the
+    chunk size rather than the dataset size. Rows
+    are assigned to splits by a hash of their key, so a row always lands in
+    the same split.
+    
+    Duplicates are found from 64-bit row hashes kept in a sorted array (8
+    bytes per distinct row) and saved next to the watermark, so appended rows
+    that repeat rows of earlier runs are dropped as well.
+    
+    Args:
+        dataset_path: Path to the raw dataset file
+        dataset_name: Name of the dataset
+        statistics: Global statistics from compute_chunk_statistics
+        chunksize: Number of rows per chunk
+        test_size: Proportion of data to use for testing
+        val_size: Proportion of data to use for validation
+        random_state: Random seed for reproducibility
+        start_offset: Byte offset in the raw file to start reading from
+        append: Whether to append to the existing split files
+        
+    Returns:
+        Dictionary with paths to the processed datasets
+    """
+    logger = get_run_logger()
+    logger.info(
+        f"Processing dataset {dataset_name} in chunks of {chunksize} rows "
+        f"from byte {start_offset}"
+    )
+    
+    target = DATASETS[dataset_name]["target"]
+    if target not in statistics["columns"]:
+        raise ValueError(f"Target column '{target}' not found in dataset")
+    
+    key = DATASETS[dataset_name].get("key")
+    row_hashes_path = _row_hashes_path(dataset_name)
+    if append and row_hashes_path.exists():
+        seen_rows = np.load(row_hashes_path)
+    else:
+        seen_rows = np.empty(0, dtype=np.uint64)
+    rows_read = 0
+    duplicates_removed = 0
+    
+    writers = {
+        name: DatasetWriter(dataset_name, name, append=append)
+        for name in ["train", "val", "test"]
     }
+    try:
+        for chunk in iter_dataset_chunks(
+            dataset_path, chunksize, dtype=statistics["dtypes"], start_offset=start_offset
+        ):
+            rows_read += len(chunk)
+            
+            # Remove duplicates across all chunks (and runs) seen so far
+            keep, seen_rows = _mark_seen_rows(
+                pd.util.hash_pandas_object(chunk, index=False).to_numpy(), seen_rows
+            )
+            duplicates_removed += int((~keep).sum())
+            chunk = chunk[keep].copy()
+            
+            # Clean and transform with the global statistics
+            chunk = prepare_chunk(chunk, dataset_name, statistics)
+            
+            # Same hash assignment as split_dataset (unstratified, so it is
+            # stable across chunks and incremental runs)
+            splits = assign_splits_by_hash(
+                chunk[key] if key else chunk, test_size, val_size, random_state
+            )
+            
+            # Stream each row into its split
+            for name, writer in writers.items():
+                writer.write(chunk[splits == name])
+        
+        paths = {name: writer.close() for name, writer in writers.items()}
+        _write_row_hashes(row_hashes_path, seen_rows)
+    except Exception:
+        for writer in writers.values():
+            writer.abort()
+        raise
+    
+    rows = {name: writer.rows for name, writer in writers.items()}
+    total = sum(rows.values())
+    logger.info(f"Removed {duplicates_removed} duplicate rows; new rows per split: {rows}")
+    
+    # Create artifact
+    create_markdown_artifact(
+        markdown=f"## Chunked Processing: {dataset_name}\n\n"
+                f"- **Rows Read**: {rows_read}\n"
+                f"- **Start Offset**: {start_offset}\n"
+                f"- **Mode**: {'append' if append else 'rewrite'}\n"
+                f"- **Chunk Size**: {chunksize}\n"
+                f"- **Duplicates Removed**: {duplicates_removed}\n"
+                f"- **Fill Values**: {statistics['fill_values']}\n"
+                f"- **Train Rows**: {rows['train']} ({rows['train'] / max(total, 1):.1%})\n"
+                f"- **Validation Rows**: {rows['val']} ({rows['val'] / max(total, 1):.1%})\n"
+                f"- **Test Rows**: {rows['test']} ({rows['test'] / max(total, 1):.1%})\n"
+                f"- **Target Column**: {target}",
+        key=f"dataset-chunked-{dataset_name}",
+    )
+    
+    return paths
+
+
+def _watermark_path(dataset_name: str) -> Path:
+    """
+    Get the path of the incremental processing watermark for a dataset.
+    
+    Args:
+        dataset_name: Name of the dataset
+        
+    Returns:
+        Path to the watermark file
+    """
+    return PROCESSED_DATA_DIR / f"{dataset_name}_watermark.json"
+
+
+def _row_hashes_path(dataset_name: str) -> Path:
+    """
+    Get the path of the row hashes used to drop duplicates across runs.
+    
+    Args:
+        dataset_name: Name of the dataset
+    
+    Returns:
+        Path to the row hash file
+    """
+    return PROCESSED_DATA_DIR / f"{dataset_name}_row_hashes.npy"
+
+
+def _mark_seen_rows(row_hashes: np.ndarray, seen_rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find the rows of a chunk that were not seen before and record them.
+    
+    Args:
+        row_hashes: Hashes of the rows of the chunk
+        seen_rows: Sorted hashes of the rows seen so far
+    
+    Returns:
+        Tuple of a mask of the rows to keep (the first occurrence of each
+        unseen row) and the updated sorted hashes
+    """
+    unique, first = np.unique(row_hashes, return_index=True)
+    positions = np.searchsorted(seen_rows, unique)
+    
+    seen = positions < len(seen_rows)
+    seen[seen] = seen_rows[positions[seen]] == unique[seen]
+    
+    keep = np.zeros(len(row_hashes), dtype=bool)
+    keep[first[~seen]] = True
+    return keep, np.insert(seen_rows, positions[~seen], unique[~seen])
+
+
+def _write_row_hashes(path: Path, seen_rows: np.ndarray) -> None:
+    """
+    Save the sorted row hashes of a dataset atomically.
+    
+    Args:
+        path: Path to the row hash file
+        seen_rows: Sorted hashes of the processed rows
+    """
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        np.save(f, seen_rows)
+    os.replace(tmp_path, path)
+
+
+def _file_fingerprint(dataset_path: Path, offset: int) -> str:
+    """
+    Hash the bytes just before an offset in a file.
+    
+    Args:
+        dataset_path: Path to the file
+        offset: Byte offset the fingerprint ends at
+        
+    Returns:
+        Hex digest of the fingerprint bytes
+    """
+    start = max(0, offset - INCREMENTAL_SETTINGS["fingerprint_bytes"])
+    with open(dataset_path, "rb") as f:
+        f.seek(start)
+        return hashlib.sha256(f.read(offset - start)).hexdigest()
+
+
+def read_watermark(dataset_path: Path, dataset_name: str) -> Optional[Dict]:
+    """
+    Read the watermark of a dataset if the raw file only grew since it was written.
+    
+    Args:
+        dataset_path: Path to the raw dataset file
+        dataset_name: Name of the dataset
+        
+    Returns:
+        Watermark dictionary, or None if the dataset must be fully reprocessed
+    """
+    watermark_path = _watermark_path(dataset_name)
+    if not watermark_path.exists():
+        return None
+    
+    with open(watermark_path) as f:
+        watermark = json.load(f)
+    
+    # The split files (and the row hashes used to drop duplicates) must
+    # still exist in the configured format
+    if watermark.get("storage_format") != STORAGE_SETTINGS["format"] or not all(
+        processed_dataset_path(dataset_name, name).exists() for name in ["train", "val", "test"]
+    ) or not _row_hashes_path(dataset_name).exists():
+        return None
+    
+    # The raw file must still start with the bytes that were processed
+    offset = watermark["offset"]
+    if dataset_path.stat().st_size < offset:
+        return None
+    if _file_fingerprint(dataset_path, offset) != watermark["fingerprint"]:
+        return None
+    
+    return watermark
+
+
+def write_watermark(dataset_path: Path, dataset_name: str, statistics: Dict) -> Dict:
+    """
+    Record that a raw dataset file has been processed up to its current end.
+    
+    Args:
+        dataset_path: Path to the raw dataset file
+        dataset_name: Name of the dataset
+        statistics: Global statistics used to process the dataset
+        
+    Returns:
+        Watermark dictionary
+    """
+    offset = dataset_path.stat().st_size
+    watermark = {
+        "dataset_name": dataset_name,
+        "offset": offset,
+        "fingerprint": _file_fingerprint(dataset_path, offset),
+        "storage_format": STORAGE_SETTINGS["format"],
+        "statistics": statistics,
+        "updated_at": datetime.now().isoformat(),
+    }
+    
+    watermark_path = _watermark_path(dataset_name)
+    tmp_path = watermark_path.with_name(watermark_path.name + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(watermark, f, indent=2, default=lambda value: value.item())
+    os.replace(tmp_path, watermark_path)
+    
+    return watermark
+
+
+def _appended_rows_fit(dataset_path: Path, watermark: Dict, chunksize: int) -> bool:
+    """
+    Check whether rows appended since a watermark fit its dtype plan.
+    
+    New category values or out-of-range numbers cannot be appended to split
+    files written with the old dtypes, so the dataset must be reprocessed.
+    
+    Args:
+        dataset_path: Path to the raw dataset file
+        watermark: Watermark from read_watermark
+        chunksize: Number of rows per chunk
+        
+    Returns:
+        True if the appended rows can be processed with the stored statistics
+    """
+    statistics = watermark["statistics"]
+    if "dtype_plan" not in statistics:
+        return False
+    
+    summary = None
+    for chunk in iter_dataset_chunks(
+        dataset_path, chunksize, dtype=statistics["dtypes"], start_offset=watermark["offset"]
+    ):
+        summary = merge_column_summaries(summary, summarize_columns(chunk))
+    
+    return summary is None or dtype_plan_fits(
+        statistics["dtype_plan"], summary, statistics["fill_values"]
+    )
 
 
 @flow(
@@ -314,6 +804,9 @@ def load_and_process_data(
     test_size: float = 0.2,
     val_size: float = 0.1,
     random_state: int = 42,
+    refresh: bool = DEPLOYMENT_SETTINGS["refresh_datasets"],
+    chunksize: Optional[int] = None,
+    incremental: bool = False,
 ) -> Dict[str, Path]:
     """
     Load and process a dataset for analysis and modeling.
@@ -324,6 +817,11 @@ def load_and_process_data(
         test_size: Proportion of data to use for testing
         val_size: Proportion of data to use for validation
         random_state: Random seed for reproducibility
+        refresh: Whether to revalidate the raw dataset with the source
+        chunksize: Process the raw file in batches of this many rows instead of
+            loading it into memory at once
+        incremental: Only process rows appended to the raw file since the
+            last incremental run and append them to the split files
         
     Returns:
         Dictionary with paths to the processed datasets
@@ -332,7 +830,38 @@ def load_and_process_data(
     log_flow_run_info()
     
     # Download and load dataset
-    dataset_path = download_dataset(dataset_name, force_download)
+    dataset_path = download_dataset(dataset_name, force_download, refresh=refresh)
+    
+    # Out-of-core mode: two passes over the raw file in row batches
+    if chunksize or incremental:
+        chunksize = chunksize or INCREMENTAL_SETTINGS["chunksize"]
+        
+        # Incremental mode resumes from the watermark with its statistics
+        watermark = read_watermark(dataset_path, dataset_name) if incremental else None
+        if watermark and not _appended_rows_fit(dataset_path, watermark, chunksize):
+            watermark = None
+        if watermark:
+            statistics = watermark["statistics"]
+        else:
+            statistics = compute_chunk_statistics(dataset_path, dataset_name, chunksize)
+        
+        paths = process_dataset_chunks(
+            dataset_path,
+            dataset_name,
+            statistics,
+            chunksize,
+            test_size=test_size,
+            val_size=val_size,
+            random_state=random_state,
+            start_offset=watermark["offset"] if watermark else 0,
+            append=watermark is not None,
+        )
+        
+        if incremental:
+            write_watermark(dataset_path, dataset_name, statistics)
+        
+        return paths
+    
     df = load_dataset(dataset_path)
     
     # Analyze dataset
@@ -344,19 +873,20 @@ def load_and_process_data(
     # Transform dataset
     df_transformed = transform_dataset(df_clean, dataset_name)
     
-    # Split dataset
+    # Split dataset into row positions, then save one split at a time
     splits = split_dataset(
         df_transformed, 
         dataset_name,
         test_size=test_size,
         val_size=val_size,
-        random_state=random_state
+        random_state=random_state,
+        return_indices=True,
     )
     
     # Save processed datasets
     paths = {}
-    for split_name, split_df in splits.items():
-        path = save_dataset(split_df, dataset_name, suffix=f"{split_name}")
+    for split_name, index in splits.items():
+        path = save_dataset(df_transformed.take(index), dataset_name, suffix=f"{split_name}")
         paths[split_name] = path
     
     return paths
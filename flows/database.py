@@ -0,0 +1,263 @@
+"""
+Bulk database loading helpers for Prefect flows.
+
+Tables are loaded with the fastest insert path the dialect supports:
+PostgreSQL uses COPY, SQLite uses executemany over large batches and other
+dialects use multi-row INSERT statements sized to the dialect's parameter
+limit. An upsert mode merges rows into an existing table by key columns
+through a staging table named uniquely per load, so concurrent upserts into
+the same table do not share it. Callers pass a connection that is already inside a
+transaction, so a load either fully succeeds or leaves the table unchanged.
+
+Engines are kept in a process-level registry keyed by connection string, so
+all tasks of a flow run share one connection pool per database.
+"""
+
+import csv
+import io
+import threading
+import uuid
+import pandas as pd
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.engine import Connection, Engine, make_url
+from prefect_sqlalchemy import SqlAlchemyConnector
+
+from .config import DATABASE_SETTINGS
+
+IF_EXISTS_MODES = ["fail", "replace", "append", "upsert"]
+
+_engines: Dict[str, Engine] = {}
+_engines_lock = threading.Lock()
+
+
+def _pool_options(url: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Get the connection pool options for an engine.
+    
+    Args:
+        url: SQLAlchemy URL of the database (None for connector blocks)
+    
+    Returns:
+        Keyword arguments for create_engine
+    """
+    options = {
+        "pool_pre_ping": DATABASE_SETTINGS["pool_pre_ping"],
+        "pool_recycle": DATABASE_SETTINGS["pool_recycle_seconds"],
+    }
+    
+    # In-memory SQLite keeps one connection per thread and has no pool size
+    if url is not None:
+        parsed = make_url(url)
+        if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+            return options
+    
+    options["pool_size"] = DATABASE_SETTINGS["pool_size"]
+    options["max_overflow"] = DATABASE_SETTINGS["max_overflow"]
+    return options
+
+
+def get_engine(connection_string: str) -> Engine:
+    """
+    Get the shared, pooled engine for a database.
+    
+    Args:
+        connection_string: SQLAlchemy URL (e.g. "sqlite:///data/portfolio.db")
+            or the name of a SqlAlchemyConnector block (e.g. "portfolio-db")
+    
+    Returns:
+        SQLAlchemy Engine, created on first use
+    """
+    with _engines_lock:
+        engine = _engines.get(connection_string)
+        if engine is None:
+            if "://" in connection_string:
+                engine = create_engine(connection_string, **_pool_options(connection_string))
+            else:
+                connector = SqlAlchemyConnector.load(connection_string)
+                engine = connector.get_engine(**_pool_options())
+            _engines[connection_string] = engine
+    
+    return engine
+
+
+def dispose_engines() -> None:
+    """Close the pooled connections of all registered engines."""
+    with _engines_lock:
+        for engine in _engines.values():
+            engine.dispose()
+        _engines.clear()
+
+
+def _copy_insert(table, conn, keys: List[str], data_iter) -> None:
+    """
+    Insert rows with PostgreSQL COPY (a pandas to_sql insert method).
+    
+    Args:
+        table: pandas SQLTable being written
+        conn: SQLAlchemy connection
+        keys: Column names
+        data_iter: Iterable of row tuples
+    """
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(data_iter)
+    buffer.seek(0)
+    
+    preparer = conn.dialect.identifier_preparer
+    columns = ", ".join(preparer.quote(key) for key in keys)
+    name = preparer.quote(table.name)
+    if table.schema:
+        name = f"{preparer.quote(table.schema)}.{name}"
+    
+    with conn.connection.cursor() as cursor:
+        cursor.copy_expert(f"COPY {name} ({columns}) FROM STDIN WITH CSV", buffer)
+
+
+def insert_strategy(connection: Connection, n_columns: int) -> Dict[str, Any]:
+    """
+    Choose the to_sql insert method and batch size for a dialect.
+    
+    Args:
+        connection: Database connection
+        n_columns: Number of columns being inserted
+    
+    Returns:
+        Dictionary with "method" and "chunksize" keyword arguments for to_sql
+    """
+    dialect = connection.dialect.name
+    batch_size = DATABASE_SETTINGS["batch_size"]
+    
+    if dialect == "postgresql" and connection.dialect.driver == "psycopg2":
+        method: Optional[Callable] = _copy_insert
+    elif dialect == "sqlite":
+        # executemany over a prepared statement is SQLite's fastest path
+        method = None
+    else:
+        # Multi-row INSERTs, keeping each statement under the parameter limit
+        method = "multi"
+        batch_size = max(1, min(batch_size, DATABASE_SETTINGS["max_parameters"] // max(n_columns, 1)))
+    
+    return {"method": method, "chunksize": batch_size}
+
+
+def _quote(connection: Connection, name: str) -> str:
+    """
+    Quote an identifier for the connection's dialect.
+    
+    Args:
+        connection: Database connection
+        name: Table or column name
+    
+    Returns:
+        Quoted identifier
+    """
+    return connection.dialect.identifier_preparer.quote(name)
+
+
+def _merge_from_staging(
+    connection: Connection,
+    table_name: str,
+    staging_name: str,
+    columns: Sequence[str],
+    key_columns: Sequence[str],
+) -> None:
+    """
+    Replace the rows of a table that match staged keys, then insert all staged rows.
+    
+    Args:
+        connection: Database connection (inside a transaction)
+        table_name: Target table
+        staging_name: Staging table with the new rows
+        columns: Columns to insert
+        key_columns: Columns identifying a row
+    """
+    target = _quote(connection, table_name)
+    staging = _quote(connection, staging_name)
+    match = " AND ".join(
+        f"{staging}.{_quote(connection, col)} = {target}.{_quote(connection, col)}"
+        for col in key_columns
+    )
+    column_list = ", ".join(_quote(connection, col) for col in columns)
+    
+    connection.exec_driver_sql(
+        f"DELETE FROM {target} WHERE EXISTS (SELECT 1 FROM {staging} WHERE {match})"
+    )
+    connection.exec_driver_sql(
+        f"INSERT INTO {target} ({column_list}) SELECT {column_list} FROM {staging}"
+    )
+
+
+def clear_table(connection: Connection, table_name: str) -> bool:
+    """
+    Delete all rows of a table, keeping its schema.
+    
+    Args:
+        connection: Database connection (inside a transaction)
+        table_name: Table to clear
+    
+    Returns:
+        Whether the table existed
+    """
+    if not inspect(connection).has_table(table_name):
+        return False
+    connection.exec_driver_sql(f"DELETE FROM {_quote(connection, table_name)}")
+    return True
+
+
+def bulk_load(
+    df: pd.DataFrame,
+    table_name: str,
+    connection: Connection,
+    if_exists: str = "replace",
+    key_columns: Optional[Sequence[str]] = None,
+) -> int:
+    """
+    Load a DataFrame into a database table in bulk.
+    
+    In upsert mode, rows whose key columns match existing rows replace them
+    and other rows are appended. A new table is created with the key columns
+    as its primary key.
+    
+    Args:
+        df: DataFrame to load
+        table_name: Target table
+        connection: Database connection (inside a transaction)
+        if_exists: What to do if the table exists (fail, replace, append, upsert)
+        key_columns: Columns identifying a row (required for upsert)
+    
+    Returns:
+        Number of rows loaded
+    """
+    if if_exists not in IF_EXISTS_MODES:
+        raise ValueError(f"Invalid if_exists mode: {if_exists}")
+    if if_exists == "upsert":
+        if not key_columns:
+            raise ValueError("Upsert requires key_columns")
+        missing = set(key_columns) - set(df.columns)
+        if missing:
+            raise ValueError(f"Key columns not found in data: {sorted(missing)}")
+        
+        # Later rows win when the data itself repeats a key
+        df = df.drop_duplicates(subset=list(key_columns), keep="last")
+    
+    strategy = insert_strategy(connection, len(df.columns))
+    
+    if if_exists != "upsert":
+        df.to_sql(table_name, connection, if_exists=if_exists, index=False, **strategy)
+        return len(df)
+    
+    if not inspect(connection).has_table(table_name):
+        # Create the table with a primary key so keys stay unique
+        schema = pd.io.sql.get_schema(df, table_name, keys=list(key_columns), con=connection)
+        connection.exec_driver_sql(schema)
+        df.to_sql(table_name, connection, if_exists="append", index=False, **strategy)
+        return len(df)
+    
+    # A fixed staging name would let concurrent upserts overwrite each other's rows
+    staging_name = f"{table_name}{DATABASE_SETTINGS['staging_suffix']}_{uuid.uuid4().hex[:12]}"
+    df.to_sql(staging_name, connection, if_exists="fail", index=False, **strategy)
+    _merge_from_staging(connection, table_name, staging_name, list(df.columns), key_columns)
+    connection.exec_driver_sql(f"DROP TABLE {_quote(connection, staging_name)}")
+    
+    return len(df)
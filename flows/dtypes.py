@@ -0,0 +1,282 @@
+"""
+Memory-efficient dtype planning for Prefect flows.
+
+A dtype plan maps columns to compact dtypes: low-cardinality strings become
+categoricals with a fixed vocabulary, "Yes"/"No" columns become nullable
+booleans and numbers are downcast to the narrowest width that holds every
+value exactly, but integers no narrower than DTYPE_SETTINGS["min_integer_dtype"]. Plans are built from per-column summaries, which can be merged
+across chunks, so chunked and in-memory processing produce the same schema.
+Plans are plain JSON-serializable dictionaries.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Iterable, Optional
+
+from .config import DTYPE_SETTINGS
+
+YES_NO_VALUES = {"Yes", "No"}
+
+INTEGER_DTYPES = ["int8", "int16", "int32", "int64"]
+
+
+def summarize_columns(df: pd.DataFrame) -> Dict[str, Dict]:
+    """
+    Summarize the value ranges of each column for dtype planning.
+    
+    Args:
+        df: DataFrame (or chunk) to summarize
+    
+    Returns:
+        Dictionary of per-column summaries
+    """
+    max_categories = DTYPE_SETTINGS["max_categories"]
+    summary = {}
+    
+    for col in df.columns:
+        series = df[col]
+        has_na = bool(series.isna().any())
+        
+        if pd.api.types.is_bool_dtype(series):
+            summary[col] = {"kind": "bool", "has_na": has_na}
+        
+        elif pd.api.types.is_numeric_dtype(series):
+            values = series.dropna().to_numpy(dtype=np.float64)
+            finite = values[np.isfinite(values)]
+            summary[col] = {
+                "kind": "number",
+                "has_na": has_na,
+                "min": float(finite.min()) if len(finite) else None,
+                "max": float(finite.max()) if len(finite) else None,
+                "integral": bool(len(finite) == len(values) and np.all(np.mod(finite, 1) == 0)),
+                "float32_exact": bool(np.all(values.astype(np.float32).astype(np.float64) == values)),
+            }
+        
+        elif series.dtype == "object" or isinstance(series.dtype, pd.CategoricalDtype):
+            values = series.dropna().unique()
+            if not all(isinstance(value, str) for value in values):
+                summary[col] = {"kind": "other", "has_na": has_na}
+                continue
+            
+            # Track distinct values only up to the category limit
+            summary[col] = {
+                "kind": "string",
+                "has_na": has_na,
+                "values": sorted(values) if len(values) <= max_categories else None,
+            }
+        
+        else:
+            summary[col] = {"kind": "other", "has_na": has_na}
+    
+    return summary
+
+
+def merge_column_summaries(left: Optional[Dict], right: Dict) -> Dict:
+    """
+    Merge the column summaries of two chunks of the same dataset.
+    
+    Args:
+        left: Summary of the rows seen so far (None for the first chunk)
+        right: Summary of the next chunk
+    
+    Returns:
+        Summary covering both chunks
+    """
+    if left is None:
+        return right
+    
+    merged = {}
+    for col, a in left.items():
+        b = right.get(col, a)
+        if a["kind"] != b["kind"]:
+            merged[col] = {"kind": "other", "has_na": a["has_na"] or b["has_na"]}
+        elif a["kind"] == "number":
+            merged[col] = {
+                "kind": "number",
+                "has_na": a["has_na"] or b["has_na"],
+                "min": min((v for v in (a["min"], b["min"]) if v is not None), default=None),
+                "max": max((v for v in (a["max"], b["max"]) if v is not None), default=None),
+                "integral": a["integral"] and b["integral"],
+                "float32_exact": a["float32_exact"] and b["float32_exact"],
+            }
+        elif a["kind"] == "string":
+            values = None
+            if a["values"] is not None and b["values"] is not None:
+                values = sorted(set(a["values"]) | set(b["values"]))
+                if len(values) > DTYPE_SETTINGS["max_categories"]:
+                    values = None
+            merged[col] = {"kind": "string", "has_na": a["has_na"] or b["has_na"], "values": values}
+        else:
+            merged[col] = {"kind": a["kind"], "has_na": a["has_na"] or b["has_na"]}
+    
+    return merged
+
+
+def _smallest_integer_dtype(min_value: float, max_value: float) -> str:
+    """
+    Get the narrowest allowed signed integer dtype that holds a value range.
+    
+    Args:
+        min_value: Smallest value
+        max_value: Largest value
+    
+    Returns:
+        Name of the integer dtype
+    """
+    start = INTEGER_DTYPES.index(DTYPE_SETTINGS["min_integer_dtype"])
+    for dtype in INTEGER_DTYPES[start:]:
+        info = np.iinfo(dtype)
+        if info.min <= min_value and max_value <= info.max:
+            return dtype
+    return "int64"
+
+
+def plan_dtypes(
+    summary: Dict[str, Dict],
+    n_rows: int,
+    fill_values: Optional[Dict[str, Any]] = None,
+    exclude: Iterable[str] = (),
+) -> Dict[str, Any]:
+    """
+    Choose a compact dtype for each column from its summary.
+    
+    Args:
+        summary: Column summaries (see summarize_columns)
+        n_rows: Number of rows in the dataset
+        fill_values: Values missing entries will be filled with before the
+            plan is applied
+        exclude: Columns to leave unchanged
+    
+    Returns:
+        Dictionary mapping columns to a dtype name or {"categories": [...]}
+    """
+    fill_values = fill_values or {}
+    exclude = set(exclude)
+    max_ratio = DTYPE_SETTINGS["max_category_ratio"]
+    plan = {}
+    
+    for col, info in summary.items():
+        if col in exclude:
+            continue
+        
+        has_na = info["has_na"] and col not in fill_values
+        
+        if info["kind"] == "string" and info["values"] is not None:
+            values = set(info["values"])
+            if col in fill_values:
+                values.add(str(fill_values[col]))
+            
+            if values and values <= YES_NO_VALUES:
+                plan[col] = "boolean"
+            elif len(values) <= max(1, max_ratio * n_rows):
+                plan[col] = {"categories": sorted(values)}
+        
+        elif info["kind"] == "number" and info["min"] is not None:
+            fill = fill_values.get(col)
+            low = min(info["min"], fill) if fill is not None else info["min"]
+            high = max(info["max"], fill) if fill is not None else info["max"]
+            integral = info["integral"] and (fill is None or float(fill).is_integer())
+            
+            if integral:
+                dtype = _smallest_integer_dtype(low, high)
+                plan[col] = dtype.capitalize() if has_na else dtype
+            elif info["float32_exact"] and (fill is None or np.float32(fill) == fill):
+                plan[col] = "float32"
+    
+    return plan
+
+
+def apply_dtype_plan(df: pd.DataFrame, plan: Dict[str, Any]) -> pd.DataFrame:
+    """
+    Convert the columns of a DataFrame to the dtypes of a plan.
+    
+    Args:
+        df: DataFrame to convert
+        plan: Dtype plan (see plan_dtypes)
+        
+    Returns:
+        DataFrame with converted columns
+    """
+    conversions = {}
+    yes_no_columns = []
+    for col, dtype in plan.items():
+        if col not in df.columns:
+            continue
+        if isinstance(dtype, dict):
+            conversions[col] = pd.CategoricalDtype(dtype["categories"])
+        elif dtype == "boolean":
+            yes_no_columns.append(col)
+        else:
+            conversions[col] = dtype
+    
+    df = df.astype(conversions) if conversions else df.copy()
+    for col in yes_no_columns:
+        df[col] = df[col].map({"Yes": True, "No": False}).astype("boolean")
+    
+    return df
+
+
+def plan_dtypes_for_frame(
+    df: pd.DataFrame,
+    exclude: Iterable[str] = (),
+) -> Dict[str, Any]:
+    """
+    Build the dtype plan for an in-memory DataFrame.
+    
+    Args:
+        df: DataFrame to plan for
+        exclude: Columns to leave unchanged
+    
+    Returns:
+        Dtype plan (see plan_dtypes)
+    """
+    return plan_dtypes(summarize_columns(df), len(df), exclude=exclude)
+
+
+def dtype_plan_fits(
+    plan: Dict[str, Any],
+    summary: Dict[str, Dict],
+    fill_values: Optional[Dict[str, Any]] = None,
+) -> bool:
+    """
+    Check whether new rows can be converted with an existing dtype plan.
+    
+    Args:
+        plan: Dtype plan (see plan_dtypes)
+        summary: Column summaries of the new rows
+        fill_values: Values missing entries will be filled with
+    
+    Returns:
+        True if every planned conversion is lossless for the new rows
+    """
+    fill_values = fill_values or {}
+    
+    for col, dtype in plan.items():
+        info = summary.get(col)
+        if info is None:
+            continue
+        
+        if isinstance(dtype, dict) or dtype == "boolean":
+            allowed = set(dtype["categories"]) if isinstance(dtype, dict) else YES_NO_VALUES
+            if info["kind"] != "string" or info["values"] is None or not set(info["values"]) <= allowed:
+                return False
+        
+        elif info["kind"] != "number":
+            return False
+        
+        elif dtype == "float32":
+            if not info["float32_exact"]:
+                return False
+        
+        else:
+            # Non-nullable integers cannot hold missing values that are not filled
+            if info["has_na"] and col not in fill_values and dtype.islower():
+                return False
+            
+            limits = np.iinfo(dtype.lower())
+            if info["min"] is not None and (
+                not info["integral"] or info["min"] < limits.min or info["max"] > limits.max
+            ):
+                return False
+    
+    return True
@@ -0,0 +1,214 @@
+"""
+Bulk categorical encoders for Prefect flows.
+
+Binary columns such as the Yes/No flags of telco-style tables are detected
+and encoded together: all candidate columns are compared against the true
+and false values in one vectorized pass over a 2-D array, and the resulting
+masks are reused to build compact int8 or boolean columns.
+
+One-hot encoding writes the dummies of all requested columns into a single
+dense or sparse matrix and joins it to the table once. A fixed category
+vocabulary gives every batch of a dataset the same dummy columns.
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import sparse as sp
+from typing import Dict, Iterable, List, Optional
+
+BINARY_OUTPUTS = ["int8", "boolean"]
+
+ONE_HOT_DTYPES = ["bool", "uint8"]
+
+
+def detect_binary_columns(
+    df: pd.DataFrame,
+    true_value: str = "Yes",
+    false_value: str = "No",
+    columns: Optional[Iterable[str]] = None,
+) -> List[str]:
+    """
+    Find object columns that only contain the true and false values.
+    
+    Args:
+        df: DataFrame to inspect
+        true_value: Value encoded as 1
+        false_value: Value encoded as 0
+        columns: Columns to consider (all columns if None)
+    
+    Returns:
+        List of binary column names
+    """
+    columns = df.columns if columns is None else columns
+    candidates = [col for col in columns if df[col].dtype == "object"]
+    if not candidates:
+        return []
+    
+    values = df[candidates].to_numpy(dtype=object)
+    binary = ((values == true_value) | (values == false_value) | pd.isna(values)).all(axis=0)
+    
+    return [col for col, is_binary in zip(candidates, binary) if is_binary]
+
+
+def _binary_array(is_true: np.ndarray, missing: np.ndarray, output: str):
+    """
+    Build a compact binary column from its true and missing masks.
+    
+    Args:
+        is_true: Mask of rows holding the true value
+        missing: Mask of rows holding neither value
+        output: Output dtype ("int8" or "boolean")
+    
+    Returns:
+        NumPy or pandas extension array
+    """
+    if output == "boolean":
+        return pd.arrays.BooleanArray(is_true, missing)
+    
+    values = is_true.astype(np.int8)
+    if missing.any():
+        return pd.arrays.IntegerArray(values, missing)
+    return values
+
+
+def encode_binary_columns(
+    df: pd.DataFrame,
+    columns: Optional[Iterable[str]] = None,
+    true_value: str = "Yes",
+    false_value: str = "No",
+    output: str = "int8",
+) -> pd.DataFrame:
+    """
+    Encode binary columns as 1/0 in place.
+    
+    Values other than the true and false values become missing, like
+    Series.map. Columns that are already booleans are converted to the
+    output dtype and numeric columns are left unchanged. Integer output uses the nullable Int8 dtype for columns
+    with missing values.
+    
+    Args:
+        df: DataFrame to encode (modified in place)
+        columns: Columns to encode (detected with detect_binary_columns if None)
+        true_value: Value encoded as 1
+        false_value: Value encoded as 0
+        output: Output dtype ("int8" or "boolean")
+    
+    Returns:
+        Encoded DataFrame
+    """
+    if output not in BINARY_OUTPUTS:
+        raise ValueError(f"Invalid binary output dtype: {output}")
+    
+    if columns is None:
+        columns = detect_binary_columns(df, true_value, false_value)
+    columns = [col for col in columns if col in df.columns]
+    
+    boolean_cols = [col for col in columns if pd.api.types.is_bool_dtype(df[col])]
+    value_cols = [
+        col for col in columns
+        if df[col].dtype == "object" or isinstance(df[col].dtype, pd.CategoricalDtype)
+    ]
+    
+    for col in boolean_cols:
+        if output == "boolean":
+            df[col] = df[col].astype("boolean")
+        else:
+            df[col] = df[col].astype("Int8" if df[col].hasnans else "int8")
+    
+    if value_cols:
+        # Compare all columns at once and reuse the masks for every column
+        values = df[value_cols].to_numpy(dtype=object)
+        is_true = values == true_value
+        missing = ~(is_true | (values == false_value))
+        
+        for i, col in enumerate(value_cols):
+            df[col] = _binary_array(is_true[:, i], missing[:, i], output)
+    
+    return df
+
+
+def fit_one_hot_vocabulary(df: pd.DataFrame, columns: Iterable[str]) -> Dict[str, List]:
+    """
+    Collect the categories of columns to one-hot encode.
+    
+    Categorical columns keep their declared categories; other columns use
+    their sorted distinct non-null values, like pd.get_dummies.
+    
+    Args:
+        df: DataFrame to fit on
+        columns: Columns to encode
+    
+    Returns:
+        Dictionary mapping columns to their list of categories
+    """
+    vocabulary = {}
+    for col in columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            vocabulary[col] = df[col].cat.categories.tolist()
+        else:
+            vocabulary[col] = pd.Categorical(df[col].dropna().unique()).categories.tolist()
+    return vocabulary
+
+
+def one_hot_encode(
+    df: pd.DataFrame,
+    columns: Iterable[str],
+    categories: Optional[Dict[str, List]] = None,
+    dtype: str = "bool",
+    sparse: bool = False,
+) -> pd.DataFrame:
+    """
+    One-hot encode several columns at once.
+    
+    The encoded columns are replaced by "<column>_<category>" dummies
+    appended after the remaining columns, in the same layout as
+    pd.get_dummies. Missing values and values outside the vocabulary encode
+    as all zeros.
+    
+    Args:
+        df: DataFrame to encode (not modified)
+        columns: Columns to encode
+        categories: Fixed vocabulary per column (fitted from df for columns
+            that are not listed)
+        dtype: Dummy dtype ("bool" or "uint8")
+        sparse: Whether to return sparse dummy columns
+    
+    Returns:
+        Encoded DataFrame
+    """
+    if dtype not in ONE_HOT_DTYPES:
+        raise ValueError(f"Invalid one-hot dtype: {dtype}")
+    
+    columns = [col for col in columns if col in df.columns]
+    if not columns:
+        return df.copy()
+    
+    vocabulary = fit_one_hot_vocabulary(
+        df, [col for col in columns if col not in (categories or {})]
+    )
+    vocabulary.update({col: list(categories[col]) for col in columns if col in (categories or {})})
+    
+    # Position of each row's dummy in the combined matrix (-1 if none)
+    names = []
+    positions = []
+    for col in columns:
+        codes = pd.Categorical(df[col], categories=vocabulary[col]).codes.astype(np.int64)
+        positions.append(np.where(codes >= 0, codes + len(names), -1))
+        names.extend(f"{col}_{category}" for category in vocabulary[col])
+    
+    positions = np.stack(positions, axis=1)
+    rows, slots = np.nonzero(positions >= 0)
+    cols = positions[rows, slots]
+    shape = (len(df), len(names))
+    
+    if sparse:
+        matrix = sp.csc_matrix((np.ones(len(rows), dtype=np.uint8), (rows, cols)), shape=shape)
+        dummies = pd.DataFrame.sparse.from_spmatrix(matrix, index=df.index, columns=names)
+        if dtype == "bool":
+            dummies = dummies.astype(pd.SparseDtype("bool", False))
+    else:
+        matrix = np.zeros(shape, dtype=dtype)
+        matrix[rows, cols] = 1
+        dummies = pd.DataFrame(matrix, index=df.index, columns=names)
+    
+    return pd.concat([df.drop(columns=columns), dummies], axis=1)
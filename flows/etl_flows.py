@@ -5,10 +5,11 @@ ETL flows for the Streamlit portfolio.
 import pandas as pd
 import numpy as np
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Union, Tuple
+from typing import Dict, List, Any, Optional, Union, Tuple, Iterator
 import requests
 import json
 import os
+from contextlib import ExitStack
 from datetime import datetime, timedelta
 import sqlite3
 from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Text
@@ -18,13 +19,18 @@ from sqlalchemy.orm import sessionmaker
 from prefect import flow, task, get_run_logger
 from prefect.artifacts import create_markdown_artifact
 from prefect.tasks import task_input_hash
-from prefect_sqlalchemy import SqlAlchemyConnector
 
 from .config import ETL_FLOW, DATASETS
+from .database import bulk_load, clear_table, get_engine
+from .http_extract import extract_url, iter_url_chunks
+from .partitioned import PartitionedDatasetWriter, iter_partitioned_chunks, read_partitioned
+from .transform_plan import check_streamable, compile_transformations, execute_plan
 from .utils import (
     download_dataset,
     load_dataset,
+    iter_dataset_chunks,
     save_dataset,
+    DatasetWriter,
     log_flow_run_info,
 )
 
@@ -37,18 +43,26 @@ def extract_data(
     source_query: Optional[str] = None,
     source_db: Optional[str] = None,
     dataset_name: Optional[str] = None,
+    pagination: Optional[Dict] = None,
+    columns: Optional[List[str]] = None,
+    filters: Optional[List] = None,
 ) -> pd.DataFrame:
     """
     Extract data from various sources.
     
     Args:
-        source_type: Type of source (file, url, database, api)
-        source_path: Path to the source file
+        source_type: Type of source (file, url, database, api, partitioned)
+        source_path: Path to the source file or partitioned dataset directory
         source_url: URL to the source data
         source_query: SQL query for database source
         source_db: Database connection string
         dataset_name: Name of the dataset (for predefined datasets)
-        
+        pagination: Pagination settings for paginated JSON API URLs (param,
+            start, pages, page_size_param, page_size, records_path)
+        columns: Columns to read from a partitioned dataset (all if None)
+        filters: Row filters for a partitioned dataset, as (column, op, value)
+            triples, e.g. [("contract_type", "==", "One year")]
+    
     Returns:
         DataFrame with extracted data
     """
@@ -61,28 +75,23 @@ def extract_data(
         return pd.read_csv(source_path)
     
     elif source_type == "url" and source_url:
-        # Extract from URL
+        # Extract from URL; the body is parsed while it streams in and
+        # API pages are fetched concurrently
         logger.info(f"Downloading data from URL: {source_url}")
-        response = requests.get(source_url)
-        response.raise_for_status()
-        
-        # Determine file type from URL
-        if source_url.endswith(".csv"):
-            return pd.read_csv(pd.io.common.StringIO(response.text))
-        elif source_url.endswith(".json"):
-            return pd.DataFrame(response.json())
-        else:
-            # Default to CSV
-            return pd.read_csv(pd.io.common.StringIO(response.text))
+        return extract_url(source_url, pagination)
     
     elif source_type == "database" and source_query and source_db:
         # Extract from database
         logger.info(f"Executing query on database: {source_db}")
         
-        # Use SQLAlchemy connector
-        connector = SqlAlchemyConnector.load("portfolio-db")
-        with connector.get_connection() as engine:
-            return pd.read_sql(source_query, engine)
+        # Use the shared, pooled engine for this database
+        with get_engine(source_db).connect() as connection:
+            return pd.read_sql(source_query, connection)
+    
+    elif source_type == "partitioned" and source_path:
+        # Read only the needed columns; filters skip partitions and row groups
+        logger.info(f"Reading partitioned dataset: {source_path}")
+        return read_partitioned(source_path, columns=columns, filters=filters)
     
     elif source_type == "dataset" and dataset_name:
         # Extract from predefined dataset
@@ -94,6 +103,64 @@ def extract_data(
         raise ValueError(f"Invalid source configuration for type: {source_type}")
 
 
+SOURCE_FIELDS = [
+    "source_type",
+    "source_path",
+    "source_url",
+    "source_query",
+    "source_db",
+    "dataset_name",
+    "pagination",
+    "columns",
+    "filters",
+]
+
+
+@task
+def combine_sources(
+    frames: List[pd.DataFrame],
+    names: List[str],
+    combine: str = "union",
+    join_key: Optional[Union[str, List[str]]] = None,
+    join_how: str = "inner",
+) -> pd.DataFrame:
+    """
+    Combine the data extracted from several sources into one DataFrame.
+    
+    Args:
+        frames: DataFrames extracted from each source
+        names: Name of each source (used as the suffix of clashing join columns)
+        combine: How to combine the sources ("union" or "join")
+        join_key: Column(s) to join on
+        join_how: Type of join (inner, left, right, outer)
+    
+    Returns:
+        Combined DataFrame
+    """
+    logger = get_run_logger()
+    logger.info(f"Combining {len(frames)} sources with {combine}")
+    
+    if combine == "union":
+        return pd.concat(frames, ignore_index=True)
+    
+    if combine != "join":
+        raise ValueError(f"Invalid combine method: {combine}")
+    if not join_key:
+        raise ValueError("Joining sources requires a join_key")
+    
+    keys = [join_key] if isinstance(join_key, str) else list(join_key)
+    for name, frame in zip(names, frames):
+        missing = set(keys) - set(frame.columns)
+        if missing:
+            raise ValueError(f"Source '{name}' is missing join key columns: {sorted(missing)}")
+    
+    combined = frames[0]
+    for name, frame in zip(names[1:], frames[1:]):
+        combined = combined.merge(frame, on=keys, how=join_how, suffixes=("", f"_{name}"))
+    
+    return combined
+
+
 @task
 def transform_data(
     df: pd.DataFrame,
@@ -105,104 +172,24 @@ def transform_data(
     Args:
         df: DataFrame to transform
         transformations: List of transformation configurations
-        
+    
     Returns:
         Transformed DataFrame
+    
+    Raises:
+        ValueError: If a transformation is unknown or misconfigured
     """
     logger = get_run_logger()
     logger.info(f"Applying {len(transformations)} transformations to data")
     
-    # Make a copy to avoid modifying the original
-    df_transformed = df.copy()
+    # Validate and compile the steps, then run them on a single working copy
+    plan = compile_transformations(transformations)
+    logger.info(f"Compiled {len(transformations)} transformations into {len(plan)} steps")
     
-    # Apply each transformation
-    for i, transform in enumerate(transformations):
-        transform_type = transform.get("type")
-        logger.info(f"Applying transformation {i+1}/{len(transformations)}: {transform_type}")
-        
-        if transform_type == "drop_columns":
-            # Drop specified columns
-            columns = transform.get("columns", [])
-            df_transformed = df_transformed.drop(columns=columns)
-        
-        elif transform_type == "rename_columns":
-            # Rename columns
-            rename_map = transform.get("mapping", {})
-            df_transformed = df_transformed.rename(columns=rename_map)
-        
-        elif transform_type == "fill_missing":
-            # Fill missing values
-            columns = transform.get("columns", df_transformed.columns)
-            method = transform.get("method", "mean")
-            value = transform.get("value")
-            
-            for col in columns:
-                if col in df_transformed.columns:
-                    if method == "mean" and pd.api.types.is_numeric_dtype(df_transformed[col]):
-                        df_transformed[col] = df_transformed[col].fillna(df_transformed[col].mean())
-                    elif method == "median" and pd.api.types.is_numeric_dtype(df_transformed[col]):
-                        df_transformed[col] = df_transformed[col].fillna(df_transformed[col].median())
-                    elif method == "mode":
-                        df_transformed[col] = df_transformed[col].fillna(df_transformed[col].mode()[0])
-                    elif method == "value" and value is not None:
-                        df_transformed[col] = df_transformed[col].fillna(value)
-        
-        elif transform_type == "create_feature":
-            # Create new feature
-            feature_name = transform.get("name")
-            expression = transform.get("expression")
-            
-            if feature_name and expression:
-                # Use eval to apply the expression
-                df_transformed[feature_name] = df_transformed.eval(expression)
-        
-        elif transform_type == "filter_rows":
-            # Filter rows based on condition
-            condition = transform.get("condition")
-            if condition:
-                df_transformed = df_transformed.query(condition)
-        
-        elif transform_type == "encode_categorical":
-            # Encode categorical variables
-            columns = transform.get("columns", [])
-            method = transform.get("method", "one_hot")
-            
-            if method == "one_hot":
-                for col in columns:
-                    if col in df_transformed.columns:
-                        dummies = pd.get_dummies(df_transformed[col], prefix=col)
-                        df_transformed = pd.concat([df_transformed, dummies], axis=1)
-                        df_transformed = df_transformed.drop(columns=[col])
-            
-            elif method == "label":
-                for col in columns:
-                    if col in df_transformed.columns:
-                        df_transformed[col] = df_transformed[col].astype("category").cat.codes
-        
-        elif transform_type == "normalize":
-            # Normalize numeric columns
-            columns = transform.get("columns", df_transformed.select_dtypes(include=["number"]).columns)
-            method = transform.get("method", "minmax")
-            
-            for col in columns:
-                if col in df_transformed.columns and pd.api.types.is_numeric_dtype(df_transformed[col]):
-                    if method == "minmax":
-                        min_val = df_transformed[col].min()
-                        max_val = df_transformed[col].max()
-                        df_transformed[col] = (df_transformed[col] - min_val) / (max_val - min_val)
-                    elif method == "zscore":
-                        mean_val = df_transformed[col].mean()
-                        std_val = df_transformed[col].std()
-                        df_transformed[col] = (df_transformed[col] - mean_val) / std_val
-        
-        elif transform_type == "custom_python":
-            # Apply custom Python function
-            code = transform.get("code")
-            if code:
-                # Create a function from the code
-                local_vars = {"df": df_transformed}
-                exec(code, globals(), local_vars)
-                df_transformed = local_vars["df"]
+    for i, step in enumerate(plan):
+        logger.info(f"Plan step {i+1}/{len(plan)}: {step['type']}")
+    
+    df_transformed = execute_plan(df, plan)
     
     # Log transformation results
     logger.info(f"Transformation complete. Shape: {df_transformed.shape}")
@@ -214,7 +201,8 @@ def transform_data(
                 f"- **Transformed Shape**: {df_transformed.shape}\n"
                 f"- **Columns Added**: {set(df_transformed.columns) - set(df.columns)}\n"
                 f"- **Columns Removed**: {set(df.columns) - set(df_transformed.columns)}\n"
-                f"- **Transformations Applied**: {len(transformations)}",
+                f"- **Transformations Applied**: {len(transformations)}\n"
+                f"- **Plan Steps**: {len(plan)}",
         key=f"etl-transformation-{datetime.now().strftime('%Y%m%d-%H%M%S')}",
     )
     
@@ -229,18 +217,27 @@ def load_data_to_destination(
     destination_table: Optional[str] = None,
     destination_db: Optional[str] = None,
     if_exists: str = "replace",
+    key_columns: Optional[List[str]] = None,
+    partition_cols: Optional[List[str]] = None,
 ) -> str:
     """
     Load data to a destination.
     
+    Database tables are loaded in bulk within a single transaction.
+    Partitioned destinations are Hive-partitioned Parquet directories.
+    
     Args:
         df: DataFrame to load
-        destination_type: Type of destination (file, database)
-        destination_path: Path to the destination file
+        destination_type: Type of destination (file, database, partitioned)
+        destination_path: Path to the destination file or dataset directory
         destination_table: Table name for database destination
         destination_db: Database connection string
-        if_exists: What to do if the destination exists (replace, append, fail)
-        
+        if_exists: What to do if the destination exists (replace, append, fail,
+            upsert for database tables or replace_partitions for
+            partitioned datasets)
+        key_columns: Columns identifying a row, for database upserts
+        partition_cols: Columns to partition a partitioned dataset by
+    
     Returns:
         Path or identifier of the loaded data
     """
@@ -276,15 +273,215 @@ def load_data_to_destination(
         # Load to database
         logger.info(f"Loading data to database table: {destination_table}")
         
-        # Use SQLAlchemy connector
-        connector = SqlAlchemyConnector.load("portfolio-db")
-        with connector.get_connection() as engine:
-            df.to_sql(destination_table, engine, if_exists=if_exists, index=False)
+        # Use the shared, pooled engine; the load is a single transaction
+        with get_engine(destination_db).begin() as connection:
+            bulk_load(df, destination_table, connection, if_exists=if_exists, key_columns=key_columns)
         
         return f"{destination_db}/{destination_table}"
     
+    elif destination_type == "partitioned" and destination_path:
+        # Only the partitions in the data are written (or replaced)
+        logger.info(f"Writing partitioned dataset: {destination_path}")
+        
+        with PartitionedDatasetWriter(destination_path, partition_cols or [], mode=if_exists) as writer:
+            writer.write(df)
+        
+        return destination_path
+    
+    else:
+        raise ValueError(f"Invalid destination configuration for type: {destination_type}")
+
+
+def iter_source_chunks(
+    source_type: str,
+    chunksize: int,
+    source_path: Optional[str] = None,
+    source_url: Optional[str] = None,
+    source_query: Optional[str] = None,
+    source_db: Optional[str] = None,
+    dataset_name: Optional[str] = None,
+    columns: Optional[List[str]] = None,
+    filters: Optional[List] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Extract data from a source in chunks of rows.
+    
+    Files are read with chunked readers, CSV and JSON Lines responses are
+    parsed from the streamed HTTP body, database queries use a server-side cursor and
+    partitioned datasets are scanned in record batches.
+    
+    Args:
+        source_type: Type of source (file, url, database, dataset, partitioned)
+        chunksize: Number of rows per chunk
+        source_path: Path to the source file or partitioned dataset directory
+        source_url: URL to the source data
+        source_query: SQL query for database source
+        source_db: Database connection string
+        dataset_name: Name of the dataset (for predefined datasets)
+        columns: Columns to read from a partitioned dataset (all if None)
+        filters: Row filters for a partitioned dataset
+    
+    Yields:
+        DataFrame for each chunk of rows
+    """
+    logger = get_run_logger()
+    logger.info(f"Streaming data from {source_type} source in chunks of {chunksize} rows")
+    
+    if source_type == "file" and source_path:
+        yield from iter_dataset_chunks(Path(source_path), chunksize)
+    
+    elif source_type == "url" and source_url:
+        yield from iter_url_chunks(source_url, chunksize)
+    
+    elif source_type == "database" and source_query and source_db:
+        with get_engine(source_db).connect() as connection:
+            # Server-side cursor so rows are fetched one chunk at a time
+            connection = connection.execution_options(stream_results=True)
+            yield from pd.read_sql(source_query, connection, chunksize=chunksize)
+    
+    elif source_type == "partitioned" and source_path:
+        yield from iter_partitioned_chunks(source_path, chunksize, columns=columns, filters=filters)
+    
+    elif source_type == "dataset" and dataset_name:
+        yield from iter_dataset_chunks(download_dataset(dataset_name), chunksize)
+    
     else:
+        raise ValueError(f"Invalid source configuration for type: {source_type}")
+
+
+@task(retries=3, retry_delay_seconds=10)
+def stream_extract_transform_load(
+    source_type: str,
+    destination_type: str,
+    chunksize: int,
+    transformations: Optional[List[Dict]] = None,
+    source_path: Optional[str] = None,
+    source_url: Optional[str] = None,
+    source_query: Optional[str] = None,
+    source_db: Optional[str] = None,
+    dataset_name: Optional[str] = None,
+    destination_path: Optional[str] = None,
+    destination_table: Optional[str] = None,
+    destination_db: Optional[str] = None,
+    if_exists: str = "replace",
+    key_columns: Optional[List[str]] = None,
+    columns: Optional[List[str]] = None,
+    filters: Optional[List] = None,
+    partition_cols: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Extract, transform and load data one chunk at a time.
+    
+    Each chunk is transformed with the row-local transformation plan and
+    written to the destination before the next one is read, so memory is
+    bounded by the chunk size. File destinations are written to a temporary
+    file that replaces the destination when all chunks are written,
+    partitioned datasets are staged and merged in when all chunks are
+    written, and database tables are loaded in bulk within a single
+    transaction.
+    
+    Args:
+        source_type: Type of source (file, url, database, dataset, partitioned)
+        destination_type: Type of destination (file, database, partitioned)
+        chunksize: Number of rows per chunk
+        transformations: List of row-local transformation configurations
+        source_path: Path to the source file or partitioned dataset directory
+        source_url: URL to the source data
+        source_query: SQL query for database source
+        source_db: Database connection string for source
+        dataset_name: Name of the dataset (for predefined datasets)
+        destination_path: Path to the destination file (CSV or Parquet) or
+            partitioned dataset directory
+        destination_table: Table name for database destination
+        destination_db: Database connection string for destination
+        if_exists: What to do if the destination exists (replace, append, fail,
+            upsert for database tables or replace_partitions for
+            partitioned datasets)
+        key_columns: Columns identifying a row, for database upserts
+        columns: Columns to read from a partitioned dataset source
+        filters: Row filters for a partitioned dataset source
+        partition_cols: Columns to partition a partitioned destination by
+    
+    Returns:
+        Dictionary with the result, row and chunk counts and columns
+    """
+    logger = get_run_logger()
+    
+    plan = compile_transformations(transformations or [])
+    check_streamable(plan)
+    
+    # Validate the destination before reading any data
+    writer = None
+    if destination_type == "file" and destination_path:
+        if os.path.splitext(destination_path)[1].lower() not in (".csv", ".parquet"):
+            raise ValueError("Streaming file destinations must be .csv or .parquet files")
+        if if_exists == "fail" and os.path.exists(destination_path):
+            raise ValueError(f"Destination {destination_path} already exists")
+        os.makedirs(os.path.dirname(destination_path) or ".", exist_ok=True)
+        writer = DatasetWriter(path=destination_path, append=if_exists == "append")
+    elif destination_type == "partitioned" and destination_path:
+        writer = PartitionedDatasetWriter(destination_path, partition_cols or [], mode=if_exists)
+    elif not (destination_type == "database" and destination_table and destination_db):
         raise ValueError(f"Invalid destination configuration for type: {destination_type}")
+    
+    rows = 0
+    chunks = 0
+    loaded_columns = []
+    try:
+        with ExitStack() as stack:
+            # One destination connection and transaction for all chunks
+            connection = None
+            if writer is None:
+                connection = stack.enter_context(get_engine(destination_db).begin())
+            
+            for chunk in iter_source_chunks(
+                source_type,
+                chunksize,
+                source_path=source_path,
+                source_url=source_url,
+                source_query=source_query,
+                source_db=source_db,
+                dataset_name=dataset_name,
+                columns=columns,
+                filters=filters,
+            ):
+                # Chunks are not shared, so the plan can modify them in place
+                chunk = execute_plan(chunk, plan, copy=False)
+                
+                if writer is not None:
+                    writer.write(chunk)
+                else:
+                    # Later chunks append, or keep merging by key in upsert mode
+                    bulk_load(
+                        chunk,
+                        destination_table,
+                        connection,
+                        if_exists=if_exists if chunks == 0 or if_exists == "upsert" else "append",
+                        key_columns=key_columns,
+                    )
+                
+                rows += len(chunk)
+                chunks += 1
+                loaded_columns = list(chunk.columns)
+                logger.info(f"Loaded chunk {chunks} ({rows} rows so far)")
+        
+            if connection is not None and chunks == 0 and if_exists == "replace":
+                # Without a chunk there is no schema to write, but the old rows must still go
+                if clear_table(connection, destination_table):
+                    logger.info(f"Source was empty; cleared {destination_table}")
+        
+        if writer is not None:
+            result = str(writer.close())
+        else:
+            result = f"{destination_db}/{destination_table}"
+    except Exception:
+        if writer is not None:
+            writer.abort()
+        raise
+    
+    logger.info(f"Streamed {rows} rows in {chunks} chunks to {result}")
+    
+    return {"result": result, "rows": rows, "chunks": chunks, "columns": loaded_columns}
 
 
 @flow(
@@ -295,7 +492,7 @@ def load_data_to_destination(
     log_prints=ETL_FLOW.log_prints,
 )
 def extract_transform_load(
-    source_type: str,
+    source_type: Optional[str],
     destination_type: str,
     transformations: List[Dict] = None,
     source_path: Optional[str] = None,
@@ -307,39 +504,152 @@ def extract_transform_load(
     destination_table: Optional[str] = None,
     destination_db: Optional[str] = None,
     if_exists: str = "replace",
+    chunksize: Optional[int] = None,
+    key_columns: Optional[List[str]] = None,
+    sources: Optional[List[Dict]] = None,
+    combine: str = "union",
+    join_key: Optional[Union[str, List[str]]] = None,
+    join_how: str = "inner",
+    pagination: Optional[Dict] = None,
+    columns: Optional[List[str]] = None,
+    filters: Optional[List] = None,
+    partition_cols: Optional[List[str]] = None,
 ) -> str:
     """
     Extract, transform, and load data from various sources to destinations.
     
+    With a chunksize the data is streamed: each chunk is extracted,
+    transformed and loaded before the next one is read. Streaming requires
+    row-local transformations and a CSV, Parquet, partitioned or database
+    destination.
+    
+    Partitioned destinations write Hive-style partitions by partition_cols;
+    appending writes only the new rows' partitions. Partitioned sources read
+    just the requested columns and skip partitions and row groups that the
+    filters rule out.
+    
+    Database connection strings are SQLAlchemy URLs or names of
+    SqlAlchemyConnector blocks; each database gets one pooled engine that
+    is shared by all tasks in the process.
+    
+    Several sources can be given as a list of dictionaries with the
+    source_* arguments (plus an optional "name"). They are extracted
+    concurrently and unioned, or joined on a key, before transformation.
+    
     Args:
-        source_type: Type of source (file, url, database, api, dataset)
-        destination_type: Type of destination (file, database)
+        source_type: Type of source (file, url, database, api, dataset, partitioned)
+        destination_type: Type of destination (file, database, partitioned)
         transformations: List of transformation configurations
-        source_path: Path to the source file
+        source_path: Path to the source file or partitioned dataset directory
         source_url: URL to the source data
         source_query: SQL query for database source
         source_db: Database connection string for source
         dataset_name: Name of the dataset (for predefined datasets)
-        destination_path: Path to the destination file
+        destination_path: Path to the destination file or dataset directory
         destination_table: Table name for database destination
         destination_db: Database connection string for destination
-        if_exists: What to do if the destination exists (replace, append, fail)
-        
+        if_exists: What to do if the destination exists (replace, append, fail,
+            upsert for database tables or replace_partitions for
+            partitioned datasets)
+        chunksize: Stream the data in chunks of this many rows
+        key_columns: Columns identifying a row, for database upserts
+        sources: List of source configurations to extract concurrently
+            (replaces the single source arguments)
+        combine: How to combine several sources ("union" or "join")
+        join_key: Column(s) to join several sources on
+        join_how: Type of join (inner, left, right, outer)
+        pagination: Pagination settings for a paginated JSON API source
+        columns: Columns to read from a partitioned dataset source
+        filters: Row filters for a partitioned dataset source, as
+            (column, op, value) triples
+        partition_cols: Columns to partition a partitioned destination by
+    
     Returns:
         Path or identifier of the loaded data
     """
     # Log flow run info
     flow_info = log_flow_run_info()
     
+    if sources:
+        for i, source in enumerate(sources):
+            unknown = set(source) - set(SOURCE_FIELDS) - {"name"}
+            if unknown or not source.get("source_type"):
+                raise ValueError(f"Invalid configuration for source {i + 1}: {source}")
+        if chunksize:
+            raise ValueError("Streaming mode supports a single source")
+        if combine == "join" and not join_key:
+            raise ValueError("Joining sources requires a join_key")
+    if chunksize and pagination:
+        raise ValueError("Streaming mode does not support paginated sources")
+    
+    # Streaming mode: extract, transform and load chunk by chunk
+    if chunksize:
+        # Fail fast (without task retries) on transformations that cannot stream
+        check_streamable(compile_transformations(transformations or []))
+        
+        summary = stream_extract_transform_load(
+            source_type=source_type,
+            destination_type=destination_type,
+            chunksize=chunksize,
+            transformations=transformations,
+            source_path=source_path,
+            source_url=source_url,
+            source_query=source_query,
+            source_db=source_db,
+            dataset_name=dataset_name,
+            destination_path=destination_path,
+            destination_table=destination_table,
+            destination_db=destination_db,
+            if_exists=if_exists,
+            key_columns=key_columns,
+            columns=columns,
+            filters=filters,
+            partition_cols=partition_cols,
+        )
+        
+        create_markdown_artifact(
+            markdown=f"## ETL Flow Summary\n\n"
+                    f"- **Source Type**: {source_type}\n"
+                    f"- **Destination Type**: {destination_type}\n"
+                    f"- **Mode**: streaming ({summary['chunks']} chunks of {chunksize} rows)\n"
+                    f"- **Records Processed**: {summary['rows']}\n"
+                    f"- **Columns**: {len(summary['columns'])}\n"
+                    f"- **Transformations Applied**: {len(transformations) if transformations else 0}\n"
+                    f"- **Result**: {summary['result']}\n"
+                    f"- **Timestamp**: {datetime.now().isoformat()}",
+            key=f"etl-summary-{flow_info['flow_run_id']}",
+        )
+        
+        return summary["result"]
+    
     # Extract data
-    df = extract_data(
-        source_type=source_type,
-        source_path=source_path,
-        source_url=source_url,
-        source_query=source_query,
-        source_db=source_db,
-        dataset_name=dataset_name,
-    )
+    if sources:
+        # Submit every extraction so the I/O-bound sources run concurrently
+        futures = [
+            extract_data.submit(**{field: source.get(field) for field in SOURCE_FIELDS})
+            for source in sources
+        ]
+        names = [source.get("name", f"source{i + 1}") for i, source in enumerate(sources)]
+        df = combine_sources(
+            [future.result() for future in futures],
+            names,
+            combine=combine,
+            join_key=join_key,
+            join_how=join_how,
+        )
+        source_type = ", ".join(sorted({source["source_type"] for source in sources}))
+    else:
+        df = extract_data(
+            source_type=source_type,
+            source_path=source_path,
+            source_url=source_url,
+            source_query=source_query,
+            source_db=source_db,
+            dataset_name=dataset_name,
+            pagination=pagination,
+            columns=columns,
+            filters=filters,
+        )
     
     # Transform data if transformations are provided
     if transformations:
@@ -353,6 +663,8 @@ def extract_transform_load(
         destination_table=destination_table,
         destination_db=destination_db,
         if_exists=if_exists,
+        key_columns=key_columns,
+        partition_cols=partition_cols,
     )
     
     # Create summary artifact
@@ -400,6 +712,10 @@ if __name__ == "__main__":
                 "Churn": "has_churned"
             }
         },
+        {
+            "type": "encode_binary",
+            "output": "int8"
+        },
         {
             "type": "fill_missing",
             "columns": ["total_charges"],
@@ -0,0 +1,498 @@
+"""
+Safe, compiled expressions and registered UDFs for the transformation plans.
+
+Expressions for create_feature and filter_rows use the df.eval/df.query
+syntax: arithmetic, comparisons (also chained), and/or/not, "in" lists,
+backtick-quoted column names and a fixed set of vectorized functions. As in
+pandas, "&" and "|" have boolean precedence ("a > 1 & b == 2" compares
+first) and "col == [...]" / "col != [...]" test list membership. Common
+Series methods are available on columns ("col.max()", "col.str.len()",
+"col.dt.year"; see _SERIES_METHODS, _STR_METHODS and _DT_ATTRIBUTES).
+
+Each expression is parsed and validated once into a tree of closures that
+evaluate whole columns at a time; compiled expressions are cached by their
+source. Names, attributes, calls and literals outside the allowed grammar
+are rejected with an error naming the construct, so configuration files
+cannot run arbitrary code. Unlike df.query, local variables ("@name") and
+methods outside the lists above are not supported.
+
+Custom logic is added through registered functions: register_function adds
+an element-wise function usable inside expressions, and register_udf adds a
+whole-frame transformation usable as a "udf" step.
+"""
+
+import ast
+import io
+import operator
+import re
+import tokenize
+import numpy as np
+import pandas as pd
+from functools import lru_cache
+from typing import Any, Callable, Dict, FrozenSet, Optional
+
+Evaluator = Callable[[pd.DataFrame], Any]
+
+_BINARY_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+    ast.BitAnd: operator.and_,
+    ast.BitOr: operator.or_,
+    ast.BitXor: operator.xor,
+}
+
+# Largest constant exponent, and largest folded integer power in bits; Python
+# integers grow without bound, so "10 ** 10 ** 10" would never finish
+_MAX_EXPONENT = 128
+_MAX_POWER_BITS = 4096
+
+# Marks subexpressions that depend on the DataFrame and cannot be folded
+_NOT_CONSTANT = object()
+
+_COMPARE_OPS = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+}
+
+
+def _logical_not(value: Any) -> Any:
+    """Negate a boolean column or scalar."""
+    if isinstance(value, (bool, np.bool_)):
+        return not value
+    return ~value
+
+
+def _where(condition: Any, true_value: Any, false_value: Any) -> Any:
+    """Choose element-wise between two values, keeping the index of a Series condition."""
+    result = np.where(condition, true_value, false_value)
+    if isinstance(condition, pd.Series):
+        return pd.Series(result, index=condition.index)
+    return result
+
+
+def _as_series(value: Any, df: pd.DataFrame) -> Any:
+    """Wrap array results in a Series on the frame's index so Series methods apply."""
+    if isinstance(value, np.ndarray) and value.ndim == 1:
+        return pd.Series(value, index=df.index)
+    return value
+
+
+_UNARY_OPS = {
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos,
+    ast.Invert: operator.invert,
+    ast.Not: _logical_not,
+}
+
+# Element-wise functions available in expressions (extended by register_function)
+_FUNCTIONS: Dict[str, Callable] = {
+    "abs": np.abs,
+    "sqrt": np.sqrt,
+    "exp": np.exp,
+    "log": np.log,
+    "log10": np.log10,
+    "log1p": np.log1p,
+    "floor": np.floor,
+    "ceil": np.ceil,
+    "round": np.round,
+    "clip": np.clip,
+    "minimum": np.minimum,
+    "maximum": np.maximum,
+    "where": _where,
+    "isna": pd.isna,
+    "notna": pd.notna,
+}
+
+# Series methods callable on columns, e.g. "charges.max()"
+_SERIES_METHODS = {
+    "abs", "round", "clip", "fillna", "isna", "notna", "isnull", "notnull", "isin", "between",
+    "min", "max", "mean", "median", "sum", "std", "var", "count", "nunique",
+    "rank", "shift", "diff", "cumsum", "astype",
+}
+
+# Series methods whose result depends on other rows, so expressions using
+# them cannot be evaluated chunk by chunk
+_WHOLE_COLUMN_METHODS = {
+    "min", "max", "mean", "median", "sum", "std", "var", "count", "nunique",
+    "rank", "shift", "diff", "cumsum",
+}
+
+# String methods callable through ".str", e.g. "contract.str.len()"
+_STR_METHODS = {
+    "len", "lower", "upper", "strip", "lstrip", "rstrip", "title",
+    "startswith", "endswith", "contains", "match", "replace", "slice", "zfill",
+}
+
+# Datetime attributes available through ".dt", e.g. "signup_date.dt.year"
+_DT_ATTRIBUTES = {
+    "year", "quarter", "month", "day", "hour", "minute", "second",
+    "dayofweek", "dayofyear", "is_month_start", "is_month_end",
+}
+
+# Whole-frame transformations (see register_udf)
+_UDFS: Dict[str, Dict[str, Any]] = {}
+
+
+def register_function(name: str, function: Optional[Callable] = None):
+    """
+    Register an element-wise function for use in expressions.
+    
+    The function receives columns (Series) and constants and must return a
+    column or constant of the same length. Can be used as a decorator.
+    
+    Args:
+        name: Name used in expressions
+        function: Vectorized function
+    
+    Returns:
+        The function (or a decorator if function is None)
+    """
+    def register(function: Callable) -> Callable:
+        _FUNCTIONS[name] = function
+        return function
+    
+    return register if function is None else register(function)
+
+
+def register_udf(name: str, function: Optional[Callable] = None, row_local: bool = False):
+    """
+    Register a whole-frame transformation for "udf" transformation steps.
+    
+    The function is called as function(df, **params) with the plan's
+    working copy and returns the transformed DataFrame (it may modify df in
+    place). Can be used as a decorator.
+    
+    Args:
+        name: Name used in "udf" steps
+        function: Vectorized transformation
+        row_local: Whether the function transforms each row independently,
+            which allows it in streaming mode
+    
+    Returns:
+        The function (or a decorator if function is None)
+    """
+    def register(function: Callable) -> Callable:
+        _UDFS[name] = {"function": function, "row_local": row_local}
+        return function
+    
+    return register if function is None else register(function)
+
+
+def get_udf(name: str) -> Dict[str, Any]:
+    """
+    Get a registered UDF.
+    
+    Args:
+        name: Registered name
+    
+    Returns:
+        Dictionary with the "function" and its "row_local" flag
+    
+    Raises:
+        ValueError: If no UDF is registered under the name
+    """
+    if name not in _UDFS:
+        raise ValueError(f"Unknown UDF '{name}' (registered: {sorted(_UDFS)})")
+    return _UDFS[name]
+
+
+class CompiledExpression:
+    """
+    A validated expression compiled to vectorized column operations.
+    """
+    
+    def __init__(self, source: str, evaluator: Evaluator, columns: FrozenSet[str], row_local: bool = True):
+        self.source = source
+        self.columns = columns
+        self.row_local = row_local
+        self._evaluator = evaluator
+    
+    def evaluate(self, df: pd.DataFrame) -> Any:
+        """
+        Evaluate the expression on a DataFrame.
+        
+        Args:
+            df: DataFrame with the referenced columns
+        
+        Returns:
+            Series, array or scalar result
+        """
+        missing = self.columns - set(df.columns)
+        if missing:
+            raise ValueError(f"Columns not found for expression '{self.source}': {sorted(missing)}")
+        return self._evaluator(df)
+    
+    def mask(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Evaluate a condition as a boolean mask (missing values are False).
+        
+        Args:
+            df: DataFrame with the referenced columns
+        
+        Returns:
+            Boolean NumPy array with one value per row
+        """
+        result = self.evaluate(df)
+        if np.ndim(result) == 0:
+            return np.full(len(df), bool(result))
+        if isinstance(result, pd.Series):
+            return result.to_numpy(dtype=bool, na_value=False)
+        return np.asarray(result, dtype=bool)
+    
+    def __repr__(self) -> str:
+        return f"CompiledExpression({self.source!r})"
+
+
+class _Compiler:
+    """Compile a parsed expression into closures, collecting the columns it reads."""
+    
+    def __init__(self, source: str, quoted: Dict[str, str]):
+        self.source = source
+        self.quoted = quoted
+        self.columns = set()
+        self.row_local = True
+    
+    def error(self, message: str) -> ValueError:
+        """Build the error for an invalid expression."""
+        return ValueError(f"Invalid expression '{self.source}': {message}")
+    
+    def literal(self, node: ast.AST) -> Any:
+        """Get the value of a constant or a list/tuple of constants."""
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float, str, bool, type(None))):
+            return node.value
+        if isinstance(node, (ast.List, ast.Tuple)):
+            return [self.literal(element) for element in node.elts]
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+            value = self.literal(node.operand)
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                return -value
+        raise self.error(f"unsupported literal {ast.dump(node)}")
+    
+    def check_power(self, base: Any, exponent: Any):
+        """Reject constant exponents that would make a power too expensive to compute."""
+        if not isinstance(exponent, (int, float)) or isinstance(exponent, bool):
+            return
+        if abs(exponent) > _MAX_EXPONENT:
+            raise self.error(f"exponent {exponent} is larger than {_MAX_EXPONENT}")
+        if isinstance(base, int) and isinstance(exponent, int) and abs(base).bit_length() * exponent > _MAX_POWER_BITS:
+            raise self.error(f"{base} ** {exponent} is too large")
+    
+    def fold(self, node: ast.AST) -> Any:
+        """Evaluate an arithmetic subexpression of constants at compile time."""
+        if isinstance(node, ast.Constant):
+            return self.literal(node)
+        
+        if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPS:
+            left, right = self.fold(node.left), self.fold(node.right)
+            if left is _NOT_CONSTANT or right is _NOT_CONSTANT:
+                return _NOT_CONSTANT
+            if isinstance(node.op, ast.Pow):
+                self.check_power(left, right)
+            try:
+                return _BINARY_OPS[type(node.op)](left, right)
+            except (ArithmeticError, TypeError, ValueError) as e:
+                raise self.error(str(e))
+        
+        if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY_OPS:
+            operand = self.fold(node.operand)
+            if operand is _NOT_CONSTANT:
+                return _NOT_CONSTANT
+            try:
+                return _UNARY_OPS[type(node.op)](operand)
+            except (ArithmeticError, TypeError, ValueError) as e:
+                raise self.error(str(e))
+        
+        return _NOT_CONSTANT
+    
+    def compile(self, node: ast.AST) -> Evaluator:
+        """Compile an expression node into a function of the DataFrame."""
+        if isinstance(node, ast.Name):
+            # Bare names are always columns
+            name = self.quoted.get(node.id, node.id)
+            self.columns.add(name)
+            return lambda df: df[name]
+        
+        if isinstance(node, (ast.Constant, ast.List, ast.Tuple)):
+            value = self.literal(node)
+            return lambda df: value
+        
+        if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPS:
+            value = self.fold(node)
+            if value is not _NOT_CONSTANT:
+                return lambda df: value
+            if isinstance(node.op, ast.Pow):
+                # Column bases are fixed-width arrays, but the exponent still bounds the work
+                self.check_power(None, self.fold(node.right))
+            
+            op = _BINARY_OPS[type(node.op)]
+            left, right = self.compile(node.left), self.compile(node.right)
+            return lambda df: op(left(df), right(df))
+        
+        if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY_OPS:
+            op = _UNARY_OPS[type(node.op)]
+            operand = self.compile(node.operand)
+            return lambda df: op(operand(df))
+        
+        if isinstance(node, ast.BoolOp):
+            # "and"/"or" are element-wise, as in df.query
+            op = operator.and_ if isinstance(node.op, ast.And) else operator.or_
+            values = [self.compile(value) for value in node.values]
+            
+            def bool_op(df):
+                result = values[0](df)
+                for value in values[1:]:
+                    result = op(result, value(df))
+                return result
+            
+            return bool_op
+        
+        if isinstance(node, ast.Compare):
+            return self.compare(node)
+        
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute):
+            return self.method(node)
+        
+        if isinstance(node, ast.Attribute):
+            return self.attribute(node)
+        
+        if isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name) or node.func.id not in _FUNCTIONS:
+                raise self.error(f"unknown function (available: {sorted(_FUNCTIONS)})")
+            if node.keywords:
+                raise self.error("keyword arguments are not supported")
+            name = node.func.id
+            args = [self.compile(arg) for arg in node.args]
+            # Looked up on each call so re-registered functions take effect
+            return lambda df: _FUNCTIONS[name](*(arg(df) for arg in args))
+        
+        raise self.error(f"unsupported syntax '{type(node).__name__}'")
+    
+    def method(self, node: ast.Call) -> Evaluator:
+        """Compile a whitelisted Series or ".str" method call on a column."""
+        name = node.func.attr
+        owner = node.func.value
+        args = [self.literal(arg) for arg in node.args]
+        kwargs = {keyword.arg: self.literal(keyword.value) for keyword in node.keywords}
+        
+        if isinstance(owner, ast.Attribute) and owner.attr == "str":
+            if name not in _STR_METHODS:
+                raise self.error(f"unsupported string method '.str.{name}()' (available: {sorted(_STR_METHODS)})")
+            target = self.compile(owner.value)
+            return lambda df: getattr(_as_series(target(df), df).str, name)(*args, **kwargs)
+        
+        if name not in _SERIES_METHODS:
+            raise self.error(f"unsupported method '.{name}()' (available: {sorted(_SERIES_METHODS)})")
+        if name in _WHOLE_COLUMN_METHODS:
+            self.row_local = False
+        target = self.compile(owner)
+        return lambda df: getattr(_as_series(target(df), df), name)(*args, **kwargs)
+    
+    def attribute(self, node: ast.Attribute) -> Evaluator:
+        """Compile a whitelisted ".dt" attribute of a column."""
+        owner = node.value
+        if isinstance(owner, ast.Attribute) and owner.attr == "dt":
+            if node.attr not in _DT_ATTRIBUTES:
+                raise self.error(f"unsupported attribute '.dt.{node.attr}' (available: {sorted(_DT_ATTRIBUTES)})")
+            target = self.compile(owner.value)
+            name = node.attr
+            return lambda df: getattr(_as_series(target(df), df).dt, name)
+        raise self.error(f"unsupported attribute '.{node.attr}'")
+    
+    def compare(self, node: ast.Compare) -> Evaluator:
+        """Compile a (possibly chained) comparison into element-wise tests."""
+        operands = [self.compile(node.left)] + [self.compile(c) for c in node.comparators]
+        tests = []
+        for i, (op, comparator) in enumerate(zip(node.ops, node.comparators)):
+            if isinstance(op, (ast.Eq, ast.NotEq)) and isinstance(comparator, (ast.List, ast.Tuple)):
+                # "col == [...]" is list membership, as in df.query
+                op = ast.In() if isinstance(op, ast.Eq) else ast.NotIn()
+            if isinstance(op, (ast.In, ast.NotIn)):
+                values = self.literal(comparator)
+                if not isinstance(values, list):
+                    raise self.error("'in' needs a list of values")
+                negate = isinstance(op, ast.NotIn)
+                left = operands[i]
+                tests.append(lambda df, left=left, values=values, negate=negate: (
+                    _logical_not(pd.Series(left(df)).isin(values)) if negate
+                    else pd.Series(left(df)).isin(values)
+                ))
+            elif type(op) in _COMPARE_OPS:
+                compare = _COMPARE_OPS[type(op)]
+                left, right = operands[i], operands[i + 1]
+                tests.append(lambda df, compare=compare, left=left, right=right: compare(left(df), right(df)))
+            else:
+                raise self.error(f"unsupported comparison '{type(op).__name__}'")
+        
+        if len(tests) == 1:
+            return tests[0]
+        
+        def chained(df):
+            result = tests[0](df)
+            for test in tests[1:]:
+                result = result & test(df)
+            return result
+        
+        return chained
+
+
+def _boolean_operators(text: str) -> str:
+    """
+    Rewrite "&" and "|" to "and" and "or", as pandas does.
+    
+    Python binds "&" and "|" tighter than comparisons; in df.query and
+    df.eval they join comparisons, so "a > 1 & b == 2" means
+    "(a > 1) and (b == 2)". "~" stays a (boolean) inversion.
+    """
+    replacements = {"&": "and", "|": "or"}
+    tokens = [
+        (tokenize.NAME, replacements[token.string])
+        if token.type == tokenize.OP and token.string in replacements
+        else (token.type, token.string)
+        for token in tokenize.generate_tokens(io.StringIO(text).readline)
+    ]
+    return tokenize.untokenize(tokens)
+
+
+@lru_cache(maxsize=1024)
+def compile_expression(source: str) -> CompiledExpression:
+    """
+    Parse, validate and compile an expression.
+    
+    Args:
+        source: Expression in df.eval/df.query syntax
+    
+    Returns:
+        CompiledExpression (cached per source string)
+    
+    Raises:
+        ValueError: If the expression is invalid or uses unsupported syntax
+    """
+    # Backtick-quoted column names become placeholder identifiers
+    quoted = {}
+    
+    def quote(match: re.Match) -> str:
+        placeholder = f"__column_{len(quoted)}"
+        quoted[placeholder] = match.group(1)
+        return placeholder
+    
+    text = re.sub(r"`([^`]*)`", quote, source)
+    if "@" in text:
+        raise ValueError(f"Invalid expression '{source}': local variables (@name) are not supported")
+    
+    try:
+        tree = ast.parse(_boolean_operators(text.strip()), mode="eval")
+    except (SyntaxError, tokenize.TokenError) as e:
+        raise ValueError(f"Invalid expression '{source}': {e.args[0]}") from e
+    
+    compiler = _Compiler(source, quoted)
+    evaluator = compiler.compile(tree.body)
+    return CompiledExpression(source, evaluator, frozenset(compiler.columns), compiler.row_local)
@@ -0,0 +1,386 @@
+"""
+Precomputed cross-validation folds for model training.
+
+The preprocessing pipeline is fitted once per CV fold and once on the full
+training set, and the transformed matrices are stored on disk. Every
+algorithm trained on the same data then reuses them instead of refitting
+the imputers, scaler and encoder inside its own pipeline. Large matrices
+are memory-mapped, so parallel training processes share them instead of
+each holding a copy.
+
+Fold caches are keyed by a content hash of the training data (see
+flows.utils.frame_content_hash), the preprocessor configuration and the CV settings, so later
+training runs on unchanged data reuse them too. Caches that have not been
+used for a while, or exceed the configured total size, are evicted. The fitted fold preprocessors are kept as well, so models
+fitted on the folds can be combined into a deployable FoldEnsemble.
+"""
+
+import json
+import os
+import shutil
+import time
+import uuid
+import joblib
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from scipy import sparse as sp
+from typing import Any, Dict, List, Optional, Tuple
+
+from sklearn.base import clone
+from sklearn.metrics import get_scorer
+from sklearn.model_selection import check_cv
+from sklearn.pipeline import Pipeline
+
+from .config import FOLD_CACHE_SETTINGS
+from .utils import frame_content_hash
+
+MANIFEST_FILE = "manifest.json"
+
+# Bump when the cache layout changes so old caches are not reused
+CACHE_FORMAT = 4
+
+
+def fold_cache_key(
+    X: pd.DataFrame,
+    y: pd.Series,
+    preprocessor: Any,
+    cv_folds: int,
+    classification: bool,
+) -> str:
+    """
+    Build the cache key of a set of preprocessed folds.
+    
+    X and y are hashed row-wise with frame_content_hash, which is much faster
+    than pickling them for joblib.hash.
+    
+    Args:
+        X: Training features
+        y: Training target
+        preprocessor: Unfitted preprocessing pipeline
+        cv_folds: Number of CV folds
+        classification: Whether folds are stratified by class
+    
+    Returns:
+        Hex digest identifying the folds
+    """
+    try:
+        x_hash, y_hash = frame_content_hash(X), frame_content_hash(y)
+    except TypeError:
+        x_hash, y_hash = joblib.hash(X), joblib.hash(y)
+    return joblib.hash((CACHE_FORMAT, x_hash, y_hash, preprocessor, cv_folds, classification))
+
+
+def _directory_size(directory: Path) -> int:
+    """
+    Get the total size of the files in a directory.
+    
+    Args:
+        directory: Directory to measure
+    
+    Returns:
+        Size in bytes
+    """
+    return sum(path.stat().st_size for path in directory.rglob("*") if path.is_file())
+
+
+def evict_fold_caches(keep: Optional[str] = None) -> List[str]:
+    """
+    Remove fold caches that have not been used recently.
+    
+    Caches (and leftover staging directories) unused for more than
+    max_age_days are removed first, then the least recently used caches
+    until the total size is at most max_size_mb. A cache counts as used
+    when it is built or reused.
+    
+    Args:
+        keep: Key of a cache that must not be removed
+    
+    Returns:
+        Names of the removed directories
+    """
+    cache_dir = Path(FOLD_CACHE_SETTINGS["cache_dir"])
+    if not cache_dir.exists():
+        return []
+    
+    max_age_days = FOLD_CACHE_SETTINGS.get("max_age_days")
+    max_size_mb = FOLD_CACHE_SETTINGS.get("max_size_mb")
+    cutoff = time.time() - max_age_days * 86400 if max_age_days is not None else None
+    
+    # Least recently used first
+    entries = sorted(
+        (path.stat().st_mtime, path) for path in cache_dir.iterdir() if path.is_dir()
+    )
+    removed = []
+    kept = []
+    for mtime, path in entries:
+        if path.name != keep and cutoff is not None and mtime < cutoff:
+            shutil.rmtree(path, ignore_errors=True)
+            removed.append(path.name)
+        elif not path.name.endswith(".part"):
+            kept.append((path, _directory_size(path)))
+    
+    if max_size_mb is not None:
+        total = sum(size for _, size in kept)
+        for path, size in kept:
+            if total <= max_size_mb * 1024 * 1024:
+                break
+            if path.name != keep:
+                shutil.rmtree(path, ignore_errors=True)
+                removed.append(path.name)
+                total -= size
+    
+    return removed
+
+
+def _save_matrix(directory: Path, name: str, matrix: Any) -> str:
+    """
+    Save a transformed matrix.
+    
+    Args:
+        directory: Cache directory
+        name: File name without extension
+        matrix: Dense array or sparse matrix
+    
+    Returns:
+        File name of the saved matrix
+    """
+    if sp.issparse(matrix):
+        file_name = f"{name}.npz"
+        sp.save_npz(directory / file_name, matrix.tocsr())
+    else:
+        file_name = f"{name}.npy"
+        np.save(directory / file_name, np.ascontiguousarray(matrix, dtype=np.float64))
+    return file_name
+
+
+def load_matrix(directory: Path, file_name: str) -> Any:
+    """
+    Load a transformed matrix, memory-mapping large dense ones.
+    
+    Args:
+        directory: Cache directory
+        file_name: File name from the manifest
+    
+    Returns:
+        Dense array (possibly read-only and memory-mapped) or sparse matrix
+    """
+    path = Path(directory) / file_name
+    if path.suffix == ".npz":
+        return sp.load_npz(path)
+    
+    large = path.stat().st_size >= FOLD_CACHE_SETTINGS["mmap_threshold_mb"] * 1024 * 1024
+    return np.load(path, mmap_mode="r" if large else None)
+
+
+def build_fold_cache(
+    X: pd.DataFrame,
+    y: pd.Series,
+    preprocessor: Any,
+    cv_folds: int,
+    classification: bool,
+) -> Dict[str, Any]:
+    """
+    Fit the preprocessor per fold and store the transformed matrices.
+    
+    Folds are the ones cross_val_score would use (stratified for
+    classifiers), so scores match fitting the full pipeline per fold.
+    
+    Args:
+        X: Training features
+        y: Training target
+        preprocessor: Unfitted preprocessing pipeline
+        cv_folds: Number of CV folds
+        classification: Whether folds are stratified by class
+    
+    Returns:
+        Fold cache manifest (file names are relative to its "directory")
+    """
+    key = fold_cache_key(X, y, preprocessor, cv_folds, classification)
+    directory = Path(FOLD_CACHE_SETTINGS["cache_dir"]) / key
+    manifest_path = directory / MANIFEST_FILE
+    
+    if manifest_path.exists():
+        manifest = json.loads(manifest_path.read_text())
+        # Mark the cache as recently used for eviction
+        os.utime(directory)
+        manifest["directory"] = str(directory)
+        manifest["cached"] = True
+        return manifest
+    
+    # Build in a private directory and move it into place when complete
+    staging = directory.with_name(f"{key}.{uuid.uuid4().hex}.part")
+    staging.mkdir(parents=True)
+    
+    try:
+        folds = []
+        splitter = check_cv(cv_folds, y, classifier=classification)
+        for i, (train_idx, val_idx) in enumerate(splitter.split(X, y)):
+            fitted = clone(preprocessor).fit(X.iloc[train_idx], y.iloc[train_idx])
+            joblib.dump(fitted, staging / f"fold{i}_preprocessor.joblib")
+            np.save(staging / f"fold{i}_train_idx.npy", train_idx)
+            np.save(staging / f"fold{i}_val_idx.npy", val_idx)
+            folds.append({
+                "preprocessor": f"fold{i}_preprocessor.joblib",
+                "train_idx": f"fold{i}_train_idx.npy",
+                "val_idx": f"fold{i}_val_idx.npy",
+                "X_train": _save_matrix(staging, f"fold{i}_X_train", fitted.transform(X.iloc[train_idx])),
+                "X_val": _save_matrix(staging, f"fold{i}_X_val", fitted.transform(X.iloc[val_idx])),
+            })
+        
+        # The full-data fit is kept for the final models and their pipelines
+        fitted = clone(preprocessor).fit(X, y)
+        joblib.dump(fitted, staging / "preprocessor.joblib")
+        
+        manifest = {
+            "key": key,
+            "cv_folds": cv_folds,
+            "folds": folds,
+            "X_full": _save_matrix(staging, "X_full", fitted.transform(X)),
+            "preprocessor": "preprocessor.joblib",
+            "preprocessor_fits": len(folds) + 1,
+        }
+        (staging / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2))
+        
+        try:
+            os.replace(staging, directory)
+        except OSError:
+            # Another run stored the same folds first
+            shutil.rmtree(staging)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    
+    evict_fold_caches(keep=key)
+    
+    manifest["directory"] = str(directory)
+    manifest["cached"] = False
+    return manifest
+
+
+def load_full_fit(manifest: Dict[str, Any]) -> Tuple[Any, Any]:
+    """
+    Load the preprocessor fitted on the full training set and its output.
+    
+    Args:
+        manifest: Manifest from build_fold_cache
+    
+    Returns:
+        Tuple of the fitted preprocessor and the transformed training matrix
+    """
+    directory = Path(manifest["directory"])
+    preprocessor = joblib.load(directory / manifest["preprocessor"])
+    return preprocessor, load_matrix(directory, manifest["X_full"])
+
+
+def _fit_fold(
+    model: Any,
+    directory: Path,
+    fold: Dict[str, str],
+    y: pd.Series,
+    scoring: str,
+    validation: Optional[Tuple[pd.DataFrame, pd.Series]] = None,
+) -> Tuple[float, Pipeline]:
+    """Fit a copy of a model on one preprocessed fold and score it."""
+    train_idx = np.load(directory / fold["train_idx"])
+    val_idx = np.load(directory / fold["val_idx"])
+    preprocessor = joblib.load(directory / fold["preprocessor"])
+    
+    # The early stopping set goes through the fold's own preprocessor
+    fit_params = {}
+    if validation is not None:
+        fit_params = {"X_val": preprocessor.transform(validation[0]), "y_val": validation[1]}
+    
+    fold_model = clone(model).fit(load_matrix(directory, fold["X_train"]), y.iloc[train_idx], **fit_params)
+    score = get_scorer(scoring)(fold_model, load_matrix(directory, fold["X_val"]), y.iloc[val_idx])
+    
+    # Pair the model with its fold's preprocessor so it can score raw data
+    estimator = Pipeline(steps=[
+        ("preprocessor", preprocessor),
+        ("model", fold_model),
+    ])
+    return score, estimator
+
+
+def cross_validate_folds(
+    model: Any,
+    manifest: Dict[str, Any],
+    y: pd.Series,
+    scoring: str,
+    n_jobs: int = 1,
+    validation: Optional[Tuple[pd.DataFrame, pd.Series]] = None,
+) -> Dict[str, Any]:
+    """
+    Cross-validate a model on precomputed folds.
+    
+    Like cross_validate with return_estimator=True.
+    
+    Args:
+        model: Unfitted estimator (without preprocessing)
+        manifest: Manifest from build_fold_cache
+        y: Training target
+        scoring: scikit-learn scoring name
+        n_jobs: Number of folds to fit concurrently
+        validation: Raw features and target of a held-out split, passed to
+            the model's fit as X_val/y_val after the fold's preprocessing
+            (for early stopping)
+    
+    Returns:
+        Dictionary with the "test_score" array and the fitted "estimator"
+        pipelines of the folds
+    """
+    directory = Path(manifest["directory"])
+    results = joblib.Parallel(n_jobs=n_jobs)(
+        joblib.delayed(_fit_fold)(model, directory, fold, y, scoring, validation) for fold in manifest["folds"]
+    )
+    return {
+        "test_score": np.array([score for score, _ in results]),
+        "estimator": [estimator for _, estimator in results],
+    }
+
+
+class FoldEnsemble:
+    """
+    Deployable model made of the estimators fitted on the CV folds.
+    
+    Classifiers average the members' class probabilities (soft voting) and
+    regressors average their predictions, so no final refit on the full
+    training set is needed.
+    """
+    
+    def __init__(self, estimators: List[Any]):
+        if not estimators:
+            raise ValueError("FoldEnsemble needs at least one estimator")
+        self.estimators = list(estimators)
+        
+        classes = [getattr(estimator, "classes_", None) for estimator in self.estimators]
+        if classes[0] is not None and any(not np.array_equal(c, classes[0]) for c in classes):
+            raise ValueError("Fold estimators were fitted on different classes")
+        self.classes_ = classes[0]
+        self.feature_names_in_ = getattr(self.estimators[0], "feature_names_in_", None)
+    
+    def predict_proba(self, X: Any) -> np.ndarray:
+        """
+        Average the class probabilities of the members.
+        
+        Args:
+            X: Features
+        
+        Returns:
+            Array of class probabilities
+        """
+        return np.mean([estimator.predict_proba(X) for estimator in self.estimators], axis=0)
+    
+    def predict(self, X: Any) -> np.ndarray:
+        """
+        Predict with the averaged members.
+        
+        Args:
+            X: Features
+        
+        Returns:
+            Array of predictions
+        """
+        if self.classes_ is not None:
+            return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+        return np.mean([estimator.predict(X) for estimator in self.estimators], axis=0)
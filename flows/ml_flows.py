@@ -2,6 +2,10 @@
 Machine learning flows for the Streamlit portfolio.
 """
 
+import logging
+import os
+import time
+from functools import partial
 import pandas as pd
 import numpy as np
 from pathlib import Path
@@ -9,8 +13,8 @@ from typing import Dict, List, Any, Optional, Union, Tuple
 import json
 import matplotlib.pyplot as plt
 import seaborn as sns
-from sklearn.model_selection import cross_val_score, GridSearchCV
-from sklearn.preprocessing import StandardScaler, OneHotEncoder
+from sklearn.model_selection import cross_validate
+from sklearn.preprocessing import StandardScaler, OneHotEncoder, OrdinalEncoder
 from sklearn.compose import ColumnTransformer
 from sklearn.pipeline import Pipeline
 from sklearn.impute import SimpleImputer
@@ -22,20 +26,44 @@ from sklearn.metrics import (
 
 # ML models
 from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier, RandomForestRegressor, GradientBoostingRegressor
+from sklearn.ensemble import HistGradientBoostingClassifier, HistGradientBoostingRegressor
 from sklearn.linear_model import LogisticRegression, LinearRegression
 from sklearn.svm import SVC
 from sklearn.neighbors import KNeighborsClassifier
 
+from joblib import parallel_config
+from joblib.externals.loky import get_reusable_executor
+from threadpoolctl import threadpool_limits
+
 from prefect import flow, task, get_run_logger
 from prefect.artifacts import create_markdown_artifact
+from prefect.task_runners import ProcessPoolTaskRunner
 from prefect.tasks import task_input_hash
 from datetime import timedelta
 import io
 import base64
 
-from .config import ML_TRAINING_FLOW, ML_EVALUATION_FLOW, DATASETS, MODELS
+from .config import (
+    ML_TRAINING_FLOW,
+    ML_TUNING_FLOW,
+    ML_BENCHMARK_FLOW,
+    ML_EVALUATION_FLOW,
+    BATCH_PREDICTION_FLOW,
+    DATASETS,
+    MODELS,
+    TRAINING_SETTINGS,
+    BATCH_PREDICTION_SETTINGS,
+)
+from .data_flows import compute_chunk_statistics, prepare_chunk, read_watermark
+from .folds import FoldEnsemble, build_fold_cache, cross_validate_folds, load_full_fit
+from .partitioned import iter_partitioned_chunks
+from .scoring import score_chunks, write_predictions
+from .tuning import run_search
 from .utils import (
+    download_dataset,
     load_dataset,
+    read_processed_dataset,
+    iter_dataset_chunks,
     save_model,
     load_model,
     log_flow_run_info,
@@ -80,6 +108,7 @@ def prepare_features_and_target(
 def create_preprocessing_pipeline(
     X: pd.DataFrame,
     dataset_name: str,
+    native_categoricals: bool = False,
 ) -> ColumnTransformer:
     """
     Create a preprocessing pipeline for the features.
@@ -87,6 +116,8 @@ def create_preprocessing_pipeline(
     Args:
         X: Features DataFrame
         dataset_name: Name of the dataset
+        native_categoricals: Whether the model handles categorical features
+            itself (see NATIVE_CATEGORICAL_MODELS)
         
     Returns:
         Preprocessing pipeline
@@ -102,15 +133,27 @@ def create_preprocessing_pipeline(
     logger.info(f"Categorical columns: {len(categorical_cols)}")
     
     # Create preprocessing pipelines
-    numeric_transformer = Pipeline(steps=[
-        ("imputer", SimpleImputer(strategy="median")),
-        ("scaler", StandardScaler())
-    ])
+    if native_categoricals:
+        # Histogram-based models bin raw values, handle missing values and
+        # split on category codes, so categories are only ordinal-encoded
+        # (missing and unseen ones as NaN) instead of one-hot expanded
+        numeric_transformer = "passthrough"
+        categorical_transformer = OrdinalEncoder(
+            handle_unknown="use_encoded_value",
+            unknown_value=np.nan,
+            encoded_missing_value=np.nan,
+            max_categories=255,
+        )
+    else:
+        numeric_transformer = Pipeline(steps=[
+            ("imputer", SimpleImputer(strategy="median")),
+            ("scaler", StandardScaler())
+        ])
     
-    categorical_transformer = Pipeline(steps=[
-        ("imputer", SimpleImputer(strategy="most_frequent")),
-        ("encoder", OneHotEncoder(handle_unknown="ignore", sparse_output=False))
-    ])
+        categorical_transformer = Pipeline(steps=[
+            ("imputer", SimpleImputer(strategy="most_frequent")),
+            ("encoder", OneHotEncoder(handle_unknown="ignore", sparse_output=False))
+        ])
     
     # Combine preprocessing steps
     preprocessor = ColumnTransformer(
@@ -123,69 +166,213 @@ def create_preprocessing_pipeline(
     return preprocessor
 
 
+def categorical_feature_indices(preprocessor: ColumnTransformer) -> List[int]:
+    """
+    Get the positions of the categorical columns in a native-categorical
+    preprocessor's output.
+    
+    Args:
+        preprocessor: Pipeline from create_preprocessing_pipeline with
+            native_categoricals=True
+    
+    Returns:
+        Column indices of the ordinal-encoded categories
+    """
+    start = 0
+    for name, _, columns in preprocessor.transformers:
+        if name == "cat":
+            return list(range(start, start + len(columns)))
+        start += len(columns)
+    return []
+
+
+def _problem_type(y: pd.Series) -> str:
+    """Infer whether a target calls for classification or regression."""
+    return "classification" if y.dtype == "object" or y.nunique() <= 5 else "regression"
+
+
 @task
-def train_model_task(
+def prepare_cv_folds(
     X_train: pd.DataFrame,
     y_train: pd.Series,
     preprocessor: ColumnTransformer,
-    algorithm: str,
     dataset_name: str,
-    hyperparams: Dict = None,
-) -> Tuple[Any, Dict]:
+) -> Dict:
     """
-    Train a machine learning model.
+    Preprocess the CV folds once for all algorithms.
     
     Args:
         X_train: Training features
         y_train: Training target
         preprocessor: Preprocessing pipeline
-        algorithm: Algorithm to use
         dataset_name: Name of the dataset
-        hyperparams: Hyperparameters for the model
-        
+    
     Returns:
-        Tuple of trained model and training metadata
+        Fold cache manifest for train_model_task
     """
     logger = get_run_logger()
-    logger.info(f"Training {algorithm} model for {dataset_name}")
     
-    # Default hyperparameters
-    default_hyperparams = {
-        "random_forest": {
-            "n_estimators": 100,
-            "max_depth": None,
-            "min_samples_split": 2,
-            "random_state": 42
-        },
-        "gradient_boosting": {
-            "n_estimators": 100,
-            "learning_rate": 0.1,
-            "max_depth": 3,
-            "random_state": 42
-        },
-        "logistic_regression": {
-            "C": 1.0,
-            "max_iter": 1000,
-            "random_state": 42
-        },
-        "linear_regression": {},
-        "svm": {
-            "C": 1.0,
-            "kernel": "rbf",
-            "random_state": 42
-        },
-        "knn": {
-            "n_neighbors": 5,
-            "weights": "uniform"
-        }
+    cv_folds = MODELS[dataset_name].get("cv_folds", 5)
+    folds = build_fold_cache(
+        X_train, y_train, preprocessor, cv_folds, _problem_type(y_train) == "classification"
+    )
+    
+    if folds["cached"]:
+        logger.info(f"Reusing preprocessed folds from {folds['directory']}")
+    else:
+        logger.info(f"Fitted the preprocessor {folds['preprocessor_fits']} times for {cv_folds} folds")
+    
+    return folds
+
+
+def core_budget() -> int:
+    """
+    Get the number of CPU cores model training may use.
+    
+    Returns:
+        Configured core budget, or the number of available cores
+    """
+    return TRAINING_SETTINGS["max_cores"] or os.cpu_count() or 1
+
+
+FINAL_MODELS = ["refit", "ensemble"]
+
+
+def allocate_cores(n_models: int, budget: Optional[int] = None) -> Tuple[int, int]:
+    """
+    Split the core budget between models trained in parallel.
+    
+    Args:
+        n_models: Number of models to train
+        budget: Total number of cores (core_budget() if None)
+    
+    Returns:
+        Tuple of the number of models to train at once and cores per model
+    """
+    budget = budget or core_budget()
+    parallel = max(1, min(n_models, TRAINING_SETTINGS["max_parallel_models"], budget))
+    return parallel, max(1, budget // parallel)
+
+
+# Model implementations per algorithm, selected with MODELS[...]["engines"]
+ENGINES = {
+    "gradient_boosting": {
+        "classic": "gradient_boosting",
+        "hist": "hist_gradient_boosting",
+    },
+}
+
+# Models that take ordinal-encoded categories instead of one-hot columns
+NATIVE_CATEGORICAL_MODELS = {"hist_gradient_boosting"}
+
+# Models that can stop early on the processed validation split (passed to
+# fit as X_val/y_val) instead of holding out part of the training data
+EARLY_STOPPING_MODELS = {"hist_gradient_boosting"}
+
+# Hyperparameters that a model names differently from the classic engine of
+# its algorithm, so hyperparameters given for an algorithm work on any engine
+PARAM_ALIASES = {
+    "hist_gradient_boosting": {"n_estimators": "max_iter"},
+}
+
+
+def resolve_engine(algorithm: str, dataset_name: str, engine: Optional[str] = None) -> str:
+    """
+    Get the model implementation of an algorithm for a dataset.
+    
+    Args:
+        algorithm: Algorithm to use
+        dataset_name: Name of the dataset
+        engine: Engine to use (if None, uses the dataset's MODELS entry)
+    
+    Returns:
+        Name of the model implementation (the algorithm if it has no engines)
+    """
+    engine = engine or MODELS[dataset_name].get("engines", {}).get(algorithm)
+    if engine is None:
+        return algorithm
+    if engine not in ENGINES.get(algorithm, {}):
+        raise ValueError(f"Unsupported engine for {algorithm}: {engine}")
+    return ENGINES[algorithm][engine]
+
+
+# Default hyperparameters per algorithm
+DEFAULT_HYPERPARAMS = {
+    "random_forest": {
+        "n_estimators": 100,
+        "max_depth": None,
+        "min_samples_split": 2,
+        "random_state": 42
+    },
+    "gradient_boosting": {
+        "n_estimators": 100,
+        "learning_rate": 0.1,
+        "max_depth": 3,
+        "random_state": 42
+    },
+    "hist_gradient_boosting": {
+        "max_iter": 200,
+        "learning_rate": 0.1,
+        "max_leaf_nodes": 31,
+        # Stop adding trees once the validation split stops improving; the
+        # validation_fraction holdout is only used without a processed val split
+        "early_stopping": True,
+        "validation_fraction": 0.1,
+        "n_iter_no_change": 10,
+        "random_state": 42
+    },
+    "logistic_regression": {
+        "C": 1.0,
+        "max_iter": 1000,
+        "random_state": 42
+    },
+    "linear_regression": {},
+    "svm": {
+        "C": 1.0,
+        "kernel": "rbf",
+        "random_state": 42
+    },
+    "knn": {
+        "n_neighbors": 5,
+        "weights": "uniform"
     }
+}
+
+
+def create_model(algorithm: str, problem_type: str, params: Dict, logger: Any = None) -> Any:
+    """
+    Create an unfitted model.
     
-    # Use provided hyperparameters or defaults
-    params = hyperparams or default_hyperparams.get(algorithm, {})
+    Parameters named as for the classic engine of an algorithm are renamed
+    for the model (see PARAM_ALIASES).
     
-    # Create model based on algorithm
-    problem_type = "classification" if y_train.dtype == "object" or y_train.nunique() <= 5 else "regression"
+    Args:
+        algorithm: Algorithm to use
+        problem_type: "classification" or "regression"
+        params: Hyperparameters for the model
+        logger: Logger for warnings about substituted algorithms
+    
+    Returns:
+        Unfitted scikit-learn estimator
+    
+    Raises:
+        ValueError: If the algorithm is unsupported or does not accept a
+            hyperparameter
+    """
+    logger = logger or logging.getLogger(__name__)
+    
+    aliases = PARAM_ALIASES.get(algorithm, {})
+    params = {aliases.get(name, name): value for name, value in params.items()}
     
+    try:
+        return _create_estimator(algorithm, problem_type, params, logger)
+    except TypeError as e:
+        # Estimators reject unknown keyword arguments with a TypeError
+        raise ValueError(f"Invalid hyperparameters for {algorithm}: {e}") from e
+
+
+def _create_estimator(algorithm: str, problem_type: str, params: Dict, logger: Any) -> Any:
+    """Construct the estimator of an algorithm (see create_model)."""
     if algorithm == "random_forest":
         if problem_type == "classification":
             model = RandomForestClassifier(**params)
@@ -198,6 +385,12 @@ def train_model_task(
         else:
             model = GradientBoostingRegressor(**params)
     
+    elif algorithm == "hist_gradient_boosting":
+        if problem_type == "classification":
+            model = HistGradientBoostingClassifier(**params)
+        else:
+            model = HistGradientBoostingRegressor(**params)
+    
     elif algorithm == "logistic_regression":
         if problem_type != "classification":
             logger.warning("Logistic regression is for classification. Using linear regression instead.")
@@ -221,36 +414,166 @@ def train_model_task(
     else:
         raise ValueError(f"Unsupported algorithm: {algorithm}")
     
-    # Create pipeline with preprocessing
-    pipeline = Pipeline(steps=[
-        ("preprocessor", preprocessor),
-        ("model", model)
-    ])
+    return model
+
+
+@task
+def train_model_task(
+    X_train: pd.DataFrame,
+    y_train: pd.Series,
+    preprocessor: ColumnTransformer,
+    algorithm: str,
+    dataset_name: str,
+    hyperparams: Dict = None,
+    n_jobs: int = 1,
+    folds: Optional[Dict] = None,
+    final_model: Optional[str] = None,
+    engine: Optional[str] = None,
+    validation: Optional[Tuple[pd.DataFrame, pd.Series]] = None,
+) -> Tuple[Any, Dict]:
+    """
+    Train a machine learning model.
+    
+    CV folds run in parallel and the model itself (where it supports
+    n_jobs) and native thread pools are limited so the task never uses
+    more than n_jobs cores. With precomputed folds the model is fitted on
+    the cached preprocessed matrices and the preprocessor is not refitted.
+    
+    The fold models are kept, so with final_model="ensemble" they are
+    returned as a FoldEnsemble and the model is only trained once per fold;
+    "refit" additionally fits it on the full training set.
+    
+    Models in EARLY_STOPPING_MODELS with early stopping enabled stop on the
+    given validation split, preprocessed like the data of each fit; this
+    needs precomputed folds.
+    
+    Args:
+        X_train: Training features
+        y_train: Training target
+        preprocessor: Preprocessing pipeline
+        algorithm: Algorithm to use
+        dataset_name: Name of the dataset
+        hyperparams: Hyperparameters for the model
+        n_jobs: Number of CPU cores the task may use
+        folds: Fold cache manifest from prepare_cv_folds
+        final_model: "refit" or "ensemble" (if None, uses TRAINING_SETTINGS)
+        engine: Model implementation (if None, uses the dataset's MODELS
+            entry); models in NATIVE_CATEGORICAL_MODELS need a preprocessor
+            created with native_categoricals=True
+        validation: Validation features and target for early stopping
+        
+    Returns:
+        Tuple of trained model and training metadata
+    """
+    logger = get_run_logger()
+    logger.info(f"Training {algorithm} model for {dataset_name}")
+    start_time = time.perf_counter()
+    
+    final_model = final_model or TRAINING_SETTINGS["final_model"]
+    if final_model not in FINAL_MODELS:
+        raise ValueError(f"Unsupported final model: {final_model} (expected one of {FINAL_MODELS})")
+    
+    # Use provided hyperparameters or defaults
+    model_name = resolve_engine(algorithm, dataset_name, engine)
+    params = hyperparams or DEFAULT_HYPERPARAMS.get(model_name, {})
+    
+    # Create model based on algorithm
+    problem_type = _problem_type(y_train)
+    model = create_model(model_name, problem_type, params, logger)
+    if model_name in NATIVE_CATEGORICAL_MODELS:
+        model.set_params(categorical_features=categorical_feature_indices(preprocessor) or None)
     
-    # Train the model
-    logger.info(f"Fitting {algorithm} model")
-    pipeline.fit(X_train, y_train)
+    parallel_model = "n_jobs" in model.get_params()
     
-    # Cross-validation
+    early_stopping = (
+        validation is not None
+        and model_name in EARLY_STOPPING_MODELS
+        and model.get_params().get("early_stopping") is True
+    )
+    if early_stopping and folds is None:
+        logger.warning("Early stopping on the validation split needs precomputed folds; using a holdout instead")
+        early_stopping = False
+    
+    # Cross-validation, keeping the fold models, with the cores split
+    # between concurrent folds
     cv_folds = MODELS[dataset_name].get("cv_folds", 5)
+    cv_jobs = min(cv_folds, n_jobs)
+    fold_cores = max(1, n_jobs // cv_jobs)
+    scoring = "accuracy" if problem_type == "classification" else "neg_mean_squared_error"
     
-    if problem_type == "classification":
-        cv_scores = cross_val_score(pipeline, X_train, y_train, cv=cv_folds, scoring="accuracy")
+    logger.info(f"Cross-validating {algorithm} model on {n_jobs} core(s)")
+    if parallel_model:
+        model.set_params(n_jobs=fold_cores)
+    with parallel_config(backend="loky", inner_max_num_threads=fold_cores), threadpool_limits(limits=fold_cores):
+        if folds is not None:
+            cv_results = cross_validate_folds(
+                model, folds, y_train, scoring, n_jobs=cv_jobs, validation=validation if early_stopping else None
+            )
+        else:
+            cv_results = cross_validate(
+                Pipeline(steps=[("preprocessor", preprocessor), ("model", model)]),
+                X_train,
+                y_train,
+                cv=cv_folds,
+                scoring=scoring,
+                n_jobs=cv_jobs,
+                return_estimator=True,
+            )
+    if cv_jobs > 1:
+        # Stop the fold workers now; idle ones would keep the task runner's
+        # worker process from exiting until they time out
+        get_reusable_executor().shutdown(wait=True)
+    cv_scores = cv_results["test_score"]
+    
+    if final_model == "ensemble":
+        # The fold models already cover the training set; no extra fit
+        estimators = cv_results["estimator"]
+        pipeline = FoldEnsemble(estimators)
     else:
-        cv_scores = cross_val_score(pipeline, X_train, y_train, cv=cv_folds, scoring="neg_mean_squared_error")
+        # Refit on the full training set on all of the task's cores
+        logger.info(f"Refitting {algorithm} model on the full training set")
+        if parallel_model:
+            model.set_params(n_jobs=n_jobs)
+        with threadpool_limits(limits=n_jobs):
+            if folds is not None:
+                # Reuse the preprocessor fitted on the full training set
+                preprocessor, X_preprocessed = load_full_fit(folds)
+                fit_params = {}
+                if early_stopping:
+                    fit_params = {"X_val": preprocessor.transform(validation[0]), "y_val": validation[1]}
+                model.fit(X_preprocessed, y_train, **fit_params)
+            
+            # Create pipeline with preprocessing
+            pipeline = Pipeline(steps=[
+                ("preprocessor", preprocessor),
+                ("model", model)
+            ])
+            
+            if folds is None:
+                pipeline.fit(X_train, y_train)
+        estimators = [pipeline]
+    
+    # Saved models predict on the caller's cores, not the training budget
+    if parallel_model:
+        for estimator in estimators:
+            estimator.set_params(model__n_jobs=None)
     
     # Training metadata
     metadata = {
         "algorithm": algorithm,
+        "engine": model_name,
         "dataset": dataset_name,
         "problem_type": problem_type,
         "hyperparameters": params,
+        "final_model": final_model,
+        "early_stopping_samples": len(validation[1]) if early_stopping else None,
         "cv_folds": cv_folds,
         "cv_scores": cv_scores.tolist(),
         "cv_score_mean": cv_scores.mean(),
         "cv_score_std": cv_scores.std(),
         "feature_count": X_train.shape[1],
         "training_samples": X_train.shape[0],
+        "training_seconds": time.perf_counter() - start_time,
     }
     
     logger.info(f"Model training complete. CV score: {metadata['cv_score_mean']:.4f} ± {metadata['cv_score_std']:.4f}")
@@ -263,6 +586,7 @@ def train_model_task(
                 f"- **Features**: {X_train.shape[1]}\n"
                 f"- **Training Samples**: {X_train.shape[0]}\n"
                 f"- **CV Score**: {metadata['cv_score_mean']:.4f} ± {metadata['cv_score_std']:.4f}\n"
+                f"- **Final Model**: {final_model}\n"
                 f"- **Hyperparameters**: {params}",
         key=f"model-training-{dataset_name}-{algorithm}",
     )
@@ -270,6 +594,85 @@ def train_model_task(
     return pipeline, metadata
 
 
+@task
+def search_hyperparameters_task(
+    y_train: pd.Series,
+    preprocessor: ColumnTransformer,
+    algorithm: str,
+    dataset_name: str,
+    folds: Dict,
+    method: Optional[str] = None,
+    n_trials: Optional[int] = None,
+    n_jobs: int = 1,
+) -> Dict:
+    """
+    Search the hyperparameters of an algorithm on the precomputed folds.
+    
+    Trials run n_jobs at a time, each on one core, starting from the
+    algorithm's default hyperparameters.
+    
+    Args:
+        y_train: Training target
+        preprocessor: Preprocessing pipeline the folds were built with
+        algorithm: Algorithm to tune
+        dataset_name: Name of the dataset
+        folds: Fold cache manifest from prepare_cv_folds
+        method: Search method (if None, uses TUNING_SETTINGS)
+        n_trials: Number of candidates (if None, uses TUNING_SETTINGS)
+        n_jobs: Number of CPU cores the task may use
+    
+    Returns:
+        Search results with the best hyperparameters
+    """
+    logger = get_run_logger()
+    
+    problem_type = _problem_type(y_train)
+    model_name = resolve_engine(algorithm, dataset_name)
+    params = DEFAULT_HYPERPARAMS.get(model_name, {})
+    model = create_model(model_name, problem_type, params, logger)
+    if "n_jobs" in model.get_params():
+        model.set_params(n_jobs=1)
+    if model_name in NATIVE_CATEGORICAL_MODELS:
+        model.set_params(categorical_features=categorical_feature_indices(preprocessor) or None)
+    
+    # Engines may declare their own space; substituted models (e.g. linear
+    # for logistic regression) may not accept every declared parameter
+    spaces = MODELS[dataset_name].get("search_spaces", {})
+    space = spaces.get(model_name, spaces.get(algorithm, {}))
+    space = {name: spec for name, spec in space.items() if name in model.get_params()}
+    if not space:
+        logger.warning(f"No search space for {algorithm} on {dataset_name}; using default hyperparameters")
+        return {"method": None, "best_params": {}, "best_score": None, "n_trials": 0}
+    
+    scoring = "accuracy" if problem_type == "classification" else "neg_mean_squared_error"
+    logger.info(f"Searching {list(space)} for {algorithm} on {n_jobs} core(s)")
+    with parallel_config(backend="loky", inner_max_num_threads=1), threadpool_limits(limits=1):
+        search = run_search(
+            model, space, folds, y_train, scoring,
+            method=method, n_trials=n_trials, n_jobs=n_jobs, log=logger.info,
+        )
+    if n_jobs > 1:
+        get_reusable_executor().shutdown(wait=True)
+    
+    logger.info(
+        f"Best {algorithm} score: {search['best_score']:.4f} with {search['best_params']} "
+        f"({search['n_trials']} trials, {search['cached_trials']} cached, {search['pruned_trials']} stopped early)"
+    )
+    
+    create_markdown_artifact(
+        markdown=f"## Hyperparameter Search: {algorithm} for {dataset_name}\n\n"
+                f"- **Method**: {search['method']}\n"
+                f"- **Trials**: {search['n_trials']} ({search['cached_trials']} cached, "
+                f"{search['pruned_trials']} stopped early, {search['failed_trials']} failed)\n"
+                f"- **Best Score**: {search['best_score']:.4f}\n"
+                f"- **Best Hyperparameters**: {search['best_params']}",
+        key=f"hyperparameter-search-{dataset_name}-{algorithm}",
+    )
+    
+    # Trial details stay in the trial cache
+    return {key: value for key, value in search.items() if key != "trials"}
+
+
 @task
 def evaluate_model_task(
     model: Any,
@@ -389,21 +792,30 @@ def evaluate_model_task(
     retries=ML_TRAINING_FLOW.retries,
     retry_delay_seconds=ML_TRAINING_FLOW.retry_delay_seconds,
     log_prints=ML_TRAINING_FLOW.log_prints,
+    # CPU-bound fits run in separate processes
+    task_runner=ProcessPoolTaskRunner(max_workers=TRAINING_SETTINGS["max_parallel_models"]),
 )
 def train_model(
     dataset_name: str,
     algorithm: str = None,
     train_path: Path = None,
     hyperparams: Dict = None,
+    final_model: Optional[str] = None,
 ) -> Tuple[Path, Dict]:
     """
     Train a machine learning model on a processed dataset.
     
+    Algorithms are trained concurrently in worker processes; the core
+    budget (TRAINING_SETTINGS) is split between them, so training several
+    algorithms takes about as long as the slowest one.
+    
     Args:
         dataset_name: Name of the dataset
         algorithm: Algorithm to use (if None, uses all configured algorithms)
         train_path: Path to the training dataset (if None, uses default path)
         hyperparams: Hyperparameters for the model
+        final_model: "refit" or "ensemble" of the CV fold models (if None,
+            uses TRAINING_SETTINGS)
         
     Returns:
         Tuple of path to the saved model and training metadata
@@ -415,32 +827,318 @@ def train_model(
     algorithms = [algorithm] if algorithm else MODELS[dataset_name]["algorithms"]
     
     # Load training data
-    if train_path is None:
-        train_path = Path(f"data/processed/{dataset_name}_train.csv")
-    
-    train_df = pd.read_csv(train_path)
+    train_df = read_processed_dataset(dataset_name, "train", dataset_path=train_path)
     
     # Prepare features and target
     X_train, y_train = prepare_features_and_target(train_df, dataset_name)
     
-    # Create preprocessing pipeline
-    preprocessor = create_preprocessing_pipeline(X_train, dataset_name)
+    # Create the preprocessing pipelines and fit them once per CV fold,
+    # shared by all algorithms
+    inputs = _prepare_inputs(X_train, y_train, dataset_name, algorithms)
     
-    # Train models
-    results = []
+    results = _train_algorithms(
+        X_train,
+        y_train,
+        dataset_name,
+        {alg: hyperparams for alg in algorithms},
+        inputs,
+        final_model,
+        validation=_load_validation_split(dataset_name, algorithms),
+    )
+    
+    # Return the best model based on CV score
+    best_model_idx = np.argmax([metadata["cv_score_mean"] for _, metadata in results])
+    return results[best_model_idx]
+
+
+def _load_validation_split(
+    dataset_name: str,
+    algorithms: List[str],
+    engine: Optional[str] = None,
+) -> Optional[Tuple[pd.DataFrame, pd.Series]]:
+    """
+    Load the processed validation split if any algorithm stops early on it.
+    
+    Args:
+        dataset_name: Name of the dataset
+        algorithms: Algorithms to train
+        engine: Engine override passed to resolve_engine
+    
+    Returns:
+        Validation features and target, or None if no algorithm uses them or
+        the split does not exist
+    """
+    if not any(resolve_engine(alg, dataset_name, engine) in EARLY_STOPPING_MODELS for alg in algorithms):
+        return None
+    try:
+        val_df = read_processed_dataset(dataset_name, "val")
+    except FileNotFoundError:
+        return None
+    return prepare_features_and_target(val_df, dataset_name)
+
+
+def _prepare_inputs(
+    X_train: pd.DataFrame,
+    y_train: pd.Series,
+    dataset_name: str,
+    algorithms: List[str],
+    engine: Optional[str] = None,
+) -> Dict[str, Tuple[ColumnTransformer, Dict]]:
+    """
+    Create the preprocessing pipeline and CV folds of each algorithm.
+    
+    Algorithms that need the same preprocessing share one pipeline and fold
+    cache; models with native categorical support get their own.
+    
+    Args:
+        X_train: Training features
+        y_train: Training target
+        dataset_name: Name of the dataset
+        algorithms: Algorithms to prepare
+        engine: Engine override passed to resolve_engine
+    
+    Returns:
+        Preprocessor and fold cache manifest per algorithm
+    """
+    variants = {}
+    inputs = {}
     for alg in algorithms:
-        model, metadata = train_model_task(X_train, y_train, preprocessor, alg, dataset_name, hyperparams)
+        native = resolve_engine(alg, dataset_name, engine) in NATIVE_CATEGORICAL_MODELS
+        if native not in variants:
+            preprocessor = create_preprocessing_pipeline(X_train, dataset_name, native_categoricals=native)
+            variants[native] = (preprocessor, prepare_cv_folds(X_train, y_train, preprocessor, dataset_name))
+        inputs[alg] = variants[native]
+    return inputs
+
+
+def _train_algorithms(
+    X_train: pd.DataFrame,
+    y_train: pd.Series,
+    dataset_name: str,
+    hyperparams: Dict[str, Optional[Dict]],
+    inputs: Dict[str, Tuple[ColumnTransformer, Dict]],
+    final_model: Optional[str] = None,
+    searches: Optional[Dict[str, Dict]] = None,
+    validation: Optional[Tuple[pd.DataFrame, pd.Series]] = None,
+) -> List[Tuple[Path, Dict]]:
+    """
+    Train and save several algorithms concurrently.
+    
+    Args:
+        X_train: Training features
+        y_train: Training target
+        dataset_name: Name of the dataset
+        hyperparams: Hyperparameters per algorithm (None for the defaults)
+        inputs: Preprocessor and fold cache manifest per algorithm from
+            _prepare_inputs
+        final_model: "refit" or "ensemble" (if None, uses TRAINING_SETTINGS)
+        searches: Hyperparameter search results to record per algorithm
+        validation: Validation features and target for early stopping
+    
+    Returns:
+        List of model paths and training metadata, one per algorithm
+    """
+    algorithms = list(hyperparams)
+    
+    # Train models concurrently, each on its share of the core budget; with
+    # fewer cores than algorithms they are trained in waves
+    parallel, cores_per_model = allocate_cores(len(algorithms))
+    results = []
+    for start in range(0, len(algorithms), parallel):
+        wave = algorithms[start:start + parallel]
+        futures = [
+            train_model_task.submit(
+                X_train,
+                y_train,
+                inputs[alg][0],
+                alg,
+                dataset_name,
+                hyperparams[alg],
+                n_jobs=cores_per_model,
+                folds=inputs[alg][1],
+                final_model=final_model,
+                validation=validation,
+            )
+            for alg in wave
+        ]
         
-        # Save model
-        model_path = save_model(model, alg, dataset_name, metadata)
+        for alg, future in zip(wave, futures):
+            model, metadata = future.result()
+            if searches:
+                metadata["search"] = searches[alg]
         
-        results.append((model_path, metadata))
+            # Save model
+            model_path = save_model(model, alg, dataset_name, metadata)
+            
+            results.append((model_path, metadata))
+    
+    return results
+
+
+@flow(
+    name=ML_TUNING_FLOW.name,
+    description=ML_TUNING_FLOW.description,
+    retries=ML_TUNING_FLOW.retries,
+    retry_delay_seconds=ML_TUNING_FLOW.retry_delay_seconds,
+    log_prints=ML_TUNING_FLOW.log_prints,
+    task_runner=ProcessPoolTaskRunner(max_workers=TRAINING_SETTINGS["max_parallel_models"]),
+)
+def tune_model(
+    dataset_name: str,
+    algorithm: str = None,
+    method: Optional[str] = None,
+    n_trials: Optional[int] = None,
+    train_path: Path = None,
+    final_model: Optional[str] = None,
+) -> Tuple[Path, Dict]:
+    """
+    Search hyperparameters and train the best model per algorithm.
+    
+    Each algorithm's search uses the whole core budget and runs against the
+    trial cache, so rerunning an interrupted or repeated search only runs
+    the trials that are not cached yet.
+    
+    Args:
+        dataset_name: Name of the dataset
+        algorithm: Algorithm to tune (if None, uses all configured algorithms)
+        method: "grid", "random", "halving" or "hyperband" (if None, uses
+            TUNING_SETTINGS)
+        n_trials: Number of candidates (if None, uses TUNING_SETTINGS)
+        train_path: Path to the training dataset (if None, uses default path)
+        final_model: "refit" or "ensemble" (if None, uses TRAINING_SETTINGS)
+    
+    Returns:
+        Tuple of path to the saved best model and its training metadata
+    """
+    # Log flow run info
+    log_flow_run_info()
+    
+    # Determine algorithms to use
+    algorithms = [algorithm] if algorithm else MODELS[dataset_name]["algorithms"]
+    
+    # Load training data and preprocess the CV folds once
+    train_df = read_processed_dataset(dataset_name, "train", dataset_path=train_path)
+    X_train, y_train = prepare_features_and_target(train_df, dataset_name)
+    inputs = _prepare_inputs(X_train, y_train, dataset_name, algorithms)
+    
+    # Search one algorithm at a time, each with all the cores
+    hyperparams = {}
+    searches = {}
+    for alg in algorithms:
+        preprocessor, folds = inputs[alg]
+        searches[alg] = search_hyperparameters_task.submit(
+            y_train, preprocessor, alg, dataset_name, folds,
+            method=method, n_trials=n_trials, n_jobs=core_budget(),
+        ).result()
+        defaults = DEFAULT_HYPERPARAMS.get(resolve_engine(alg, dataset_name), {})
+        hyperparams[alg] = {**defaults, **searches[alg]["best_params"]}
+    
+    results = _train_algorithms(
+        X_train, y_train, dataset_name, hyperparams, inputs, final_model, searches,
+        validation=_load_validation_split(dataset_name, algorithms),
+    )
     
     # Return the best model based on CV score
     best_model_idx = np.argmax([metadata["cv_score_mean"] for _, metadata in results])
     return results[best_model_idx]
 
 
+@flow(
+    name=ML_BENCHMARK_FLOW.name,
+    description=ML_BENCHMARK_FLOW.description,
+    retries=ML_BENCHMARK_FLOW.retries,
+    retry_delay_seconds=ML_BENCHMARK_FLOW.retry_delay_seconds,
+    log_prints=ML_BENCHMARK_FLOW.log_prints,
+)
+def benchmark_engines(
+    dataset_name: str,
+    algorithm: str = "gradient_boosting",
+    train_path: Path = None,
+) -> Dict[str, Dict]:
+    """
+    Compare the engines of an algorithm on the same training data.
+    
+    Engines are trained one after the other with the whole core budget, so
+    their training times (cross-validation and final fit, excluding the
+    cached fold preprocessing) are comparable.
+    
+    Args:
+        dataset_name: Name of the dataset
+        algorithm: Algorithm with several engines (see ENGINES)
+        train_path: Path to the training dataset (if None, uses default path)
+    
+    Returns:
+        Training time, speedup over the first engine and CV score per engine
+    """
+    # Log flow run info
+    log_flow_run_info()
+    
+    if algorithm not in ENGINES:
+        raise ValueError(f"No engines to compare for {algorithm} (available: {list(ENGINES)})")
+    
+    train_df = read_processed_dataset(dataset_name, "train", dataset_path=train_path)
+    X_train, y_train = prepare_features_and_target(train_df, dataset_name)
+    
+    results = {}
+    for engine in ENGINES[algorithm]:
+        preprocessor, folds = _prepare_inputs(X_train, y_train, dataset_name, [algorithm], engine=engine)[algorithm]
+        validation = _load_validation_split(dataset_name, [algorithm], engine=engine)
+        _, metadata = train_model_task(
+            X_train,
+            y_train,
+            preprocessor,
+            algorithm,
+            dataset_name,
+            n_jobs=core_budget(),
+            folds=folds,
+            engine=engine,
+            validation=validation,
+        )
+        results[engine] = {
+            "model": metadata["engine"],
+            "training_seconds": metadata["training_seconds"],
+            "cv_score_mean": metadata["cv_score_mean"],
+            "cv_score_std": metadata["cv_score_std"],
+        }
+    
+    baseline = next(iter(results.values()))["training_seconds"]
+    for result in results.values():
+        result["speedup"] = baseline / result["training_seconds"]
+    
+    rows = "\n".join(
+        f"| {engine} | {r['training_seconds']:.2f} | {r['speedup']:.1f}x | {r['cv_score_mean']:.4f} ± {r['cv_score_std']:.4f} |"
+        for engine, r in results.items()
+    )
+    create_markdown_artifact(
+        markdown=f"## Engine Benchmark: {algorithm} for {dataset_name}\n\n"
+                f"| Engine | Training (s) | Speedup | CV Score |\n"
+                f"|---|---|---|---|\n"
+                f"{rows}",
+        key=f"engine-benchmark-{dataset_name}-{algorithm}",
+    )
+    
+    return results
+
+
+def _latest_model_path(dataset_name: str) -> Path:
+    """
+    Find the most recently saved model of a dataset.
+    
+    Args:
+        dataset_name: Name of the dataset
+    
+    Returns:
+        Path to the model file
+    """
+    model_dir = Path("models")
+    model_files = list(model_dir.glob(f"{dataset_name}_*.joblib"))
+    if not model_files:
+        raise ValueError(f"No models found for dataset {dataset_name}")
+    
+    # Sort by modification time (newest first)
+    return sorted(model_files, key=lambda p: p.stat().st_mtime, reverse=True)[0]
+
+
 @flow(
     name=ML_EVALUATION_FLOW.name,
     description=ML_EVALUATION_FLOW.description,
@@ -469,13 +1167,7 @@ def evaluate_model(
     
     # Find the latest model if not specified
     if model_path is None:
-        model_dir = Path("models")
-        model_files = list(model_dir.glob(f"{dataset_name}_*.joblib"))
-        if not model_files:
-            raise ValueError(f"No models found for dataset {dataset_name}")
-        
-        # Sort by modification time (newest first)
-        model_path = sorted(model_files, key=lambda p: p.stat().st_mtime, reverse=True)[0]
+        model_path = _latest_model_path(dataset_name)
     
     # Load the model
     model = load_model(model_path)
@@ -484,10 +1176,7 @@ def evaluate_model(
     algorithm = model_path.stem.split("_")[1]
     
     # Load test data
-    if test_path is None:
-        test_path = Path(f"data/processed/{dataset_name}_test.csv")
-    
-    test_df = pd.read_csv(test_path)
+    test_df = read_processed_dataset(dataset_name, "test", dataset_path=test_path)
     
     # Prepare features and target
     X_test, y_test = prepare_features_and_target(test_df, dataset_name)
@@ -498,6 +1187,118 @@ def evaluate_model(
     return metrics
 
 
+@flow(
+    name=BATCH_PREDICTION_FLOW.name,
+    description=BATCH_PREDICTION_FLOW.description,
+    retries=BATCH_PREDICTION_FLOW.retries,
+    retry_delay_seconds=BATCH_PREDICTION_FLOW.retry_delay_seconds,
+    log_prints=BATCH_PREDICTION_FLOW.log_prints,
+)
+def batch_predict(
+    dataset_name: str,
+    input_path: Path,
+    model_path: Path = None,
+    output_path: Path = None,
+    id_columns: Optional[List[str]] = None,
+    chunksize: Optional[int] = None,
+    max_workers: Optional[int] = None,
+    preprocess: bool = True,
+) -> Dict:
+    """
+    Score a dataset with a trained model and write the predictions to Parquet.
+    
+    The input is read in chunks, so its size is not limited by memory. Raw
+    rows are cleaned and transformed like the training data, with the
+    statistics of the dataset's raw file (or of its incremental watermark),
+    before they are scored. Worker processes memory-map the saved model file
+    and score chunks in parallel while the predictions are written in input
+    order, one row group per chunk.
+    
+    Args:
+        dataset_name: Name of the dataset the model was trained on
+        input_path: CSV or Parquet file, or partitioned dataset directory
+        model_path: Path to the model (if None, uses the latest model)
+        output_path: Parquet file to write (if None, a file in
+            BATCH_PREDICTION_SETTINGS["output_dir"])
+        id_columns: Input columns copied to the output (if None, the
+            dataset's key column)
+        chunksize: Rows per chunk (if None, uses BATCH_PREDICTION_SETTINGS)
+        max_workers: Worker processes (if None, uses BATCH_PREDICTION_SETTINGS)
+        preprocess: Whether the input holds raw rows (False for rows that are
+            already processed, such as the split files)
+        
+    Returns:
+        Dictionary with the output path, row and chunk counts and throughput
+    """
+    # Log flow run info
+    log_flow_run_info()
+    logger = get_run_logger()
+    
+    chunksize = chunksize or BATCH_PREDICTION_SETTINGS["chunksize"]
+    max_workers = max_workers or BATCH_PREDICTION_SETTINGS["max_workers"] or core_budget()
+    
+    # Workers memory-map the model file, so only in-process scoring loads it here
+    model_path = Path(model_path) if model_path else _latest_model_path(dataset_name)
+    if not model_path.exists():
+        raise FileNotFoundError(f"Model file not found: {model_path}")
+    model = load_model(model_path) if max_workers <= 1 else None
+    
+    prepare = None
+    dtypes = None
+    if preprocess:
+        # Statistics of the data the model was trained on
+        dataset_path = download_dataset(dataset_name)
+        watermark = read_watermark(dataset_path, dataset_name)
+        if watermark:
+            statistics = watermark["statistics"]
+        else:
+            statistics = compute_chunk_statistics(dataset_path, dataset_name, chunksize)
+        prepare = partial(prepare_chunk, dataset_name=dataset_name, statistics=statistics)
+        dtypes = statistics["dtypes"]
+    
+    if id_columns is None:
+        key = DATASETS[dataset_name]["key"]
+        id_columns = [key] if key else []
+    
+    if output_path is None:
+        output_path = BATCH_PREDICTION_SETTINGS["output_dir"] / f"{model_path.stem}_predictions.parquet"
+    
+    input_path = Path(input_path)
+    if input_path.is_dir():
+        chunks = iter_partitioned_chunks(input_path, chunksize)
+    else:
+        chunks = iter_dataset_chunks(input_path, chunksize, dtype=dtypes)
+    
+    logger.info(f"Scoring {input_path} in chunks of {chunksize} rows with {max_workers} worker(s)")
+    start = time.perf_counter()
+    rows, n_chunks = write_predictions(
+        score_chunks(model, model_path, chunks, id_columns, max_workers, prepare), output_path
+    )
+    seconds = time.perf_counter() - start
+    
+    summary = {
+        "model_path": str(model_path),
+        "output_path": str(output_path),
+        "rows": rows,
+        "chunks": n_chunks,
+        "seconds": seconds,
+        "rows_per_second": rows / seconds if seconds else None,
+    }
+    logger.info(f"Scored {rows} rows in {seconds:.1f}s ({summary['rows_per_second']:.0f} rows/s) to {output_path}")
+    
+    create_markdown_artifact(
+        markdown=f"## Batch Prediction: {dataset_name}\n\n"
+                f"- **Model**: {model_path}\n"
+                f"- **Input**: {input_path}\n"
+                f"- **Output**: {output_path}\n"
+                f"- **Rows**: {rows} in {n_chunks} chunks\n"
+                f"- **Throughput**: {summary['rows_per_second']:.0f} rows/s with {max_workers} worker(s)",
+        key=f"batch-prediction-{dataset_name}",
+    )
+    
+    return summary
+
+
 if __name__ == "__main__":
     # Example usage
     model_path, metadata = train_model("customer_churn", algorithm="random_forest")
@@ -0,0 +1,345 @@
+"""
+Partitioned Parquet datasets for the ETL flows.
+
+A partitioned dataset is a directory of Parquet files laid out in Hive-style
+partitions ("contract_type=One year/part-....parquet"). Writes go to a
+staging directory and are moved into place when complete; appending only
+adds files to the partitions it touches, and "replace_partitions" replaces
+just the partitions present in the new data. The full schema and the
+partition columns are recorded in a "_common_metadata" file, so partition
+columns keep their types when read back.
+
+Reads use column projection and push filters down to the scanner: whole
+partitions are skipped from their directory names and row groups from their
+Parquet statistics.
+"""
+
+import json
+import os
+import shutil
+import uuid
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence, Union
+
+from .config import PARTITION_SETTINGS, STORAGE_SETTINGS
+
+PARTITION_MODES = ["fail", "replace", "append", "replace_partitions"]
+
+METADATA_FILE = "_common_metadata"
+
+
+def _read_metadata(path: Path) -> Optional[pa.Schema]:
+    """
+    Read the recorded schema of a dataset.
+    
+    Args:
+        path: Dataset directory
+    
+    Returns:
+        Arrow schema (with the partition columns in its metadata), or None
+    """
+    metadata_path = path / METADATA_FILE
+    if not metadata_path.exists():
+        return None
+    return pq.read_schema(metadata_path)
+
+
+def _partition_columns(schema: pa.Schema) -> List[str]:
+    """
+    Get the partition columns recorded in a dataset schema.
+    
+    Args:
+        schema: Schema from _read_metadata
+    
+    Returns:
+        List of partition column names
+    """
+    return json.loads((schema.metadata or {}).get(b"partition_cols", b"[]"))
+
+
+def _partitioning(schema: pa.Schema, partition_cols: Sequence[str]) -> ds.Partitioning:
+    """
+    Build the Hive partitioning for a schema.
+    
+    Args:
+        schema: Dataset schema
+        partition_cols: Partition columns
+    
+    Returns:
+        pyarrow Partitioning
+    """
+    return ds.partitioning(pa.schema([schema.field(col) for col in partition_cols]), flavor="hive")
+
+
+def _leaf_directories(root: Path, depth: int) -> List[Path]:
+    """
+    List the partition directories at a given depth below a directory.
+    
+    Args:
+        root: Dataset directory
+        depth: Number of partition levels
+    
+    Returns:
+        Paths relative to root
+    """
+    level = [Path()]
+    for _ in range(depth):
+        level = [
+            relative / child.name
+            for relative in level
+            for child in (root / relative).iterdir()
+            if child.is_dir()
+        ]
+    return level
+
+
+class PartitionedDatasetWriter:
+    """
+    Write DataFrame batches to a Hive-partitioned Parquet dataset.
+    
+    Batches are written to a staging directory that is merged into the
+    dataset when the writer is closed. All batches must share the schema of
+    the first one (or of the existing dataset when appending).
+    """
+    
+    def __init__(
+        self,
+        path: Union[str, Path],
+        partition_cols: Sequence[str],
+        mode: str = "replace",
+    ):
+        if mode not in PARTITION_MODES:
+            raise ValueError(f"Invalid partitioned dataset mode: {mode}")
+        if not partition_cols:
+            raise ValueError("Partitioned datasets require partition_cols")
+        
+        self.path = Path(path)
+        self.partition_cols = list(partition_cols)
+        self.mode = mode
+        self.staging_path = self.path.with_name(self.path.name + ".part")
+        self.rows = 0
+        self._schema = None
+        self._token = uuid.uuid4().hex
+        self._writes = 0
+        
+        exists = self.path.exists() and any(self.path.iterdir())
+        if mode == "fail" and exists:
+            raise ValueError(f"Destination {self.path} already exists")
+        
+        if exists and mode in ("append", "replace_partitions"):
+            existing = _read_metadata(self.path)
+            if existing is not None:
+                if _partition_columns(existing) != self.partition_cols:
+                    raise ValueError(
+                        f"Dataset {self.path} is partitioned by {_partition_columns(existing)}"
+                    )
+                self._schema = existing
+        
+        if self.staging_path.exists():
+            shutil.rmtree(self.staging_path)
+        self.staging_path.mkdir(parents=True)
+    
+    def _table(self, df: pd.DataFrame) -> pa.Table:
+        """
+        Convert a batch to an Arrow table with the dataset schema.
+        
+        Args:
+            df: Batch of rows
+        
+        Returns:
+            Arrow table
+        """
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        
+        if self._schema is None:
+            missing = set(self.partition_cols) - set(table.column_names)
+            if missing:
+                raise ValueError(f"Partition columns not found in data: {sorted(missing)}")
+            
+            # Partition values live in directory names, so store them unencoded
+            schema = table.schema
+            for col in self.partition_cols:
+                field = schema.field(col)
+                if pa.types.is_dictionary(field.type):
+                    schema = schema.set(schema.get_field_index(col), field.with_type(field.type.value_type))
+            metadata = dict(schema.metadata or {})
+            metadata[b"partition_cols"] = json.dumps(self.partition_cols).encode()
+            self._schema = schema.with_metadata(metadata)
+        
+        try:
+            return table.select(self._schema.names).cast(self._schema)
+        except (KeyError, pa.ArrowInvalid, pa.ArrowNotImplementedError) as e:
+            raise ValueError(f"Data does not match the schema of {self.path}: {e}") from e
+    
+    def write(self, df: pd.DataFrame) -> None:
+        """
+        Write a batch of rows into its partitions.
+        
+        Args:
+            df: Batch of rows to write
+        """
+        table = self._table(df)
+        
+        ds.write_dataset(
+            table,
+            self.staging_path,
+            format="parquet",
+            partitioning=_partitioning(self._schema, self.partition_cols),
+            # Unique file names, so batches and later appends never collide
+            basename_template=f"part-{self._token}-{self._writes}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+            file_options=ds.ParquetFileFormat().make_write_options(
+                compression=STORAGE_SETTINGS["compression"]
+            ),
+            max_rows_per_file=PARTITION_SETTINGS["max_rows_per_file"],
+            max_rows_per_group=PARTITION_SETTINGS["max_rows_per_group"],
+            max_partitions=PARTITION_SETTINGS["max_partitions"],
+        )
+        
+        self._writes += 1
+        self.rows += len(df)
+    
+    def close(self) -> Path:
+        """
+        Finish writing and merge the staged partitions into the dataset.
+        
+        Returns:
+            Path to the dataset
+        """
+        if self._schema is not None:
+            pq.write_metadata(self._schema, self.staging_path / METADATA_FILE)
+        
+        if self.mode in ("fail", "replace") or not self.path.exists():
+            # Swap the whole directory
+            if self.path.exists():
+                previous = self.path.with_name(self.path.name + ".old")
+                os.replace(self.path, previous)
+                os.replace(self.staging_path, self.path)
+                shutil.rmtree(previous)
+            else:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(self.staging_path, self.path)
+            return self.path
+        
+        # Move the new files into their partitions, leaving others untouched
+        for relative in _leaf_directories(self.staging_path, len(self.partition_cols)):
+            target = self.path / relative
+            if self.mode == "replace_partitions" and target.exists():
+                shutil.rmtree(target)
+            target.mkdir(parents=True, exist_ok=True)
+            for file in (self.staging_path / relative).iterdir():
+                os.replace(file, target / file.name)
+        
+        if self._schema is not None:
+            os.replace(self.staging_path / METADATA_FILE, self.path / METADATA_FILE)
+        shutil.rmtree(self.staging_path)
+        return self.path
+    
+    def abort(self) -> None:
+        """Discard everything written so far."""
+        if self.staging_path.exists():
+            shutil.rmtree(self.staging_path)
+    
+    def __enter__(self) -> "PartitionedDatasetWriter":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def open_partitioned_dataset(path: Union[str, Path]) -> ds.Dataset:
+    """
+    Open a partitioned Parquet dataset.
+    
+    Datasets written by PartitionedDatasetWriter use their recorded schema;
+    other Hive-partitioned directories have their partition types inferred.
+    
+    Args:
+        path: Dataset directory
+    
+    Returns:
+        pyarrow Dataset
+    """
+    path = Path(path)
+    if not path.is_dir():
+        raise FileNotFoundError(f"Partitioned dataset not found: {path}")
+    
+    schema = _read_metadata(path)
+    if schema is None:
+        return ds.dataset(path, format="parquet", partitioning="hive")
+    
+    return ds.dataset(
+        path,
+        schema=schema,
+        format="parquet",
+        partitioning=_partitioning(schema, _partition_columns(schema)),
+    )
+
+
+def _filter_expression(filters: Optional[List]) -> Optional[ds.Expression]:
+    """
+    Convert filters to a dataset expression.
+    
+    Args:
+        filters: (column, op, value) triples that must all hold, or a list of
+            such lists of which any must hold (as in pd.read_parquet)
+    
+    Returns:
+        Filter expression, or None
+    """
+    if not filters:
+        return None
+    return pq.filters_to_expression(filters)
+
+
+def read_partitioned(
+    path: Union[str, Path],
+    columns: Optional[List[str]] = None,
+    filters: Optional[List] = None,
+) -> pd.DataFrame:
+    """
+    Read the matching rows and columns of a partitioned dataset.
+    
+    Args:
+        path: Dataset directory
+        columns: Columns to read (all columns if None)
+        filters: Row filters, e.g. [("contract_type", "==", "One year")]
+    
+    Returns:
+        DataFrame with the selected data
+    """
+    dataset = open_partitioned_dataset(path)
+    return dataset.to_table(columns=columns, filter=_filter_expression(filters)).to_pandas()
+
+
+def iter_partitioned_chunks(
+    path: Union[str, Path],
+    chunksize: int,
+    columns: Optional[List[str]] = None,
+    filters: Optional[List] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Read the matching rows of a partitioned dataset in chunks.
+    
+    Args:
+        path: Dataset directory
+        chunksize: Maximum number of rows per chunk
+        columns: Columns to read (all columns if None)
+        filters: Row filters (see read_partitioned)
+    
+    Yields:
+        DataFrame for each chunk of rows
+    """
+    dataset = open_partitioned_dataset(path)
+    for batch in dataset.to_batches(
+        columns=columns, filter=_filter_expression(filters), batch_size=chunksize
+    ):
+        if batch.num_rows:
+            yield batch.to_pandas()
@@ -0,0 +1,184 @@
+"""
+Dataset profiling helpers for Prefect flows.
+
+Numeric statistics are reduced column by column on each column's own array,
+so profiling never holds a float64 copy of the whole frame, and each
+categorical column is scanned once. For large
+inputs the profiler can switch to approximate statistics: quantiles from a
+uniform row sample and distinct counts from a HyperLogLog sketch.
+"""
+
+import warnings
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional
+
+from .config import PROFILING_SETTINGS
+
+
+def hyperloglog_count(values: pd.Series, precision: int = 14) -> int:
+    """
+    Estimate the number of distinct non-null values with HyperLogLog.
+    
+    Args:
+        values: Values to count
+        precision: Number of index bits (2**precision registers)
+    
+    Returns:
+        Estimated distinct count
+    """
+    values = values.dropna()
+    if values.empty:
+        return 0
+    
+    hashes = pd.util.hash_array(values.to_numpy()).astype(np.uint64)
+    n_registers = 1 << precision
+    
+    # Top bits select the register, the rest give the leading-zero rank
+    index = (hashes >> np.uint64(64 - precision)).astype(np.int64)
+    remainder = (hashes << np.uint64(precision)) | np.uint64((1 << precision) - 1)
+    rank = (64 - np.floor(np.log2(remainder.astype(np.float64)))).astype(np.int64)
+    
+    registers = np.zeros(n_registers, dtype=np.int64)
+    np.maximum.at(registers, index, rank)
+    
+    alpha = 0.7213 / (1 + 1.079 / n_registers)
+    estimate = alpha * n_registers ** 2 / np.sum(np.exp2(-registers.astype(np.float64)))
+    
+    # Small-range correction
+    empty = np.count_nonzero(registers == 0)
+    if estimate <= 2.5 * n_registers and empty:
+        estimate = n_registers * np.log(n_registers / empty)
+    
+    return int(round(estimate))
+
+
+def _numeric_stats(df: pd.DataFrame, columns: List[str], sample: Optional[np.ndarray]) -> Dict:
+    """
+    Compute min, max, mean, median and std for each numeric column.
+    
+    Columns are reduced one at a time with the pandas reductions for their
+    native dtype, so at most one column is converted for the std and median.
+    
+    Args:
+        df: DataFrame to profile
+        columns: Numeric columns
+        sample: Row positions used for the median (all rows if None)
+    
+    Returns:
+        Dictionary of per-column statistics
+    """
+    def as_float(value) -> float:
+        # Empty or all-missing columns reduce to NaN or pd.NA
+        return float("nan") if pd.isna(value) else float(value)
+    
+    stats = {}
+    # All-NaN columns yield NaN statistics; silence NumPy's warnings about them
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        for col in columns:
+            values = df[col]
+            stats[col] = {
+                "min": as_float(values.min()),
+                "max": as_float(values.max()),
+                "mean": as_float(values.mean()),
+                "median": as_float((values if sample is None else values.iloc[sample]).median()),
+                "std": as_float(values.std(ddof=1)),
+            }
+    
+    return stats
+
+
+def _categorical_stats(
+    df: pd.DataFrame,
+    columns: List[str],
+    sample: Optional[np.ndarray],
+    precision: int,
+) -> Dict:
+    """
+    Compute distinct counts and top values for categorical columns.
+    
+    Exact mode derives both statistics from a single value_counts per column.
+    Approximate mode uses HyperLogLog for the distinct count and scales the
+    top value counts up from the row sample.
+    
+    Args:
+        df: DataFrame to profile
+        columns: Categorical columns
+        sample: Row positions used for approximate top values (exact if None)
+        precision: HyperLogLog precision
+    
+    Returns:
+        Dictionary of per-column statistics
+    """
+    stats = {}
+    for col in columns:
+        if sample is None:
+            counts = df[col].value_counts()
+            stats[col] = {
+                "unique_values": int((counts > 0).sum()),
+                "top_values": counts.head(5).to_dict(),
+            }
+        else:
+            scale = len(df) / len(sample)
+            counts = df[col].iloc[sample].value_counts().head(5)
+            stats[col] = {
+                "unique_values": hyperloglog_count(df[col], precision),
+                "top_values": {k: int(round(v * scale)) for k, v in counts.items()},
+            }
+    return stats
+
+
+def profile_dataframe(
+    df: pd.DataFrame,
+    dataset_name: str,
+    approximate: Optional[bool] = None,
+    random_state: int = 42,
+) -> Dict:
+    """
+    Profile a DataFrame in the format produced by analyze_dataset.
+    
+    Args:
+        df: DataFrame to profile
+        dataset_name: Name of the dataset
+        approximate: Whether to use approximate statistics (defaults to
+            PROFILING_SETTINGS based on the row count)
+        random_state: Random seed for the row sample
+    
+    Returns:
+        Dictionary with dataset analysis
+    """
+    if approximate is None:
+        approximate = len(df) > PROFILING_SETTINGS["approximate_threshold_rows"]
+    
+    sample = None
+    if approximate and len(df) > PROFILING_SETTINGS["sample_size"]:
+        rng = np.random.default_rng(random_state)
+        sample = np.sort(rng.choice(len(df), PROFILING_SETTINGS["sample_size"], replace=False))
+    
+    missing = df.isnull().sum()
+    
+    # Basic statistics
+    analysis = {
+        "dataset_name": dataset_name,
+        "shape": df.shape,
+        "columns": list(df.columns),
+        "dtypes": {col: str(dtype) for col, dtype in df.dtypes.items()},
+        "missing_values": missing.to_dict(),
+        "missing_percentage": (missing / len(df) * 100).to_dict(),
+        "approximate": sample is not None,
+    }
+    
+    # Numeric columns statistics
+    numeric_cols = df.select_dtypes(include=["number"]).columns.tolist()
+    if numeric_cols:
+        analysis["numeric_stats"] = _numeric_stats(df, numeric_cols, sample)
+    
+    # Categorical columns statistics
+    categorical_cols = df.select_dtypes(include=["object", "category"]).columns.tolist()
+    if categorical_cols:
+        analysis["categorical_stats"] = _categorical_stats(
+            df, categorical_cols, sample, PROFILING_SETTINGS["hll_precision"]
+        )
+    
+    return analysis
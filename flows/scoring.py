@@ -0,0 +1,176 @@
+"""
+Chunked batch scoring with a shared model.
+
+Chunks of an input dataset are scored in worker processes. Each worker
+loads the saved model with joblib's memory-mapping, so the model's large
+NumPy arrays (tree nodes, coefficients, fold ensembles) are mapped from the
+same file and shared through the page cache instead of being copied into
+every worker. Raw input rows can be prepared (cleaned and transformed like
+the training data) in the workers before scoring. The parent keeps a
+bounded number of chunks in flight and writes the predictions in input
+order.
+"""
+
+import multiprocessing
+import os
+import uuid
+import joblib
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from sklearn.pipeline import Pipeline
+from threadpoolctl import threadpool_limits
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple
+
+# Model and chunk preparation of a scoring worker process (set by _init_worker)
+_WORKER_MODEL = None
+_WORKER_PREPARE = None
+
+
+def prediction_frame(model: Any, chunk: pd.DataFrame, id_columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Score a chunk of rows.
+    
+    The model's input columns are selected from the chunk; classifiers also
+    get one probability column per class.
+    
+    Args:
+        model: Fitted model (usually a Pipeline with preprocessing)
+        chunk: Rows to score
+        id_columns: Columns copied from the chunk to identify the rows
+    
+    Returns:
+        DataFrame with the id columns, "prediction" and "probability_<class>"
+    """
+    features = getattr(model, "feature_names_in_", None)
+    X = chunk[list(features)] if features is not None else chunk
+    
+    result = chunk[id_columns].reset_index(drop=True) if id_columns else pd.DataFrame(index=range(len(chunk)))
+    
+    # Preprocess once for both predictions and probabilities
+    if isinstance(model, Pipeline) and len(model.steps) > 1:
+        X = model[:-1].transform(X)
+        model = model[-1]
+    
+    result["prediction"] = model.predict(X)
+    
+    classes = getattr(model, "classes_", None)
+    if classes is not None and hasattr(model, "predict_proba"):
+        probabilities = model.predict_proba(X)
+        for i, label in enumerate(classes):
+            result[f"probability_{label}"] = probabilities[:, i]
+    
+    return result
+
+
+def _init_worker(model_path: str, prepare: Optional[Callable[[pd.DataFrame], pd.DataFrame]]) -> None:
+    """Memory-map the model once per worker and keep native libraries single-threaded."""
+    global _WORKER_MODEL, _WORKER_PREPARE
+    threadpool_limits(limits=1)
+    _WORKER_MODEL = joblib.load(model_path, mmap_mode="r")
+    _WORKER_PREPARE = prepare
+
+
+def _score_chunk(chunk: pd.DataFrame, id_columns: Optional[List[str]]) -> pd.DataFrame:
+    """Prepare and score a chunk with the worker's model."""
+    if _WORKER_PREPARE is not None:
+        chunk = _WORKER_PREPARE(chunk)
+    return prediction_frame(_WORKER_MODEL, chunk, id_columns)
+
+
+def score_chunks(
+    model: Any,
+    model_path: Path,
+    chunks: Iterable[pd.DataFrame],
+    id_columns: Optional[List[str]] = None,
+    max_workers: int = 1,
+    prepare: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Score chunks of rows, in parallel worker processes if max_workers > 1.
+    
+    Args:
+        model: Loaded model for scoring in-process (loaded from model_path if
+            None; workers always memory-map model_path)
+        model_path: Saved model file
+        chunks: Chunks of rows to score
+        id_columns: Columns copied from the input to identify the rows
+        max_workers: Number of worker processes
+        prepare: Picklable function applied to each chunk before scoring
+            (e.g. cleaning and transforming raw rows)
+    
+    Yields:
+        Prediction DataFrame for each chunk, in input order
+    """
+    if max_workers <= 1:
+        if model is None:
+            model = joblib.load(model_path)
+        for chunk in chunks:
+            if prepare is not None:
+                chunk = prepare(chunk)
+            yield prediction_frame(model, chunk, id_columns)
+        return
+    
+    # Workers are spawned rather than forked from the (threaded) flow process
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(str(model_path), prepare),
+    ) as executor:
+        # Read ahead only a few chunks per worker so memory stays bounded
+        pending = []
+        for chunk in chunks:
+            pending.append(executor.submit(_score_chunk, chunk, id_columns))
+            if len(pending) >= 2 * max_workers:
+                yield pending.pop(0).result()
+        for future in pending:
+            yield future.result()
+
+
+def write_predictions(predictions: Iterable[pd.DataFrame], output_path: Path) -> Tuple[int, int]:
+    """
+    Write prediction chunks to a Parquet file, one row group per chunk.
+    
+    The file is written next to the output and moved into place when
+    complete, so readers never see a partial file.
+    
+    Args:
+        predictions: Prediction DataFrames with the same columns
+        output_path: Path of the Parquet file
+    
+    Returns:
+        Tuple of the number of rows and chunks written
+    
+    Raises:
+        ValueError: If there are no predictions
+    """
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    staging = output_path.with_name(f"{output_path.name}.{uuid.uuid4().hex}.part")
+    
+    writer = None
+    rows = chunks = 0
+    try:
+        for frame in predictions:
+            # Later chunks are cast to the first chunk's schema
+            table = pa.Table.from_pandas(frame, schema=writer.schema if writer else None, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(staging, table.schema)
+            writer.write_table(table)
+            rows += len(frame)
+            chunks += 1
+        
+        if writer is None:
+            raise ValueError("No rows to score")
+        writer.close()
+        os.replace(staging, output_path)
+    except BaseException:
+        if writer is not None:
+            writer.close()
+        staging.unlink(missing_ok=True)
+        raise
+    
+    return rows, chunks
@@ -0,0 +1,124 @@
+"""
+Deterministic train/validation/test splitting for Prefect flows.
+
+Rows are assigned to splits in one vectorized pass from a hash of their key,
+so the assignment is reproducible across runs and independent of row order.
+The engine works on positional index arrays; callers take the rows they need
+instead of building intermediate feature/target frames.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional, Union
+
+SPLIT_NAMES = ["train", "val", "test"]
+
+
+def hash_draws(keys: Union[pd.DataFrame, pd.Series], random_state: int = 42) -> np.ndarray:
+    """
+    Map row keys to uniform draws in [0, 1) with a seeded hash.
+    
+    Args:
+        keys: Row keys (a key column, or whole rows if there is no key)
+        random_state: Seed mixed into the hash
+    
+    Returns:
+        Array of draws, one per row
+    """
+    hashes = pd.util.hash_pandas_object(
+        keys, index=False, hash_key=f"{random_state:016d}"[-16:]
+    ).to_numpy()
+    
+    # Top 53 bits of the hash as a uniform draw in [0, 1)
+    return (hashes >> np.uint64(11)).astype(np.float64) / float(1 << 53)
+
+
+def assign_splits_by_hash(
+    keys: Union[pd.DataFrame, pd.Series],
+    test_size: float = 0.2,
+    val_size: float = 0.1,
+    random_state: int = 42,
+    strata: Optional[pd.Series] = None,
+) -> np.ndarray:
+    """
+    Assign rows to splits from a hash of their key.
+    
+    Without strata a row's split depends only on its key and the seed, never
+    on the other rows, so it stays the same when rows are added or processed
+    in batches. With strata, rows are ranked by their hash within each
+    stratum and the split sizes are exact per stratum; adding rows can then
+    move rows near the split boundaries.
+    
+    Args:
+        keys: Row keys (a key column, or whole rows if there is no key)
+        test_size: Proportion of rows to assign to the test split
+        val_size: Proportion of rows to assign to the validation split
+        random_state: Seed mixed into the hash
+        strata: Stratum of each row (e.g. the class label), or None
+    
+    Returns:
+        Array of split names ("train", "val" or "test") for each row
+    """
+    draws = hash_draws(keys, random_state)
+    
+    if strata is not None:
+        codes, uniques = pd.factorize(strata, use_na_sentinel=False)
+        sizes = np.bincount(codes, minlength=len(uniques))
+        
+        # Rank of each row within its stratum, ordered by hash
+        order = np.lexsort((draws, codes))
+        starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+        ranks = np.empty(len(draws), dtype=np.int64)
+        ranks[order] = np.arange(len(draws)) - starts[codes[order]]
+        
+        n_test = np.rint(sizes * test_size).astype(np.int64)[codes]
+        n_val = np.rint(sizes * val_size).astype(np.int64)[codes]
+        return np.where(
+            ranks < n_test,
+            "test",
+            np.where(ranks < n_test + n_val, "val", "train"),
+        )
+    
+    return np.where(
+        draws < test_size,
+        "test",
+        np.where(draws < test_size + val_size, "val", "train"),
+    )
+
+
+def split_indices(
+    df: pd.DataFrame,
+    key: Optional[str] = None,
+    test_size: float = 0.2,
+    val_size: float = 0.1,
+    random_state: int = 42,
+    stratify: Optional[str] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    Compute the row positions of each split of a DataFrame.
+    
+    Args:
+        df: DataFrame to split
+        key: Column uniquely identifying a row (whole rows are hashed if None)
+        test_size: Proportion of rows to assign to the test split
+        val_size: Proportion of rows to assign to the validation split
+        random_state: Seed mixed into the hash
+        stratify: Column to stratify the splits by, or None
+    
+    Returns:
+        Dictionary mapping split names to arrays of row positions
+    """
+    if test_size < 0 or val_size < 0 or test_size + val_size >= 1:
+        raise ValueError(
+            f"Invalid split sizes: test_size={test_size}, val_size={val_size}"
+        )
+    
+    splits = assign_splits_by_hash(
+        df[key] if key else df,
+        test_size,
+        val_size,
+        random_state,
+        strata=df[stratify] if stratify else None,
+    )
+    
+    return {name: np.flatnonzero(splits == name) for name in SPLIT_NAMES}
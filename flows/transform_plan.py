@@ -0,0 +1,434 @@
+"""
+Compiled transformation plans for the ETL flows.
+
+A list of transformation configurations is validated up front and compiled
+into a shorter plan: adjacent renames, drops, fills and filters are merged
+into single operations, and row filters are moved ahead of the steps they
+do not depend on so later steps process fewer rows. Feature expressions and
+filter conditions are compiled once when the plan is built (see
+expressions). The plan is executed on one working copy of the data, with
+each step modifying it in place.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, Optional, Set
+
+from .encoding import BINARY_OUTPUTS, ONE_HOT_DTYPES, encode_binary_columns, one_hot_encode
+from .expressions import compile_expression, get_udf
+
+TRANSFORM_TYPES = [
+    "drop_columns",
+    "rename_columns",
+    "fill_missing",
+    "create_feature",
+    "filter_rows",
+    "encode_categorical",
+    "encode_binary",
+    "normalize",
+    "udf",
+]
+
+# Supported methods per transformation type; the first one is the default
+TRANSFORM_METHODS = {
+    "fill_missing": ["mean", "median", "mode", "value"],
+    "encode_categorical": ["one_hot", "label"],
+    "normalize": ["minmax", "zscore"],
+}
+
+REQUIRED_FIELDS = {
+    "rename_columns": ["mapping"],
+    "create_feature": ["name", "expression"],
+    "filter_rows": ["condition"],
+    "udf": ["name"],
+}
+
+
+def validate_transformations(transformations: List[Dict]) -> List[Dict]:
+    """
+    Validate transformation configurations and fill in their defaults.
+    
+    Args:
+        transformations: List of transformation configurations
+    
+    Returns:
+        List of normalized transformation configurations
+    
+    Raises:
+        ValueError: If a transformation is unknown or misconfigured
+    """
+    steps = []
+    for i, transform in enumerate(transformations):
+        transform_type = transform.get("type")
+        if transform_type == "custom_python":
+            raise ValueError(
+                f"Transformation {i + 1}: custom_python is not supported; register "
+                f"the code with expressions.register_udf and use a 'udf' step"
+            )
+        if transform_type not in TRANSFORM_TYPES:
+            raise ValueError(f"Transformation {i + 1}: unknown type '{transform_type}'")
+        
+        for field in REQUIRED_FIELDS.get(transform_type, []):
+            if not transform.get(field):
+                raise ValueError(f"Transformation {i + 1} ({transform_type}): '{field}' is required")
+        
+        step = dict(transform)
+        methods = TRANSFORM_METHODS.get(transform_type)
+        if methods:
+            step["method"] = transform.get("method", methods[0])
+            if step["method"] not in methods:
+                raise ValueError(
+                    f"Transformation {i + 1} ({transform_type}): unknown method '{step['method']}'"
+                )
+        
+        # Parse expressions now so invalid ones fail before any data is read
+        if transform_type == "create_feature":
+            compile_expression(step["expression"])
+        elif transform_type == "filter_rows":
+            compile_expression(step["condition"])
+        elif transform_type == "udf":
+            get_udf(step["name"])
+        
+        if transform_type == "fill_missing" and step["method"] == "value" and step.get("value") is None:
+            raise ValueError(f"Transformation {i + 1} (fill_missing): 'value' is required")
+        
+        if transform_type == "encode_binary" and step.get("output", "int8") not in BINARY_OUTPUTS:
+            raise ValueError(
+                f"Transformation {i + 1} (encode_binary): unknown output '{step['output']}'"
+            )
+        
+        if transform_type == "encode_categorical" and step.get("dtype", "bool") not in ONE_HOT_DTYPES:
+            raise ValueError(
+                f"Transformation {i + 1} (encode_categorical): unknown dtype '{step['dtype']}'"
+            )
+        
+        if transform_type == "fill_missing":
+            # Fills are grouped so adjacent fills can run as one fillna
+            step = {
+                "type": "fill_missing",
+                "groups": [{
+                    "columns": step.get("columns"),
+                    "method": step["method"],
+                    "value": step.get("value"),
+                }],
+            }
+        
+        steps.append(step)
+    
+    return steps
+
+
+def _condition_names(condition: str) -> Set[str]:
+    """
+    Get the columns a filter condition reads.
+    
+    Args:
+        condition: Query condition
+    
+    Returns:
+        Set of column names
+    """
+    return set(compile_expression(condition).columns)
+
+
+def _written_columns(step: Dict) -> Optional[Set[str]]:
+    """
+    Get the columns a step creates, renames, drops or modifies.
+    
+    Args:
+        step: Normalized transformation step
+    
+    Returns:
+        Set of column names, or None if the step can touch any column or
+        depends on the rows it sees
+    """
+    transform_type = step["type"]
+    
+    if transform_type == "drop_columns":
+        return set(step.get("columns", []))
+    if transform_type == "rename_columns":
+        return set(step["mapping"]) | set(step["mapping"].values())
+    if transform_type == "create_feature":
+        return {step["name"]}
+    if transform_type == "encode_binary" and step.get("columns") is not None:
+        return set(step["columns"])
+    if transform_type == "fill_missing" and all(
+        group["method"] == "value" and group["columns"] is not None for group in step["groups"]
+    ):
+        # Constant fills do not depend on the other rows
+        return {col for group in step["groups"] for col in group["columns"]}
+    
+    # Statistics-based steps (fills, encodings, normalization) and custom
+    # code depend on the rows present, so filters cannot move past them
+    return None
+
+
+def _merge_steps(previous: Dict, step: Dict) -> bool:
+    """
+    Merge a step into the previous one when they can run as one operation.
+    
+    Args:
+        previous: Previous plan step (updated in place)
+        step: Next step
+    
+    Returns:
+        True if the step was merged
+    """
+    if previous["type"] != step["type"]:
+        return False
+    
+    transform_type = step["type"]
+    
+    if transform_type == "drop_columns":
+        previous["columns"] = list(previous.get("columns", [])) + [
+            col for col in step.get("columns", []) if col not in previous.get("columns", [])
+        ]
+        return True
+    
+    if transform_type == "rename_columns":
+        # Compose the mappings: a -> b then b -> c becomes a -> c
+        first, second = previous["mapping"], step["mapping"]
+        mapping = {old: second.get(new, new) for old, new in first.items()}
+        mapping.update({
+            old: new for old, new in second.items()
+            if old not in first and old not in first.values()
+        })
+        previous["mapping"] = mapping
+        return True
+    
+    if transform_type == "filter_rows":
+        previous["condition"] = f"({previous['condition']}) and ({step['condition']})"
+        return True
+    
+    if transform_type == "fill_missing":
+        # Only fills of explicit, disjoint columns are independent
+        groups = previous["groups"] + step["groups"]
+        if any(group["columns"] is None for group in groups):
+            return False
+        columns = [col for group in groups for col in group["columns"]]
+        if len(columns) != len(set(columns)):
+            return False
+        previous["groups"] = groups
+        return True
+    
+    return False
+
+
+def compile_transformations(transformations: List[Dict]) -> List[Dict]:
+    """
+    Compile transformation configurations into an optimized plan.
+    
+    Filters are moved ahead of earlier steps whose output they do not read
+    and that do not depend on the rows present, then adjacent compatible
+    steps are merged.
+    
+    Args:
+        transformations: List of transformation configurations
+    
+    Returns:
+        List of plan steps
+    """
+    steps = validate_transformations(transformations)
+    
+    # Push filters as early as possible
+    ordered = []
+    for step in steps:
+        position = len(ordered)
+        if step["type"] == "filter_rows":
+            names = _condition_names(step["condition"])
+            while position > 0:
+                written = _written_columns(ordered[position - 1])
+                if ordered[position - 1]["type"] == "filter_rows" or written is None or written & names:
+                    break
+                position -= 1
+        ordered.insert(position, step)
+    
+    # Merge adjacent steps of the same kind
+    plan = []
+    for step in ordered:
+        if not plan or not _merge_steps(plan[-1], step):
+            plan.append(dict(step))
+    
+    # Attach the compiled (cached) form of each expression
+    for step in plan:
+        if step["type"] == "create_feature":
+            step["compiled"] = compile_expression(step["expression"])
+        elif step["type"] == "filter_rows":
+            step["compiled"] = compile_expression(step["condition"])
+    
+    return plan
+
+
+def is_row_local(step: Dict) -> bool:
+    """
+    Check whether a plan step transforms each row independently.
+    
+    Row-local steps give the same result whether the data is transformed
+    at once or chunk by chunk.
+    
+    Args:
+        step: Plan step
+    
+    Returns:
+        True if the step can run on separate chunks
+    """
+    transform_type = step["type"]
+    
+    if transform_type in ("drop_columns", "rename_columns"):
+        return True
+    if transform_type in ("create_feature", "filter_rows"):
+        # Expressions using column statistics (e.g. "x > x.mean()") need all rows
+        source = step["expression"] if transform_type == "create_feature" else step["condition"]
+        return compile_expression(source).row_local
+    if transform_type == "fill_missing":
+        return all(group["method"] == "value" for group in step["groups"])
+    if transform_type == "encode_binary":
+        return step.get("columns") is not None
+    if transform_type == "udf":
+        return get_udf(step["name"])["row_local"]
+    if transform_type == "encode_categorical":
+        # One-hot columns only match across chunks with a fixed vocabulary
+        categories = step.get("categories") or {}
+        return step["method"] == "one_hot" and all(
+            col in categories for col in step.get("columns", [])
+        )
+    return False
+
+
+def check_streamable(plan: List[Dict]) -> None:
+    """
+    Check that every step of a plan can run chunk by chunk.
+    
+    Args:
+        plan: Plan from compile_transformations
+    
+    Raises:
+        ValueError: If a step depends on statistics of the whole dataset
+    """
+    for step in plan:
+        if not is_row_local(step):
+            raise ValueError(
+                f"Transformation '{step['type']}' is not row-local and cannot be "
+                f"streamed (constant fills, explicit binary columns, one-hot "
+                f"encoding with fixed categories and row-local UDFs are supported)"
+            )
+
+
+def _fill_values(df: pd.DataFrame, groups: List[Dict]) -> Dict[str, Any]:
+    """
+    Compute the values a merged fill step fills each column with.
+    
+    Args:
+        df: DataFrame to fill
+        groups: Fill groups of the step
+    
+    Returns:
+        Dictionary mapping columns to fill values
+    """
+    values = {}
+    for group in groups:
+        columns = [col for col in (group["columns"] or df.columns) if col in df.columns]
+        method = group["method"]
+        
+        if method in ("mean", "median"):
+            numeric = [col for col in columns if pd.api.types.is_numeric_dtype(df[col])]
+            if numeric:
+                stats = df[numeric].mean() if method == "mean" else df[numeric].median()
+                values.update(stats.dropna().to_dict())
+        elif method == "mode":
+            for col in columns:
+                mode = df[col].mode()
+                if not mode.empty:
+                    values[col] = mode[0]
+        else:
+            values.update({col: group["value"] for col in columns})
+    
+    return values
+
+
+def execute_plan(df: pd.DataFrame, plan: List[Dict], copy: bool = True) -> pd.DataFrame:
+    """
+    Execute a compiled plan on a copy of a DataFrame.
+    
+    Args:
+        df: DataFrame to transform
+        plan: Plan from compile_transformations
+        copy: Whether to work on a copy (if False, df may be modified in place)
+    
+    Returns:
+        Transformed DataFrame
+    """
+    # A single working copy; every step below modifies it in place
+    if copy:
+        df = df.copy()
+    
+    for step in plan:
+        transform_type = step["type"]
+        
+        if transform_type == "drop_columns":
+            df.drop(columns=step.get("columns", []), inplace=True)
+        
+        elif transform_type == "rename_columns":
+            df.rename(columns=step["mapping"], inplace=True)
+        
+        elif transform_type == "fill_missing":
+            values = {
+                col: value for col, value in _fill_values(df, step["groups"]).items()
+                if df[col].hasnans
+            }
+            if values:
+                df.fillna(values, inplace=True)
+        
+        elif transform_type == "create_feature":
+            expression = step.get("compiled") or compile_expression(step["expression"])
+            df[step["name"]] = expression.evaluate(df)
+        
+        elif transform_type == "filter_rows":
+            condition = step.get("compiled") or compile_expression(step["condition"])
+            # take() returns a new frame that is safe to modify in place
+            df = df.take(np.flatnonzero(condition.mask(df)))
+        
+        elif transform_type == "encode_categorical":
+            columns = [col for col in step.get("columns", []) if col in df.columns]
+            if not columns:
+                continue
+            if step["method"] == "one_hot":
+                # All dummies in one matrix, joined to the table once
+                df = one_hot_encode(
+                    df,
+                    columns,
+                    categories=step.get("categories"),
+                    dtype=step.get("dtype", "bool"),
+                    sparse=step.get("sparse", False),
+                )
+            else:
+                for col in columns:
+                    df[col] = df[col].astype("category").cat.codes
+        
+        elif transform_type == "encode_binary":
+            encode_binary_columns(
+                df,
+                columns=step.get("columns"),
+                true_value=step.get("true_value", "Yes"),
+                false_value=step.get("false_value", "No"),
+                output=step.get("output", "int8"),
+            )
+        
+        elif transform_type == "normalize":
+            columns = step.get("columns", df.select_dtypes(include=["number"]).columns)
+            columns = [
+                col for col in columns
+                if col in df.columns and pd.api.types.is_numeric_dtype(df[col])
+            ]
+            if not columns:
+                continue
+            values = df[columns]
+            if step["method"] == "minmax":
+                df[columns] = (values - values.min()) / (values.max() - values.min())
+            else:
+                df[columns] = (values - values.mean()) / values.std()
+        
+        elif transform_type == "udf":
+            df = get_udf(step["name"])["function"](df, **step.get("params", {}))
+    
+    return df
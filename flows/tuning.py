@@ -0,0 +1,373 @@
+"""
+Hyperparameter search on the precomputed CV folds.
+
+Search spaces are declared per algorithm in the "search_spaces" entry of a
+dataset's MODELS configuration. Each parameter is either a list of values
+or a range:
+
+    {"low": 0.01, "high": 10.0, "log": True}   # float, log-uniform
+    {"low": 2, "high": 20, "type": "int"}      # integer, uniform
+
+Four methods are supported: "grid" (every combination of list-valued
+spaces), "random" (sampled candidates), "halving" (successive halving of
+the candidates, training on a growing number of rows per fold and keeping
+the best 1/eta at each rung) and "hyperband" (several halving brackets
+trading off the number of candidates against their starting budget).
+
+Trials run in parallel and are scored fold by fold; a trial whose mean
+score after the first folds is below the median of the trials before it is
+stopped early (median stopping rule). Every finished or stopped trial is
+cached on disk, keyed by the fold cache key (data, preprocessor and CV
+settings), the scoring and the full estimator parameters, so an
+interrupted search resumes where it stopped and repeated searches only run
+new candidates.
+"""
+
+import itertools
+import json
+import math
+import os
+import time
+import uuid
+import joblib
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from sklearn.base import clone
+from sklearn.metrics import get_scorer
+
+from .config import TUNING_SETTINGS
+from .folds import load_matrix
+
+SEARCH_METHODS = ["grid", "random", "halving", "hyperband"]
+
+
+def _is_range(spec: Any) -> bool:
+    """Whether a parameter spec is a range rather than a list of values."""
+    return isinstance(spec, dict)
+
+
+def validate_space(space: Dict[str, Any]) -> None:
+    """
+    Check a search space declaration.
+    
+    Args:
+        space: Mapping of parameter names to value lists or ranges
+    
+    Raises:
+        ValueError: If a parameter spec is invalid
+    """
+    if not space:
+        raise ValueError("Search space is empty")
+    
+    for name, spec in space.items():
+        if _is_range(spec):
+            if "low" not in spec or "high" not in spec or spec["low"] > spec["high"]:
+                raise ValueError(f"Range for '{name}' needs 'low' <= 'high': {spec}")
+            if spec.get("type", "float") not in ("int", "float"):
+                raise ValueError(f"Range for '{name}' has unsupported type: {spec['type']}")
+            if spec.get("log") and spec["low"] <= 0:
+                raise ValueError(f"Log range for '{name}' needs a positive 'low': {spec}")
+        elif not isinstance(spec, list) or not spec:
+            raise ValueError(f"Search space for '{name}' must be a non-empty list or a range")
+
+
+def grid_candidates(space: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Build every combination of a list-valued search space.
+    
+    Args:
+        space: Mapping of parameter names to value lists
+    
+    Returns:
+        List of parameter dictionaries
+    
+    Raises:
+        ValueError: If a parameter is declared as a range
+    """
+    ranges = [name for name, spec in space.items() if _is_range(spec)]
+    if ranges:
+        raise ValueError(f"Grid search needs lists of values, got ranges for {ranges}")
+    
+    names = list(space)
+    return [dict(zip(names, values)) for values in itertools.product(*space.values())]
+
+
+def _sample(spec: Any, rng: np.random.Generator) -> Any:
+    """Draw one value of a parameter spec."""
+    if not _is_range(spec):
+        return spec[rng.integers(len(spec))]
+    
+    low, high = spec["low"], spec["high"]
+    if spec.get("log"):
+        value = math.exp(rng.uniform(math.log(low), math.log(high)))
+    else:
+        value = rng.uniform(low, high)
+    
+    if spec.get("type", "float") == "int":
+        return int(min(high, max(low, round(value))))
+    return float(value)
+
+
+def sample_candidates(space: Dict[str, Any], n: int, rng: np.random.Generator) -> List[Dict[str, Any]]:
+    """
+    Sample candidates from a search space.
+    
+    Args:
+        space: Mapping of parameter names to value lists or ranges
+        n: Number of candidates
+        rng: Random generator
+    
+    Returns:
+        List of parameter dictionaries
+    """
+    return [{name: _sample(spec, rng) for name, spec in space.items()} for _ in range(n)]
+
+
+class TrialCache:
+    """
+    On-disk cache of trial results, one JSON file per trial.
+    """
+    
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a cached trial.
+        
+        Args:
+            key: Trial key
+        
+        Returns:
+            Trial record, or None if the trial has not run
+        """
+        path = self.directory / f"{key}.json"
+        if not path.exists():
+            return None
+        return json.loads(path.read_text())
+    
+    def put(self, key: str, record: Dict[str, Any]) -> None:
+        """
+        Store a trial, replacing the file atomically.
+        
+        Args:
+            key: Trial key
+            record: Trial record
+        """
+        staging = self.directory / f"{key}.{uuid.uuid4().hex}.part"
+        staging.write_text(json.dumps(record, indent=2, default=str))
+        os.replace(staging, self.directory / f"{key}.json")
+
+
+def trial_key(estimator: Any, scoring: str, n_samples: Optional[int]) -> str:
+    """
+    Build the cache key of a trial.
+    
+    Args:
+        estimator: Estimator with the trial's parameters set
+        scoring: scikit-learn scoring name
+        n_samples: Training rows per fold (None for all)
+    
+    Returns:
+        Hex digest identifying the trial within a fold cache
+    """
+    params = sorted((name, repr(value)) for name, value in estimator.get_params(deep=False).items())
+    return joblib.hash((type(estimator).__name__, params, scoring, n_samples))
+
+
+def _run_trial(
+    estimator: Any,
+    directory: Path,
+    folds: List[Dict[str, str]],
+    y: pd.Series,
+    scoring: str,
+    n_samples: Optional[int],
+    reference: Dict[int, float],
+    prune_after_folds: int,
+    seed: int,
+) -> Dict[str, Any]:
+    """Cross-validate one candidate fold by fold, stopping early if it falls behind."""
+    scores = []
+    start = time.perf_counter()
+    try:
+        for i, fold in enumerate(folds):
+            train_idx = np.load(directory / fold["train_idx"])
+            val_idx = np.load(directory / fold["val_idx"])
+            X_train = load_matrix(directory, fold["X_train"])
+            
+            if n_samples is not None and n_samples < len(train_idx):
+                # The same rows for every candidate, so rungs compare fairly
+                rows = np.sort(np.random.default_rng(seed + i).permutation(len(train_idx))[:n_samples])
+                X_train, train_idx = X_train[rows], train_idx[rows]
+            
+            model = clone(estimator).fit(X_train, y.iloc[train_idx])
+            scores.append(float(get_scorer(scoring)(model, load_matrix(directory, fold["X_val"]), y.iloc[val_idx])))
+            
+            done = len(scores)
+            if prune_after_folds <= done < len(folds) and done in reference and np.mean(scores) < reference[done]:
+                return {"status": "pruned", "scores": scores, "seconds": time.perf_counter() - start}
+    except Exception as e:
+        return {"status": "failed", "error": str(e), "scores": scores, "seconds": time.perf_counter() - start}
+    
+    return {
+        "status": "complete",
+        "scores": scores,
+        "score": float(np.mean(scores)),
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def _median_reference(trials: List[Dict[str, Any]], n_folds: int) -> Dict[int, float]:
+    """Median of the running mean scores of earlier trials after each fold."""
+    reference = {}
+    for done in range(1, n_folds):
+        means = [np.mean(t["scores"][:done]) for t in trials if len(t["scores"]) >= done]
+        if len(means) >= 2:
+            reference[done] = float(np.median(means))
+    return reference
+
+
+def _rank(trials: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Order trials best first, with stopped and failed trials last."""
+    return sorted(trials, key=lambda t: t.get("score", -np.inf), reverse=True)
+
+
+def run_search(
+    estimator: Any,
+    space: Dict[str, Any],
+    manifest: Dict[str, Any],
+    y: pd.Series,
+    scoring: str,
+    method: Optional[str] = None,
+    n_trials: Optional[int] = None,
+    n_jobs: int = 1,
+    log: Optional[Callable[[str], None]] = None,
+) -> Dict[str, Any]:
+    """
+    Search hyperparameters of an estimator on precomputed folds.
+    
+    Args:
+        estimator: Unfitted estimator (without preprocessing) with the
+            parameters that are not searched
+        space: Search space of the estimator's parameters
+        manifest: Manifest from build_fold_cache
+        y: Training target
+        scoring: scikit-learn scoring name (higher is better)
+        method: Search method (if None, uses TUNING_SETTINGS)
+        n_trials: Candidates for random search and halving (if None, uses
+            TUNING_SETTINGS); hyperband sizes its own brackets
+        n_jobs: Number of trials to run concurrently
+        log: Function called with progress messages
+    
+    Returns:
+        Dictionary with the best parameters and score and every trial
+    
+    Raises:
+        ValueError: If the method or space is invalid or no trial completed
+    """
+    method = method or TUNING_SETTINGS["method"]
+    if method not in SEARCH_METHODS:
+        raise ValueError(f"Unsupported search method: {method} (expected one of {SEARCH_METHODS})")
+    validate_space(space)
+    
+    n_trials = n_trials or TUNING_SETTINGS["n_trials"]
+    eta = TUNING_SETTINGS["eta"]
+    seed = TUNING_SETTINGS["random_state"]
+    rng = np.random.default_rng(seed)
+    log = log or (lambda message: None)
+    
+    directory = Path(manifest["directory"])
+    folds = manifest["folds"]
+    cache = TrialCache(Path(TUNING_SETTINGS["cache_dir"]) / manifest["key"])
+    
+    # Rows per fold for the halving rungs
+    max_samples = min(len(np.load(directory / fold["train_idx"])) for fold in folds)
+    max_rungs = max(0, int(math.log(max_samples / TUNING_SETTINGS["min_samples"], eta)))
+    
+    history: Dict[Optional[int], List[Dict[str, Any]]] = {}
+    trials = []
+    
+    def evaluate(candidates: List[Dict[str, Any]], n_samples: Optional[int]) -> List[Dict[str, Any]]:
+        """Run (or load) the candidates on n_samples rows per fold."""
+        seen = history.setdefault(n_samples, [])
+        records = [None] * len(candidates)
+        pending = []
+        for i, params in enumerate(candidates):
+            candidate = clone(estimator).set_params(**params)
+            key = trial_key(candidate, scoring, n_samples)
+            cached = cache.get(key)
+            if cached is not None:
+                records[i] = dict(cached, cached=True)
+                seen.append(records[i])
+            else:
+                pending.append((i, params, candidate, key))
+        
+        # Trials in a wave are compared against the trials finished before it
+        for start in range(0, len(pending), n_jobs):
+            wave = pending[start:start + n_jobs]
+            reference = _median_reference(seen, len(folds))
+            outcomes = joblib.Parallel(n_jobs=n_jobs)(
+                joblib.delayed(_run_trial)(
+                    candidate, directory, folds, y, scoring, n_samples,
+                    reference, TUNING_SETTINGS["prune_after_folds"], seed,
+                )
+                for _, _, candidate, _ in wave
+            )
+            for (i, params, _, key), outcome in zip(wave, outcomes):
+                record = {"params": params, "n_samples": n_samples, **outcome}
+                if record["status"] != "failed":
+                    cache.put(key, record)
+                records[i] = dict(record, cached=False)
+                seen.append(records[i])
+        
+        trials.extend(records)
+        log(
+            f"Ran {len(candidates)} candidates on "
+            f"{n_samples or max_samples} rows per fold ({len(candidates) - len(pending)} cached)"
+        )
+        return records
+    
+    def successive_halving(candidates: List[Dict[str, Any]], rungs: int) -> None:
+        """Keep the best 1/eta of the candidates while multiplying their rows by eta."""
+        for rung in range(rungs, -1, -1):
+            records = evaluate(candidates, int(max_samples / eta ** rung) if rung else None)
+            ranked = [t for t in _rank(records) if t["status"] == "complete"]
+            candidates = [t["params"] for t in ranked[:max(1, len(candidates) // eta)]]
+            if not candidates:
+                break
+    
+    if method == "grid":
+        evaluate(grid_candidates(space), None)
+    elif method == "random":
+        evaluate(sample_candidates(space, n_trials, rng), None)
+    elif method == "halving":
+        if all(not _is_range(spec) for spec in space.values()):
+            candidates = grid_candidates(space)
+        else:
+            candidates = sample_candidates(space, n_trials, rng)
+        rungs = min(max_rungs, int(math.log(max(1, len(candidates)), eta)))
+        successive_halving(candidates, rungs)
+    else:
+        for bracket in range(max_rungs, -1, -1):
+            n = math.ceil((max_rungs + 1) / (bracket + 1) * eta ** bracket)
+            successive_halving(sample_candidates(space, n, rng), bracket)
+    
+    # Only trials on all rows of every fold are eligible
+    final = [t for t in _rank(trials) if t["status"] == "complete" and t["n_samples"] is None]
+    if not final:
+        raise ValueError("No hyperparameter trial completed")
+    
+    return {
+        "method": method,
+        "best_params": final[0]["params"],
+        "best_score": final[0]["score"],
+        "trials": trials,
+        "n_trials": len(trials),
+        "cached_trials": sum(t["cached"] for t in trials),
+        "pruned_trials": sum(t["status"] == "pruned" for t in trials),
+        "failed_trials": sum(t["status"] == "failed" for t in trials),
+    }
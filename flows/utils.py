@@ -3,29 +3,220 @@ Utility functions for Prefect flows.
 """
 
 import os
+import shutil
 import json
+import hashlib
 import pandas as pd
 import numpy as np
 import requests
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Union, Tuple
+from typing import Dict, List, Any, Optional, Union, Tuple, Iterator
 from datetime import datetime
+from functools import lru_cache
 import joblib
+import pyarrow as pa
+import pyarrow.parquet as pq
 from prefect import task, get_run_logger
 from prefect.artifacts import create_markdown_artifact
-from prefect.context import get_run_context
+from prefect.context import get_run_context, TaskRunContext
+from prefect.tasks import task_input_hash
 
-from .config import RAW_DATA_DIR, PROCESSED_DATA_DIR, MODEL_DIR, DATASETS
+from .config import (
+    RAW_DATA_DIR,
+    PROCESSED_DATA_DIR,
+    MODEL_DIR,
+    DATASETS,
+    DOWNLOAD_SETTINGS,
+    STORAGE_SETTINGS,
+    CACHE_SETTINGS,
+)
+
+def _file_sha256(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    """
+    Compute the SHA-256 digest of a file without loading it into memory.
+    
+    Args:
+        path: Path to the file
+        chunk_size: Number of bytes to read at a time
+        
+    Returns:
+        Hex digest of the file contents
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _metadata_path(dataset_path: Path) -> Path:
+    """
+    Get the path of the sidecar metadata file for a downloaded dataset.
+    
+    Args:
+        dataset_path: Path to the dataset file
+        
+    Returns:
+        Path to the sidecar metadata file
+    """
+    return dataset_path.with_name(dataset_path.name + ".meta.json")
+
+
+def read_download_metadata(dataset_path: Path) -> Dict:
+    """
+    Read the cache metadata recorded for a downloaded dataset.
+    
+    Args:
+        dataset_path: Path to the dataset file
+        
+    Returns:
+        Dictionary with ETag, Last-Modified, size and hash (empty if unknown)
+    """
+    metadata_path = _metadata_path(dataset_path)
+    if not metadata_path.exists():
+        return {}
+    
+    try:
+        with open(metadata_path) as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def _write_download_metadata(dataset_path: Path, metadata: Dict) -> None:
+    """
+    Atomically write the sidecar metadata file for a downloaded dataset.
+    
+    Args:
+        dataset_path: Path to the dataset file
+        metadata: Metadata to record
+    """
+    metadata_path = _metadata_path(dataset_path)
+    tmp_path = metadata_path.with_name(metadata_path.name + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(metadata, f, indent=2)
+    os.replace(tmp_path, metadata_path)
+
+
+def _is_cached_copy_valid(dataset_path: Path, metadata: Dict) -> bool:
+    """
+    Check that a local dataset file still matches its recorded metadata.
+    
+    Args:
+        dataset_path: Path to the dataset file
+        metadata: Metadata recorded for the file
+        
+    Returns:
+        True if the file exists and has the recorded size
+    """
+    return dataset_path.exists() and metadata.get("size") == dataset_path.stat().st_size
+
+
+def _discard_partial_download(part_path: Path) -> None:
+    """
+    Delete a partial download file and the validator recorded for it.
+    
+    Args:
+        part_path: Path to the partial download file
+    """
+    part_path.unlink(missing_ok=True)
+    _metadata_path(part_path).unlink(missing_ok=True)
+
+
+def _stream_download(
+    url: str,
+    part_path: Path,
+    chunk_size: int,
+    timeout: int,
+    headers: Optional[Dict] = None,
+    verified: bool = False,
+) -> Tuple[requests.Response, int]:
+    """
+    Stream a URL into a partial file, resuming from its current size.
+    
+    A partial file is resumed with an ``If-Range`` request carrying the ETag
+    or Last-Modified time recorded when it was started, so a body that changed
+    upstream is sent again in full instead of being appended to the old
+    bytes. A partial file without a recorded validator is only resumed when
+    the caller verifies the result against a checksum.
+    
+    Args:
+        url: URL to download
+        part_path: Path to the partial download file
+        chunk_size: Number of bytes to write at a time
+        timeout: Request timeout in seconds
+        headers: Extra request headers (e.g. conditional GET headers)
+        verified: Whether the caller checks the finished file against a checksum
+        
+    Returns:
+        Tuple of the (closed) response and the number of bytes fetched
+    """
+    offset = part_path.stat().st_size if part_path.exists() else 0
+    validator = read_download_metadata(part_path).get("validator")
+    headers = dict(headers or {})
+    if offset and (validator or verified):
+        headers["Range"] = f"bytes={offset}-"
+        if validator:
+            headers["If-Range"] = validator
+    else:
+        # Nothing ties the partial file to the current body, so start over
+        offset = 0
+    
+    with requests.get(url, headers=headers, stream=True, timeout=timeout) as response:
+        if response.status_code == 304:
+            return response, 0
+        if response.status_code == 416 and offset:
+            # The range starts past the end of the current body, so the partial file is stale
+            _discard_partial_download(part_path)
+            headers.pop("Range")
+            headers.pop("If-Range", None)
+            return _stream_download(url, part_path, chunk_size, timeout, headers, verified)
+        response.raise_for_status()
+        
+        # Servers that ignore Range, or whose body changed, send the whole body again
+        mode = "ab" if offset and response.status_code == 206 else "wb"
+        if mode == "wb":
+            # If-Range needs a strong ETag; fall back to the Last-Modified time
+            etag = response.headers.get("ETag")
+            validator = etag if etag and not etag.startswith("W/") else response.headers.get("Last-Modified")
+            _write_download_metadata(part_path, {"url": url, "validator": validator})
+        
+        fetched = 0
+        with open(part_path, mode) as f:
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                f.write(chunk)
+                fetched += len(chunk)
+    
+    return response, fetched
 
 
 @task(retries=3, retry_delay_seconds=30)
-def download_dataset(dataset_name: str, force_download: bool = False) -> Path:
+def download_dataset(
+    dataset_name: str,
+    force_download: bool = False,
+    stream: Optional[bool] = None,
+    refresh: bool = False,
+) -> Path:
     """
     Download a dataset if it doesn't exist locally.
     
+    In streaming mode the body is written in chunks to a ``.part`` file,
+    interrupted downloads are resumed with an HTTP Range request that only
+    applies while the upstream body is unchanged (``If-Range``), the result
+    is checked against the configured ``sha256`` and then moved into place
+    atomically.
+    
+    The ETag, Last-Modified time, size and SHA-256 of each download are kept
+    in a ``.meta.json`` sidecar file. With ``refresh`` an existing file is
+    revalidated with a conditional GET and only re-downloaded if the server
+    reports a change; if the server cannot be reached, the cached copy is
+    used.
+    
     Args:
         dataset_name: Name of the dataset to download
         force_download: Whether to force download even if file exists
+        stream: Whether to stream the download (defaults to DOWNLOAD_SETTINGS)
+        refresh: Whether to revalidate an existing file against the server
         
     Returns:
         Path to the downloaded dataset
@@ -38,22 +229,97 @@ def download_dataset(dataset_name: str, force_download: bool = False) -> Path:
     dataset_config = DATASETS[dataset_name]
     filename = dataset_config["filename"]
     url = dataset_config["url"]
+    expected_sha256 = dataset_config.get("sha256")
+    
+    if stream is None:
+        stream = DOWNLOAD_SETTINGS["stream"]
     
     output_path = RAW_DATA_DIR / filename
+    part_path = output_path.with_name(output_path.name + ".part")
+    metadata = read_download_metadata(output_path)
     
     # Check if file already exists
-    if output_path.exists() and not force_download:
+    if output_path.exists() and not force_download and not refresh:
         logger.info(f"Dataset {dataset_name} already exists at {output_path}")
         return output_path
     
+    # Revalidate the cached copy instead of fetching it again
+    headers = {}
+    revalidating = refresh and not force_download and _is_cached_copy_valid(output_path, metadata)
+    if revalidating:
+        if metadata.get("etag"):
+            headers["If-None-Match"] = metadata["etag"]
+        if metadata.get("last_modified"):
+            headers["If-Modified-Since"] = metadata["last_modified"]
+    
     # Download the file
     logger.info(f"Downloading dataset {dataset_name} from {url}")
-    response = requests.get(url)
-    response.raise_for_status()
     
-    # Save the file
-    with open(output_path, "wb") as f:
-        f.write(response.content)
+    try:
+        if stream:
+            if force_download and not expected_sha256:
+                # Without a checksum a stale partial file cannot be trusted
+                _discard_partial_download(part_path)
+            elif part_path.exists():
+                logger.info(f"Found a partial download of {part_path.stat().st_size} bytes")
+                headers = {}
+        
+            response, fetched = _stream_download(
+                url,
+                part_path,
+                chunk_size=DOWNLOAD_SETTINGS["chunk_size"],
+                timeout=DOWNLOAD_SETTINGS["timeout_seconds"],
+                headers=headers,
+                verified=bool(expected_sha256),
+            )
+            logger.info(f"Fetched {fetched} bytes")
+        else:
+            response = requests.get(url, headers=headers, timeout=DOWNLOAD_SETTINGS["timeout_seconds"])
+            if response.status_code != 304:
+                response.raise_for_status()
+                with open(part_path, "wb") as f:
+                    f.write(response.content)
+    except requests.RequestException as e:
+        if not revalidating:
+            raise
+        # A refresh is best effort; an unreachable server must not fail a run with a good copy
+        logger.warning(f"Could not revalidate dataset {dataset_name}, using the cached copy: {e}")
+        return output_path
+    
+    if response.status_code == 304:
+        logger.info(f"Dataset {dataset_name} not modified since last download")
+        metadata["checked_at"] = datetime.now().isoformat()
+        _write_download_metadata(output_path, metadata)
+        return output_path
+    
+    # Verify the checksum before exposing the file
+    sha256 = _file_sha256(part_path, DOWNLOAD_SETTINGS["chunk_size"])
+    if expected_sha256 and sha256 != expected_sha256.lower():
+        _discard_partial_download(part_path)
+        raise ValueError(
+            f"Checksum mismatch for dataset {dataset_name}: "
+            f"expected {expected_sha256}, got {sha256}"
+        )
+    
+    # Move the file into place atomically
+    os.replace(part_path, output_path)
+    _discard_partial_download(part_path)
+    size = output_path.stat().st_size
+    
+    # Record cache metadata for conditional refreshes
+    _write_download_metadata(output_path, {
+        "url": url,
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "size": size,
+        "mtime": output_path.stat().st_mtime,
+        "sha256": sha256,
+        "downloaded_at": datetime.now().isoformat(),
+        "checked_at": datetime.now().isoformat(),
+    })
+    
+    if metadata.get("sha256") == sha256:
+        logger.info(f"Dataset {dataset_name} content unchanged")
     
     logger.info(f"Dataset {dataset_name} downloaded to {output_path}")
     
@@ -63,7 +329,8 @@ def download_dataset(dataset_name: str, force_download: bool = False) -> Path:
                 f"- **Name**: {dataset_name}\n"
                 f"- **Source**: {url}\n"
                 f"- **Destination**: {output_path}\n"
-                f"- **Size**: {len(response.content) / 1024:.2f} KB\n"
+                f"- **Size**: {size / 1024:.2f} KB\n"
+                f"- **SHA-256**: {sha256}\n"
                 f"- **Timestamp**: {datetime.now().isoformat()}",
         key=f"dataset-download-{dataset_name}",
     )
@@ -71,34 +338,198 @@ def download_dataset(dataset_name: str, force_download: bool = False) -> Path:
     return output_path
 
 
-@task
-def load_dataset(dataset_path: Path) -> pd.DataFrame:
+def read_dataset(dataset_path: Path, columns: Optional[List[str]] = None) -> pd.DataFrame:
     """
-    Load a dataset from a file.
+    Read a dataset file, choosing the reader from the file extension.
     
     Args:
         dataset_path: Path to the dataset file
+        columns: Columns to read (all columns if None)
         
     Returns:
         Loaded DataFrame
     """
-    logger = get_run_logger()
-    logger.info(f"Loading dataset from {dataset_path}")
-    
-    # Determine file type from extension
+    dataset_path = Path(dataset_path)
     file_extension = dataset_path.suffix.lower()
     
     if file_extension == ".csv":
-        df = pd.read_csv(dataset_path)
+        df = pd.read_csv(dataset_path, usecols=columns)
     elif file_extension in [".xlsx", ".xls"]:
-        df = pd.read_excel(dataset_path)
+        df = pd.read_excel(dataset_path, usecols=columns)
     elif file_extension == ".json":
         df = pd.read_json(dataset_path)
+        if columns is not None:
+            df = df[columns]
     elif file_extension == ".parquet":
-        df = pd.read_parquet(dataset_path)
+        df = pd.read_parquet(dataset_path, columns=columns)
     else:
         raise ValueError(f"Unsupported file format: {file_extension}")
     
+    return df
+
+
+def iter_dataset_chunks(
+    dataset_path: Path,
+    chunksize: int,
+    columns: Optional[List[str]] = None,
+    dtype: Optional[Dict[str, str]] = None,
+    start_offset: int = 0,
+) -> Iterator[pd.DataFrame]:
+    """
+    Read a dataset file in row batches.
+    
+    Args:
+        dataset_path: Path to the dataset file (CSV or Parquet)
+        chunksize: Number of rows per batch
+        columns: Columns to read (all columns if None)
+        dtype: Column dtypes to enforce (CSV only)
+        start_offset: Byte offset of the first data row to read (CSV only);
+            the header is always taken from the start of the file
+        
+    Yields:
+        DataFrame for each batch of rows
+    """
+    dataset_path = Path(dataset_path)
+    file_extension = dataset_path.suffix.lower()
+    
+    if file_extension == ".csv" and start_offset:
+        with open(dataset_path, "rb") as f:
+            header = pd.read_csv(f, nrows=0).columns.tolist()
+            f.seek(start_offset)
+            with pd.read_csv(
+                f, header=None, names=header, chunksize=chunksize, usecols=columns, dtype=dtype
+            ) as reader:
+                yield from reader
+    elif file_extension == ".csv":
+        with pd.read_csv(dataset_path, chunksize=chunksize, usecols=columns, dtype=dtype) as reader:
+            yield from reader
+    elif file_extension == ".parquet" and not start_offset:
+        parquet_file = pq.ParquetFile(dataset_path)
+        for batch in parquet_file.iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+    else:
+        raise ValueError(f"Chunked reads are not supported for format: {file_extension}")
+
+
+def dataset_content_hash(dataset_path: Path) -> str:
+    """
+    Get the SHA-256 content hash of a dataset file.
+    
+    The hash recorded by download_dataset is reused when the file still has
+    the recorded size and modification time, so the file is only read when
+    it has no (or stale) metadata.
+    
+    Args:
+        dataset_path: Path to the dataset file
+        
+    Returns:
+        Hex digest of the file contents
+    """
+    dataset_path = Path(dataset_path)
+    metadata = read_download_metadata(dataset_path)
+    stat = dataset_path.stat()
+    
+    if (
+        metadata.get("sha256")
+        and metadata.get("size") == stat.st_size
+        and metadata.get("mtime") == stat.st_mtime
+    ):
+        return metadata["sha256"]
+    
+    return _file_sha256(dataset_path, DOWNLOAD_SETTINGS["chunk_size"])
+
+
+@lru_cache(maxsize=1)
+def _code_version() -> str:
+    """
+    Get a hash of the flow package source code and its configured version.
+    
+    Returns:
+        Hex digest identifying the current pipeline code
+    """
+    digest = hashlib.sha256(str(CACHE_SETTINGS["code_version"]).encode())
+    for source_path in sorted(Path(__file__).parent.glob("*.py")):
+        digest.update(source_path.read_bytes())
+    return digest.hexdigest()
+
+
+def frame_content_hash(data: Union[pd.DataFrame, pd.Series]) -> str:
+    """
+    Hash the contents of a DataFrame or Series.
+    
+    Rows are hashed with the vectorized pandas.util.hash_pandas_object
+    (including the index) and combined with the column names and dtypes, so
+    the data is read once and never serialized.
+    
+    Args:
+        data: DataFrame or Series to hash
+    
+    Returns:
+        Hex digest of the contents
+    
+    Raises:
+        TypeError: If the data holds unhashable values (e.g. lists)
+    """
+    if isinstance(data, pd.DataFrame):
+        schema = [list(map(str, data.columns)), list(map(str, data.dtypes))]
+    else:
+        schema = [str(data.name), str(data.dtype)]
+
+    digest = hashlib.sha256(json.dumps(schema).encode())
+    digest.update(pd.util.hash_pandas_object(data, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def content_cache_key(context: TaskRunContext, parameters: Dict[str, Any]) -> Optional[str]:
+    """
+    Build a task cache key from content hashes instead of raw inputs.
+    
+    DataFrame and Series arguments contribute a hash of their contents
+    computed when the task is called (see frame_content_hash) and Path
+    arguments the hash of the file they point to, so large inputs never have
+    to be serialized and frames changed in place get a new key. The key also
+    covers the task name, the flow code version and all other arguments.
+    Falls back to task_input_hash for frames holding unhashable values.
+    
+    Args:
+        context: Prefect task run context
+        parameters: Task parameters
+        
+    Returns:
+        Cache key for the task run
+    """
+    parts = [context.task.name, _code_version()]
+    
+    for name, value in sorted(parameters.items()):
+        if isinstance(value, (pd.DataFrame, pd.Series)):
+            try:
+                parts.append(f"{name}={frame_content_hash(value)}")
+            except TypeError:
+                return task_input_hash(context, parameters)
+        elif isinstance(value, Path) and value.is_file():
+            parts.append(f"{name}={dataset_content_hash(value)}")
+        else:
+            parts.append(f"{name}={json.dumps(value, sort_keys=True, default=str)}")
+    
+    return hashlib.sha256("|".join(parts).encode()).hexdigest()
+
+
+@task
+def load_dataset(dataset_path: Path) -> pd.DataFrame:
+    """
+    Load a dataset from a file.
+    
+    Args:
+        dataset_path: Path to the dataset file
+        
+    Returns:
+        Loaded DataFrame
+    """
+    logger = get_run_logger()
+    logger.info(f"Loading dataset from {dataset_path}")
+    
+    df = read_dataset(dataset_path)
+    
     logger.info(f"Loaded dataset with shape {df.shape}")
     
     # Create artifact
@@ -114,8 +545,175 @@ def load_dataset(dataset_path: Path) -> pd.DataFrame:
     return df
 
 
+def processed_dataset_path(
+    dataset_name: str,
+    suffix: str = "processed",
+    file_format: Optional[str] = None,
+) -> Path:
+    """
+    Get the path of a processed dataset file.
+    
+    Args:
+        dataset_name: Name of the dataset
+        suffix: Suffix of the processed file (e.g. train, val, test)
+        file_format: Storage format (defaults to STORAGE_SETTINGS)
+        
+    Returns:
+        Path to the processed dataset file
+    """
+    file_format = file_format or STORAGE_SETTINGS["format"]
+    return PROCESSED_DATA_DIR / f"{dataset_name}_{suffix}.{file_format}"
+
+
+def read_processed_dataset(
+    dataset_name: str,
+    suffix: str = "processed",
+    dataset_path: Optional[Path] = None,
+    columns: Optional[List[str]] = None,
+) -> pd.DataFrame:
+    """
+    Read a processed dataset written by save_dataset.
+    
+    Falls back to a CSV file written before the configured format changed.
+    
+    Args:
+        dataset_name: Name of the dataset
+        suffix: Suffix of the processed file (e.g. train, val, test)
+        dataset_path: Explicit path to the file (overrides the default path)
+        columns: Columns to read (all columns if None)
+        
+    Returns:
+        Loaded DataFrame
+    """
+    if dataset_path is None:
+        dataset_path = processed_dataset_path(dataset_name, suffix)
+        legacy_path = processed_dataset_path(dataset_name, suffix, file_format="csv")
+        if not dataset_path.exists() and legacy_path.exists():
+            dataset_path = legacy_path
+    
+    dataset_path = Path(dataset_path)
+    if not dataset_path.exists():
+        raise FileNotFoundError(f"Dataset file not found: {dataset_path}")
+    
+    return read_dataset(dataset_path, columns=columns)
+
+
+class DatasetWriter:
+    """
+    Incrementally write DataFrame batches to a processed dataset file.
+    
+    Batches are written to a temporary file that is moved into place when the
+    writer is closed, so readers never see a partially written split. All
+    batches must share the schema of the first one. In append mode the new
+    file starts with the rows of the existing one.
+    
+    The file is a processed dataset split unless an explicit path is given,
+    in which case the format is taken from its extension.
+    """
+    
+    def __init__(
+        self,
+        dataset_name: Optional[str] = None,
+        suffix: Optional[str] = None,
+        file_format: Optional[str] = None,
+        append: bool = False,
+        path: Optional[Union[str, Path]] = None,
+    ):
+        if path is not None:
+            file_format = file_format or Path(path).suffix.lstrip(".").lower()
+        self.file_format = file_format or STORAGE_SETTINGS["format"]
+        if self.file_format not in ("parquet", "csv"):
+            raise ValueError(f"Unsupported storage format: {self.file_format}")
+        
+        if path is not None:
+            self.path = Path(path)
+        else:
+            self.path = processed_dataset_path(dataset_name, suffix, self.file_format)
+        self.part_path = self.path.with_name(self.path.name + ".part")
+        self.rows = 0
+        self._parquet_writer = None
+        self._schema = None
+        
+        if self.part_path.exists():
+            self.part_path.unlink()
+        if append and self.path.exists():
+            self._copy_existing()
+    
+    def _copy_existing(self) -> None:
+        """Start the new file with the rows of the existing one."""
+        if self.file_format == "parquet":
+            # Row groups are copied as-is, without decoding to pandas
+            existing = pq.ParquetFile(self.path)
+            self._schema = existing.schema_arrow
+            self._parquet_writer = pq.ParquetWriter(
+                self.part_path, self._schema, compression=STORAGE_SETTINGS["compression"]
+            )
+            for i in range(existing.num_row_groups):
+                self._parquet_writer.write_table(existing.read_row_group(i))
+        else:
+            shutil.copyfile(self.path, self.part_path)
+    
+    def write(self, df: pd.DataFrame) -> None:
+        """
+        Append a batch of rows to the dataset.
+        
+        Args:
+            df: Batch of rows to write
+        """
+        if self.file_format == "parquet":
+            if self._parquet_writer is None:
+                self._schema = pa.Schema.from_pandas(df, preserve_index=False)
+                self._parquet_writer = pq.ParquetWriter(
+                    self.part_path, self._schema, compression=STORAGE_SETTINGS["compression"]
+                )
+            table = pa.Table.from_pandas(df, schema=self._schema, preserve_index=False)
+            self._parquet_writer.write_table(table)
+        else:
+            header = not self.part_path.exists()
+            df.to_csv(self.part_path, mode="a", header=header, index=False)
+        
+        self.rows += len(df)
+    
+    def close(self) -> Path:
+        """
+        Finish writing and move the file into place.
+        
+        Returns:
+            Path to the written dataset
+        """
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+        elif not self.part_path.exists():
+            # No rows were written; still produce an empty file
+            self.part_path.touch()
+        
+        os.replace(self.part_path, self.path)
+        return self.path
+    
+    def abort(self) -> None:
+        """Discard everything written so far."""
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+        if self.part_path.exists():
+            self.part_path.unlink()
+    
+    def __enter__(self) -> "DatasetWriter":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
 @task
-def save_dataset(df: pd.DataFrame, dataset_name: str, suffix: str = "processed") -> Path:
+def save_dataset(
+    df: pd.DataFrame,
+    dataset_name: str,
+    suffix: str = "processed",
+    file_format: Optional[str] = None,
+) -> Path:
     """
     Save a DataFrame to a file.
     
@@ -123,25 +721,32 @@ def save_dataset(df: pd.DataFrame, dataset_name: str, suffix: str = "processed")
         df: DataFrame to save
         dataset_name: Name of the dataset
         suffix: Suffix to add to the filename
+        file_format: Storage format, "parquet" or "csv" (defaults to STORAGE_SETTINGS)
         
     Returns:
         Path to the saved dataset
     """
     logger = get_run_logger()
     
-    # Create filename
-    filename = f"{dataset_name}_{suffix}.csv"
-    output_path = PROCESSED_DATA_DIR / filename
+    file_format = file_format or STORAGE_SETTINGS["format"]
+    output_path = processed_dataset_path(dataset_name, suffix, file_format)
     
     logger.info(f"Saving dataset to {output_path}")
-    df.to_csv(output_path, index=False)
+    if file_format == "parquet":
+        df.to_parquet(output_path, index=False, compression=STORAGE_SETTINGS["compression"])
+    elif file_format == "csv":
+        df.to_csv(output_path, index=False)
+    else:
+        raise ValueError(f"Unsupported storage format: {file_format}")
     
     # Create artifact
     create_markdown_artifact(
         markdown=f"## Dataset Saved\n\n"
                 f"- **Name**: {dataset_name}\n"
                 f"- **Path**: {output_path}\n"
+                f"- **Format**: {file_format}\n"
                 f"- **Shape**: {df.shape}\n"
+                f"- **Size**: {output_path.stat().st_size / 1024:.2f} KB\n"
                 f"- **Timestamp**: {datetime.now().isoformat()}",
         key=f"dataset-save-{dataset_name}-{suffix}",
     )
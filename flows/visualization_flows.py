@@ -25,6 +25,7 @@ from datetime import timedelta
 from .config import VISUALIZATION_FLOW, DATASETS
 from .utils import (
     load_dataset,
+    read_processed_dataset,
     log_flow_run_info,
 )
 
@@ -48,19 +49,13 @@ def load_data_for_visualization(
     """
     logger = get_run_logger()
     
-    if dataset_path is None:
-        if dataset_type == "raw":
-            dataset_path = Path(f"data/raw/{DATASETS[dataset_name]['filename']}")
-        else:
-            dataset_path = Path(f"data/processed/{dataset_name}_{dataset_type}.csv")
+    if dataset_path is None and dataset_type == "raw":
+        dataset_path = Path(f"data/raw/{DATASETS[dataset_name]['filename']}")
     
-    logger.info(f"Loading {dataset_name} data from {dataset_path}")
-    
-    if not dataset_path.exists():
-        raise FileNotFoundError(f"Dataset file not found: {dataset_path}")
+    logger.info(f"Loading {dataset_name} data from {dataset_path or dataset_type + ' split'}")
     
     # Load the dataset
-    df = pd.read_csv(dataset_path)
+    df = read_processed_dataset(dataset_name, dataset_type, dataset_path=dataset_path)
     
     logger.info(f"Loaded data with shape: {df.shape}")
     
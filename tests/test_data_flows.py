@@ -0,0 +1,181 @@
+"""
+Tests for the chunked and incremental data processing tasks.
+"""
+
+import os
+import tempfile
+import unittest
+from contextlib import ExitStack
+from pathlib import Path
+from unittest import mock
+import numpy as np
+import pandas as pd
+from prefect.logging import disable_run_logger
+from flows import data_flows
+from flows.config import STORAGE_SETTINGS
+from flows.data_flows import (
+    _appended_rows_fit,
+    _mark_seen_rows,
+    load_and_process_data,
+    process_dataset_chunks,
+    read_watermark,
+    split_dataset,
+)
+from flows.utils import read_processed_dataset
+
+# Tasks load_and_process_data calls, run directly in tests
+FLOW_TASKS = [
+    "download_dataset",
+    "compute_chunk_statistics",
+    "load_dataset",
+    "analyze_dataset",
+    "clean_dataset",
+    "transform_dataset",
+    "split_dataset",
+    "save_dataset",
+]
+
+
+def churn_rows(ids):
+    """Build raw customer churn rows with deterministic values for the given ids."""
+    ids = np.asarray(ids)
+    return pd.DataFrame({
+        "customerID": [f"C{i:04d}" for i in ids],
+        "tenure": ids % 72 + 1,
+        "Contract": np.array(["Month-to-month", "One year", "Two year"])[ids % 3],
+        "Partner": np.where(ids % 2 == 0, "Yes", "No"),
+        "MonthlyCharges": np.round(20 + ids % 50 * 1.5, 2),
+        "TotalCharges": [" " if i % 37 == 0 else f"{(i % 72 + 1) * 30.0:.1f}" for i in ids],
+        "Churn": np.where(ids % 4 == 0, "Yes", "No"),
+    })
+
+
+class TestChunkedProcessing(unittest.TestCase):
+    """Test cases for chunked and incremental processing of the raw churn file."""
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+        os.makedirs("data/raw")
+        os.makedirs("data/processed")
+        self.raw_path = Path("data/raw/customer_churn.csv")
+        
+        self.enterContext(disable_run_logger())
+        self.enterContext(mock.patch("flows.data_flows.create_markdown_artifact"))
+        self.enterContext(mock.patch("flows.utils.create_markdown_artifact"))
+    
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+    
+    def process(self, incremental=False, chunksize=40):
+        """
+        Run load_and_process_data on the raw file with its tasks called directly.
+        
+        Returns the arguments process_dataset_chunks was called with (None for
+        in-memory runs).
+        """
+        with ExitStack() as stack:
+            for name in FLOW_TASKS:
+                stack.enter_context(mock.patch(f"flows.data_flows.{name}", getattr(data_flows, name).fn))
+            chunks = stack.enter_context(
+                mock.patch("flows.data_flows.process_dataset_chunks", wraps=process_dataset_chunks.fn)
+            )
+            stack.enter_context(mock.patch("flows.data_flows.log_flow_run_info"))
+            
+            load_and_process_data.fn("customer_churn", refresh=False, chunksize=chunksize, incremental=incremental)
+        
+        return chunks.call_args.kwargs if chunks.called else None
+    
+    def processed_splits(self):
+        """Read each split file back ordered by customer."""
+        return {
+            name: read_processed_dataset("customer_churn", name).sort_values("customerID").reset_index(drop=True)
+            for name in ["train", "val", "test"]
+        }
+    
+    def processed_rows(self):
+        """Read all split files back as one frame ordered by customer."""
+        return pd.concat(self.processed_splits().values()).sort_values("customerID").reset_index(drop=True)
+    
+    def test_mark_seen_rows(self):
+        """Test that only the first occurrence of unseen hashes is kept."""
+        seen = np.empty(0, dtype=np.uint64)
+        keep, seen = _mark_seen_rows(np.array([5, 3, 5, 9], dtype=np.uint64), seen)
+        self.assertEqual(keep.tolist(), [True, True, False, True])
+        
+        keep, seen = _mark_seen_rows(np.array([9, 1, 20, 1, 3], dtype=np.uint64), seen)
+        self.assertEqual(keep.tolist(), [False, True, True, False, False])
+        self.assertEqual(seen.tolist(), [1, 3, 5, 9, 20])
+    
+    def test_chunked_matches_full(self):
+        """Test that chunked processing writes the splits, rows and dtypes of in-memory processing."""
+        churn_rows(list(range(300)) + list(range(0, 300, 7))).to_csv(self.raw_path, index=False)
+        
+        self.assertIsNone(self.process(chunksize=None))
+        expected = self.processed_splits()
+        self.assertEqual(sum(map(len, expected.values())), 300)
+        
+        self.process(chunksize=64)
+        for name, split in self.processed_splits().items():
+            pd.testing.assert_frame_equal(split, expected[name])
+    
+        # Class labels are not stratified either, since chunks cannot be ranked by class
+        df = pd.concat(expected.values(), ignore_index=True)
+        labels = df.assign(Churn=df["Churn"].map({1: "Yes", 0: "No"}))
+        unstratified = split_dataset.fn(df, "customer_churn", return_indices=True)
+        for name, index in split_dataset.fn(labels, "customer_churn", return_indices=True).items():
+            np.testing.assert_array_equal(index, unstratified[name])
+    
+    def test_incremental_drops_rows_seen_in_earlier_runs(self):
+        """Test that appended rows repeating rows of an earlier run are dropped."""
+        churn_rows(list(range(200)) + list(range(10))).to_csv(self.raw_path, index=False)
+        self.assertFalse(self.process(incremental=True)["append"])
+        self.assertEqual(len(self.processed_rows()), 200)
+        
+        # Append new rows and rows already processed in the first run
+        churn_rows(range(190, 250)).to_csv(self.raw_path, mode="a", header=False, index=False)
+        self.assertTrue(self.process(incremental=True)["append"])
+        
+        rows = self.processed_rows()
+        self.assertEqual(len(rows), 250)
+        self.assertTrue(rows["customerID"].is_unique)
+        
+        # Without the stored row hashes the dataset is reprocessed in full
+        os.remove("data/processed/customer_churn_row_hashes.npy")
+        self.assertIsNone(read_watermark(self.raw_path, "customer_churn"))
+
+    def test_watermark(self):
+        """Test that watermarks resume appended files and are dropped for rewritten ones."""
+        churn_rows(range(200)).to_csv(self.raw_path, index=False)
+        self.process(incremental=True)
+        size = self.raw_path.stat().st_size
+        
+        churn_rows(range(200, 230)).to_csv(self.raw_path, mode="a", header=False, index=False)
+        watermark = read_watermark(self.raw_path, "customer_churn")
+        self.assertEqual(watermark["offset"], size)
+        self.assertTrue(_appended_rows_fit(self.raw_path, watermark, 40))
+        self.assertEqual(self.process(incremental=True)["start_offset"], size)
+        
+        # Appending in two runs gives the rows of one full run
+        incremental = self.processed_rows()
+        self.process()
+        pd.testing.assert_frame_equal(incremental, self.processed_rows())
+        
+        # Rows that do not fit the stored dtype plan need a full reprocess
+        rows = churn_rows(range(230, 240)).assign(Contract="Weekly")
+        rows.to_csv(self.raw_path, mode="a", header=False, index=False)
+        self.assertFalse(_appended_rows_fit(self.raw_path, read_watermark(self.raw_path, "customer_churn"), 40))
+        
+        # A rewritten file or a changed storage format invalidates the watermark
+        with mock.patch.dict(STORAGE_SETTINGS, {"format": "csv"}):
+            self.assertIsNone(read_watermark(self.raw_path, "customer_churn"))
+        churn_rows(range(1, 240)).to_csv(self.raw_path, index=False)
+        self.assertIsNone(read_watermark(self.raw_path, "customer_churn"))
+        churn_rows(range(10)).to_csv(self.raw_path, index=False)
+        self.assertIsNone(read_watermark(self.raw_path, "customer_churn"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+"""
+Tests for the bulk database loader used by the ETL flows.
+"""
+
+import unittest
+from unittest import mock
+import pandas as pd
+from sqlalchemy import create_engine, inspect
+from flows.database import _merge_from_staging, bulk_load, dispose_engines, get_engine, insert_strategy
+
+
+class TestDatabase(unittest.TestCase):
+    """Test cases for bulk database loading against SQLite."""
+    
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        self.df = pd.DataFrame({
+            "customer_id": ["a", "b", "c"],
+            "tenure": [1, 12, 24],
+            "churn": [0, 1, 0],
+        })
+    
+    def tearDown(self):
+        self.engine.dispose()
+    
+    def read(self):
+        with self.engine.connect() as connection:
+            return pd.read_sql("SELECT * FROM churn ORDER BY customer_id", connection)
+    
+    def test_replace_and_append(self):
+        """Test plain bulk loads."""
+        with self.engine.begin() as connection:
+            self.assertEqual(insert_strategy(connection, 3)["method"], None)
+            bulk_load(self.df, "churn", connection)
+            bulk_load(self.df, "churn", connection, if_exists="append")
+        
+        self.assertEqual(len(self.read()), 6)
+    
+    def test_upsert(self):
+        """Test that upserts replace rows by key and append new keys."""
+        with self.engine.begin() as connection:
+            bulk_load(self.df, "churn", connection, if_exists="upsert", key_columns=["customer_id"])
+        
+        update = pd.DataFrame({
+            "customer_id": ["c", "d", "d"],
+            "tenure": [36, 2, 3],
+            "churn": [1, 0, 1],
+        })
+        with self.engine.begin() as connection:
+            bulk_load(update, "churn", connection, if_exists="upsert", key_columns=["customer_id"])
+        
+        result = self.read()
+        self.assertEqual(result["customer_id"].tolist(), ["a", "b", "c", "d"])
+        self.assertEqual(result["tenure"].tolist(), [1, 12, 36, 3])
+        
+        with self.assertRaises(ValueError):
+            with self.engine.begin() as connection:
+                bulk_load(update, "churn", connection, if_exists="upsert")
+    
+    def test_upsert_staging_is_private(self):
+        """Test that upserts stage rows in their own table and drop it afterwards."""
+        with self.engine.begin() as connection:
+            bulk_load(self.df, "churn", connection, if_exists="upsert", key_columns=["customer_id"])
+            # Rows another load staged under the old fixed name must not be merged or dropped
+            self.df.assign(tenure=0).to_sql("churn__staging", connection, index=False)
+            
+            with mock.patch("flows.database._merge_from_staging", wraps=_merge_from_staging) as merge:
+                bulk_load(self.df.iloc[:1], "churn", connection, if_exists="upsert", key_columns=["customer_id"])
+            staging_name = merge.call_args.args[2]
+            self.assertTrue(staging_name.startswith("churn__staging_"))
+            self.assertEqual(sorted(inspect(connection).get_table_names()), ["churn", "churn__staging"])
+        
+        self.assertEqual(self.read()["tenure"].tolist(), [1, 12, 24])
+    
+    def test_failed_load_rolls_back(self):
+        """Test that a failing load leaves the table unchanged."""
+        with self.engine.begin() as connection:
+            bulk_load(self.df, "churn", connection, if_exists="upsert", key_columns=["customer_id"])
+        
+        with self.assertRaises(Exception):
+            with self.engine.begin() as connection:
+                bulk_load(self.df, "churn", connection, if_exists="append")
+        
+        self.assertEqual(len(self.read()), 3)
+    
+    
+    def test_engine_registry(self):
+        """Test that engines are shared per connection string."""
+        url = "sqlite:///:memory:"
+        engine = get_engine(url)
+        
+        self.assertIs(get_engine(url), engine)
+        self.assertIsNot(get_engine("sqlite://"), engine)
+        
+        dispose_engines()
+        self.assertIsNot(get_engine(url), engine)
+        dispose_engines()
+
+
+if __name__ == "__main__":
+    unittest.main()
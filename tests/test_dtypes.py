@@ -0,0 +1,81 @@
+"""
+Tests for the dtype planning used by the data cleaning flows.
+"""
+
+import unittest
+from unittest import mock
+import numpy as np
+import pandas as pd
+from flows.config import DTYPE_SETTINGS
+from flows.dtypes import (
+    apply_dtype_plan,
+    dtype_plan_fits,
+    merge_column_summaries,
+    plan_dtypes,
+    plan_dtypes_for_frame,
+    summarize_columns,
+)
+
+
+class TestDtypes(unittest.TestCase):
+    """Test cases for dtype planning."""
+    
+    def setUp(self):
+        self.df = pd.DataFrame({
+            "tenure": np.arange(100) % 72,
+            "charges": np.arange(100) * 0.1,
+            "partner": ["Yes", "No"] * 50,
+            "contract": ["Month-to-month", "One year", "Two year", "One year"] * 25,
+            "customer_id": [f"id-{i}" for i in range(100)],
+        })
+    
+    def test_plan_is_lossless(self):
+        """Test that planned conversions keep every value."""
+        plan = plan_dtypes_for_frame(self.df)
+        
+        self.assertEqual(plan["tenure"], "int32")
+        self.assertEqual(plan["partner"], "boolean")
+        self.assertEqual(plan["contract"], {"categories": ["Month-to-month", "One year", "Two year"]})
+        self.assertNotIn("charges", plan)
+        self.assertNotIn("customer_id", plan)
+        
+        converted = apply_dtype_plan(self.df, plan)
+        self.assertTrue((converted["tenure"] == self.df["tenure"]).all())
+        self.assertTrue((converted["partner"] == (self.df["partner"] == "Yes")).all())
+        self.assertTrue((converted["contract"].astype(str) == self.df["contract"]).all())
+        self.assertLess(
+            converted.memory_usage(deep=True).sum(), self.df.memory_usage(deep=True).sum()
+        )
+    
+    def test_narrow_integers_are_opt_in(self):
+        """Test that integers keep room for arithmetic unless narrow widths are enabled."""
+        converted = apply_dtype_plan(self.df, plan_dtypes_for_frame(self.df))
+        self.assertEqual(int((converted["tenure"] * 1000).max()), 71000)
+        
+        with mock.patch.dict(DTYPE_SETTINGS, {"min_integer_dtype": "int8"}):
+            self.assertEqual(plan_dtypes_for_frame(self.df)["tenure"], "int8")
+    
+    def test_chunked_summaries_match(self):
+        """Test that merged chunk summaries give the same plan as the whole frame."""
+        summary = None
+        for start in range(0, len(self.df), 30):
+            summary = merge_column_summaries(summary, summarize_columns(self.df.iloc[start:start + 30]))
+        
+        self.assertEqual(plan_dtypes(summary, len(self.df)), plan_dtypes_for_frame(self.df))
+    
+    def test_plan_fits_new_rows(self):
+        """Test that new categories or out-of-range values do not fit a plan."""
+        plan = plan_dtypes_for_frame(self.df)
+        
+        same = self.df.iloc[:10]
+        self.assertTrue(dtype_plan_fits(plan, summarize_columns(same)))
+        
+        new_category = same.assign(contract="Three year")
+        self.assertFalse(dtype_plan_fits(plan, summarize_columns(new_category)))
+        
+        out_of_range = same.assign(tenure=2 ** 40)
+        self.assertFalse(dtype_plan_fits(plan, summarize_columns(out_of_range)))
+
+
+if __name__ == "__main__":
+    unittest.main()
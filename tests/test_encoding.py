@@ -0,0 +1,80 @@
+"""
+Tests for the bulk encoders used by the transformation flows.
+"""
+
+import unittest
+import numpy as np
+import pandas as pd
+from flows.encoding import detect_binary_columns, encode_binary_columns, one_hot_encode
+
+
+class TestEncoding(unittest.TestCase):
+    """Test cases for binary column encoding."""
+    
+    def setUp(self):
+        self.df = pd.DataFrame({
+            "partner": ["Yes", "No", "No", "Yes"],
+            "dependents": ["No", None, "Yes", "No"],
+            "contract": ["Month-to-month", "One year", "Two year", "One year"],
+            "tenure": [1, 12, 24, 36],
+            "churn": pd.array([True, False, None, True], dtype="boolean"),
+        })
+    
+    def test_detect_binary_columns(self):
+        """Test that only Yes/No object columns are detected."""
+        self.assertEqual(detect_binary_columns(self.df), ["partner", "dependents"])
+        self.assertEqual(detect_binary_columns(self.df, columns=["contract", "tenure"]), [])
+    
+    def test_encode_matches_map(self):
+        """Test that bulk encoding matches mapping each column separately."""
+        expected = {
+            col: self.df[col].map({"Yes": 1, "No": 0})
+            for col in ["partner", "dependents"]
+        }
+        encoded = encode_binary_columns(self.df.copy())
+        
+        self.assertEqual(encoded["partner"].dtype, np.int8)
+        self.assertEqual(encoded["dependents"].dtype, "Int8")
+        for col, values in expected.items():
+            self.assertEqual(encoded[col].astype("Float64").tolist(), values.astype("Float64").tolist())
+    
+    def test_encode_boolean_output(self):
+        """Test boolean output and conversion of existing boolean columns."""
+        encoded = encode_binary_columns(
+            self.df.copy(), columns=["partner", "churn", "tenure"], output="boolean"
+        )
+        
+        self.assertEqual(encoded["partner"].tolist(), [True, False, False, True])
+        self.assertEqual(encoded["churn"].dtype, "boolean")
+        self.assertEqual(encoded["tenure"].tolist(), [1, 12, 24, 36])
+        
+        with self.assertRaises(ValueError):
+            encode_binary_columns(self.df.copy(), output="float")
+    
+    
+    def test_one_hot_matches_get_dummies(self):
+        """Test that batched one-hot encoding matches pd.get_dummies."""
+        columns = ["contract", "dependents"]
+        expected = pd.get_dummies(self.df, columns=columns, prefix=columns)
+        
+        pd.testing.assert_frame_equal(one_hot_encode(self.df, columns), expected)
+        
+        encoded = one_hot_encode(self.df, columns, dtype="uint8", sparse=True)
+        self.assertTrue(all(isinstance(dtype, pd.SparseDtype) for dtype in encoded.dtypes[-5:]))
+        np.testing.assert_array_equal(
+            encoded.iloc[:, -5:].sparse.to_dense().to_numpy(), expected.iloc[:, -5:].to_numpy()
+        )
+    
+    def test_one_hot_fixed_vocabulary(self):
+        """Test that a fixed vocabulary gives every batch the same columns."""
+        vocabulary = {"contract": ["Month-to-month", "One year", "Two year", "Three year"]}
+        first = one_hot_encode(self.df.iloc[:1], ["contract"], categories=vocabulary)
+        second = one_hot_encode(self.df.iloc[1:], ["contract"], categories=vocabulary)
+        
+        self.assertEqual(list(first.columns), list(second.columns))
+        self.assertEqual(first.filter(like="contract_").sum(axis=1).tolist(), [1])
+        self.assertFalse(second["contract_Three year"].any())
+
+
+if __name__ == "__main__":
+    unittest.main()
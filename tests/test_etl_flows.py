@@ -0,0 +1,173 @@
+"""
+Tests for the ETL flow tasks.
+"""
+
+import http.server
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine
+from prefect.logging import disable_run_logger
+from flows.etl_flows import combine_sources, extract_data, stream_extract_transform_load, transform_data
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    """Serve the CSV files of a directory."""
+    
+    directory = None
+    
+    def do_GET(self):
+        path = os.path.join(self.directory, os.path.basename(self.path))
+        if not os.path.exists(path):
+            self.send_error(404)
+            return
+        
+        with open(path, "rb") as f:
+            body = f.read()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, *args):
+        pass
+
+
+class TestEtlFlows(unittest.TestCase):
+    """Test cases for ETL extraction, streaming and loading."""
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        cls.base = f"http://127.0.0.1:{cls.server.server_port}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        _Handler.directory = self.tmp.name
+        self.enterContext(disable_run_logger())
+        self.enterContext(mock.patch("flows.etl_flows.create_markdown_artifact"))
+        
+        rng = np.random.default_rng(0)
+        self.df = pd.DataFrame({
+            "customer_id": [f"C{i:04d}" for i in range(500)],
+            "tenure": rng.integers(0, 72, 500),
+            "charges": rng.normal(60, 20, 500).round(2),
+            "contract": rng.choice(["Month-to-month", "One year", "Two year"], 500),
+        })
+        self.source_path = self.path("customers.csv")
+        self.df.to_csv(self.source_path, index=False)
+        
+        self.transformations = [
+            {"type": "rename_columns", "mapping": {"charges": "monthly_charges"}},
+            {"type": "create_feature", "name": "total_charges", "expression": "tenure * monthly_charges"},
+            {"type": "filter_rows", "condition": "tenure > 6 and contract != 'Two year'"},
+            {"type": "drop_columns", "columns": ["customer_id"]},
+        ]
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def path(self, name):
+        return os.path.join(self.tmp.name, name)
+    
+    def expected(self):
+        """Extract and transform the source in memory."""
+        df = transform_data.fn(extract_data.fn("file", source_path=self.source_path), self.transformations)
+        return df.reset_index(drop=True)
+    
+    def test_streaming_matches_in_memory(self):
+        """Test that streamed file, URL and database loads hold the in-memory result."""
+        expected = self.expected()
+        
+        summary = stream_extract_transform_load.fn(
+            "file", "file", 64, self.transformations,
+            source_path=self.source_path, destination_path=self.path("out.parquet"),
+        )
+        self.assertEqual((summary["rows"], summary["chunks"]), (len(expected), 8))
+        pd.testing.assert_frame_equal(pd.read_parquet(self.path("out.parquet")), expected)
+        
+        stream_extract_transform_load.fn(
+            "url", "file", 100, self.transformations,
+            source_url=f"{self.base}/customers.csv", destination_path=self.path("out.csv"),
+        )
+        pd.testing.assert_frame_equal(pd.read_csv(self.path("out.csv")), expected)
+        
+        database = f"sqlite:///{self.path('out.db')}"
+        stream_extract_transform_load.fn(
+            "file", "database", 64, self.transformations,
+            source_path=self.source_path, destination_table="customers", destination_db=database,
+        )
+        engine = create_engine(database)
+        with engine.connect() as connection:
+            loaded = pd.read_sql("SELECT * FROM customers", connection)
+        engine.dispose()
+        pd.testing.assert_frame_equal(loaded, expected, check_dtype=False)
+    
+        # Replacing from a source without any chunks leaves an empty table
+        with mock.patch("flows.etl_flows.iter_source_chunks", return_value=iter(())):
+            summary = stream_extract_transform_load.fn(
+                "file", "database", 64, self.transformations,
+                source_path=self.source_path, destination_table="customers", destination_db=database,
+            )
+        self.assertEqual(summary["rows"], 0)
+        with engine.connect() as connection:
+            self.assertEqual(pd.read_sql("SELECT COUNT(*) AS n FROM customers", connection)["n"][0], 0)
+        engine.dispose()
+    
+    def test_streaming_failures(self):
+        """Test that non-row-local plans are rejected and failed loads leave no file."""
+        with self.assertRaises(ValueError):
+            stream_extract_transform_load.fn(
+                "file", "file", 64, [{"type": "fill_missing", "columns": ["tenure"], "method": "median"}],
+                source_path=self.source_path, destination_path=self.path("out.csv"),
+            )
+        
+        with self.assertRaises(Exception):
+            stream_extract_transform_load.fn(
+                "url", "file", 64, self.transformations,
+                source_url=f"{self.base}/missing.csv", destination_path=self.path("out.csv"),
+            )
+        self.assertFalse(os.path.exists(self.path("out.csv")))
+        self.assertFalse(os.path.exists(self.path("out.csv.part")))
+
+    def test_combine_sources(self):
+        """Test that file and URL sources are unioned or joined on a key."""
+        self.df.iloc[:300].to_csv(self.path("first.csv"), index=False)
+        self.df.iloc[300:].to_csv(self.path("rest.csv"), index=False)
+        billing = self.df[["customer_id", "charges"]].iloc[::2].assign(charges=lambda df: df["charges"] * 2)
+        billing.to_csv(self.path("billing.csv"), index=False)
+        
+        frames = [
+            extract_data.fn("file", source_path=self.path("first.csv")),
+            extract_data.fn("url", source_url=f"{self.base}/rest.csv"),
+        ]
+        union = combine_sources.fn(frames, ["first", "rest"])
+        pd.testing.assert_frame_equal(union, self.df)
+        
+        frames = [self.df, extract_data.fn("url", source_url=f"{self.base}/billing.csv")]
+        joined = combine_sources.fn(frames, ["customers", "billing"], combine="join", join_key="customer_id")
+        self.assertEqual(len(joined), 250)
+        np.testing.assert_allclose(joined["charges_billing"], joined["charges"] * 2)
+        
+        left = combine_sources.fn(frames, ["customers", "billing"], "join", "customer_id", join_how="left")
+        self.assertEqual(len(left), 500)
+        self.assertEqual(int(left["charges_billing"].isna().sum()), 250)
+        
+        with self.assertRaises(ValueError):
+            combine_sources.fn([self.df, billing.drop(columns="customer_id")], ["a", "b"], "join", "customer_id")
+        with self.assertRaises(ValueError):
+            combine_sources.fn(frames, ["a", "b"], combine="append")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+"""
+Tests for compiled expressions and registered UDFs.
+"""
+
+import re
+import unittest
+import numpy as np
+import pandas as pd
+from flows.expressions import compile_expression, register_udf
+from flows.transform_plan import check_streamable, compile_transformations, execute_plan
+
+
+class TestExpressions(unittest.TestCase):
+    """Test cases for the expression engine."""
+    
+    def setUp(self):
+        self.df = pd.DataFrame({
+            "tenure": [1, 12, 24, 36, 48],
+            "charges": [20.0, np.nan, 80.5, 99.9, 45.0],
+            "contract": ["Month-to-month", "One year", "Two year", "One year", "Two year"],
+            "monthly charges": [10.0, 20.0, 30.0, 40.0, 50.0],
+            "SeniorCitizen": [0, 1, 1, 1, 0],
+            "Churn": ["No", "Yes", "Yes", "No", "Yes"],
+        })
+    
+    def test_matches_pandas_eval(self):
+        """Test that compiled expressions give the df.eval results."""
+        for expression in [
+            "charges / tenure",
+            "tenure > 12 and charges < 90",
+            "not (tenure >= 24) or contract == 'Two year'",
+            "contract in ['One year', 'Two year']",
+            "12 <= tenure < 48",
+            "`monthly charges` * 2 - abs(tenure)",
+        ]:
+            result = compile_expression(expression).evaluate(self.df)
+            pd.testing.assert_series_equal(
+                pd.Series(result), pd.Series(self.df.eval(expression)), check_names=False
+            )
+    
+    def test_matches_pandas_query(self):
+        """Test that filters select the rows df.query selects."""
+        for condition in [
+            "tenure > 12 & SeniorCitizen == 1",
+            "tenure > 12 & Churn == 'Yes'",
+            "tenure < 12 | Churn == 'No'",
+            "~(tenure > 12) | SeniorCitizen == 1",
+            "(tenure > 1) & ~(charges > 50)",
+            "12 <= tenure < 48 & Churn != 'No'",
+            "tenure > 12 and not SeniorCitizen == 1 or Churn == 'No'",
+            "Churn == ['Yes']",
+            "contract != ['One year', 'Two year']",
+            "contract.str.len() > 8",
+            "charges > charges.mean()",
+        ]:
+            mask = compile_expression(condition).mask(self.df)
+            self.assertEqual(self.df.index[mask].tolist(), self.df.query(condition).index.tolist(), condition)
+    
+    def test_unsupported_constructs_are_named(self):
+        """Test that unsupported df.query features fail with a clear message."""
+        for expression, construct in [
+            ("tenure > @limit", "@name"),
+            ("contract.str.foo()", ".str.foo()"),
+            ("charges.to_csv()", ".to_csv()"),
+        ]:
+            with self.assertRaisesRegex(ValueError, re.escape(construct)):
+                compile_expression(expression)
+        
+        self.assertTrue(compile_expression("charges * 2").row_local)
+        self.assertFalse(compile_expression("charges > charges.mean()").row_local)
+    
+    def test_compiled_once(self):
+        """Test that compiled expressions are cached and report their columns."""
+        expression = compile_expression("tenure * `monthly charges`")
+        self.assertIs(compile_expression("tenure * `monthly charges`"), expression)
+        self.assertEqual(expression.columns, {"tenure", "monthly charges"})
+    
+    def test_rejects_code(self):
+        """Test that anything outside the expression grammar is rejected."""
+        for expression in ["__import__('os')", "tenure.real", "(lambda: 1)()", "tenure if charges else 0"]:
+            with self.assertRaises(ValueError):
+                compile_expression(expression)
+    
+    def test_large_powers_rejected(self):
+        """Test that constant exponents are folded and bounded when compiling."""
+        for expression in ["10 ** 10 ** 10", "charges ** (2 ** 20)", "((2 ** 100) ** 100) ** 100", "tenure > 7 ** -200"]:
+            with self.assertRaisesRegex(ValueError, "exponent|too large"):
+                compile_expression(expression)
+        
+        result = compile_expression("charges ** 2 + 2 ** 10").evaluate(self.df)
+        pd.testing.assert_series_equal(result, self.df["charges"] ** 2 + 1024)
+        self.assertEqual(compile_expression("-(2 ** 3) * 3").evaluate(self.df), -24)
+    
+    def test_udf_steps(self):
+        """Test that registered UDFs replace custom code steps."""
+        @register_udf("charges_per_year", row_local=True)
+        def charges_per_year(df, column):
+            df[f"{column}_per_year"] = df[column] * 12
+            return df
+        
+        plan = compile_transformations([
+            {"type": "udf", "name": "charges_per_year", "params": {"column": "charges"}},
+            {"type": "filter_rows", "condition": "charges_per_year > 1000"},
+        ])
+        check_streamable(plan)
+        result = execute_plan(self.df, plan)
+        self.assertEqual(result["tenure"].tolist(), [36])
+        
+        with self.assertRaises(ValueError):
+            compile_transformations([{"type": "custom_python", "code": "df = df.head()"}])
+        with self.assertRaises(ValueError):
+            compile_transformations([{"type": "udf", "name": "missing"}])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,283 @@
+"""
+Tests for flow utility functions.
+"""
+
+import hashlib
+import http.server
+import os
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+import pandas as pd
+import requests
+from prefect.logging import disable_run_logger
+from flows.config import DATASETS
+from flows.data_flows import analyze_dataset
+from flows.utils import (
+    _stream_download,
+    DatasetWriter,
+    content_cache_key,
+    download_dataset,
+    frame_content_hash,
+    read_processed_dataset,
+    save_dataset,
+)
+
+
+class _DatasetHandler(http.server.BaseHTTPRequestHandler):
+    """Serve one CSV body with an ETag, honoring Range, If-Range and conditional requests."""
+    
+    body = b""
+    requests = []
+    
+    def do_GET(self):
+        body = type(self).body
+        etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+        self.requests.append(dict(self.headers))
+        
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        
+        # A stale If-Range validator turns the range request into a full one
+        start = 0
+        if self.headers.get("Range") and self.headers.get("If-Range", etag) == etag:
+            start = int(self.headers["Range"].split("=")[1].rstrip("-"))
+        if start >= len(body) > 0:
+            self.send_response(416)
+            self.end_headers()
+            return
+        
+        self.send_response(206 if start else 200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body) - start))
+        self.end_headers()
+        self.wfile.write(body[start:])
+    
+    def log_message(self, *args):
+        pass
+
+
+class TestDownloadDataset(unittest.TestCase):
+    """Test cases for downloading raw datasets from a local server."""
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _DatasetHandler)
+        cls.url = f"http://127.0.0.1:{cls.server.server_port}/data.csv"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+        os.makedirs("data/raw")
+        self.path = Path("data/raw/test_data.csv")
+        
+        _DatasetHandler.body = b"a,b\n" + b"".join(b"%d,%d\n" % (i, i * 2) for i in range(20000))
+        _DatasetHandler.requests = []
+        self.config = {"filename": "test_data.csv", "url": self.url, "target": "b", "sha256": None}
+        self.enterContext(mock.patch.dict(DATASETS, {"test_data": self.config}))
+        self.enterContext(disable_run_logger())
+        self.enterContext(mock.patch("flows.utils.create_markdown_artifact"))
+    
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+    
+    def interrupt(self, size, body=None):
+        """Leave a partial download of a body cut (or zero-padded) to size bytes."""
+        body = _DatasetHandler.body if body is None else body
+        part_path = Path("data/raw/test_data.csv.part")
+        with mock.patch.object(_DatasetHandler, "body", body):
+            _stream_download(self.url, part_path, chunk_size=1024, timeout=5)
+        with open(part_path, "r+b") as f:
+            f.truncate(size)
+        return part_path
+    
+    def test_resume_with_range(self):
+        """Test that an interrupted download continues from the partial file."""
+        body = _DatasetHandler.body
+        self.interrupt(1000)
+        
+        self.assertEqual(download_dataset.fn("test_data"), self.path)
+        self.assertEqual(self.path.read_bytes(), body)
+        self.assertEqual(_DatasetHandler.requests[-1]["Range"], "bytes=1000-")
+        self.assertIn("If-Range", _DatasetHandler.requests[-1])
+        self.assertEqual(sorted(os.listdir("data/raw")), ["test_data.csv", "test_data.csv.meta.json"])
+    
+    def test_resume_checks_partial_file(self):
+        """Test that partial files of another body, or of unknown origin, are downloaded again."""
+        body = _DatasetHandler.body
+        
+        # The upstream file changed since the partial download started
+        self.interrupt(1000, body=body.replace(b"1", b"7"))
+        download_dataset.fn("test_data")
+        self.assertEqual(self.path.read_bytes(), body)
+        
+        # No validator was recorded and there is no checksum to catch a mismatch
+        os.remove(self.path)
+        Path("data/raw/test_data.csv.part").write_bytes(b"x,y\n" * 500)
+        download_dataset.fn("test_data")
+        self.assertNotIn("Range", _DatasetHandler.requests[-1])
+        self.assertEqual(self.path.read_bytes(), body)
+        
+        # A range past the end of the body means the partial file is stale
+        os.remove(self.path)
+        self.interrupt(len(body) + 10)
+        download_dataset.fn("test_data")
+        self.assertEqual(_DatasetHandler.requests[-2]["Range"], f"bytes={len(body) + 10}-")
+        self.assertNotIn("Range", _DatasetHandler.requests[-1])
+        self.assertEqual(self.path.read_bytes(), body)
+    
+    def test_sha256(self):
+        """Test that downloads are checked against the configured checksum."""
+        self.config["sha256"] = "0" * 64
+        with self.assertRaises(ValueError):
+            download_dataset.fn("test_data")
+        self.assertEqual(os.listdir("data/raw"), [])
+        
+        self.config["sha256"] = hashlib.sha256(_DatasetHandler.body).hexdigest().upper()
+        download_dataset.fn("test_data")
+        self.assertEqual(self.path.read_bytes(), _DatasetHandler.body)
+
+    def test_revalidation(self):
+        """Test that a refresh only downloads the dataset again if it changed."""
+        download_dataset.fn("test_data")
+        mtime = self.path.stat().st_mtime_ns
+        
+        download_dataset.fn("test_data", refresh=True)
+        self.assertIn("If-None-Match", _DatasetHandler.requests[-1])
+        self.assertEqual(self.path.stat().st_mtime_ns, mtime)
+        
+        _DatasetHandler.body += b"20000,40000\n"
+        download_dataset.fn("test_data", refresh=True)
+        self.assertEqual(self.path.read_bytes(), _DatasetHandler.body)
+        
+        # Without refresh the local copy is used as is
+        count = len(_DatasetHandler.requests)
+        download_dataset.fn("test_data")
+        self.assertEqual(len(_DatasetHandler.requests), count)
+
+    def test_revalidation_network_error(self):
+        """Test that a refresh falls back to the cached copy when the server is unreachable."""
+        error = requests.ConnectionError("connection refused")
+        with mock.patch("flows.utils.requests.get", side_effect=error):
+            with self.assertRaises(requests.ConnectionError):
+                download_dataset.fn("test_data", refresh=True)
+        
+        download_dataset.fn("test_data")
+        with mock.patch("flows.utils.requests.get", side_effect=error):
+            self.assertEqual(download_dataset.fn("test_data", refresh=True), self.path)
+            self.assertEqual(download_dataset.fn("test_data", refresh=True, stream=False), self.path)
+            with self.assertRaises(requests.ConnectionError):
+                download_dataset.fn("test_data", force_download=True)
+        self.assertEqual(self.path.read_bytes(), _DatasetHandler.body)
+
+
+class TestContentCacheKey(unittest.TestCase):
+    """Test cases for content-based task cache keys."""
+    
+    def setUp(self):
+        self.context = SimpleNamespace(task=analyze_dataset)
+        self.df = pd.DataFrame({"tenure": [1, 1, None, 24], "contract": ["a", "a", "b", "b"]})
+    
+    def key(self, df, dataset_name="customer_churn"):
+        return content_cache_key(self.context, {"df": df, "dataset_name": dataset_name})
+    
+    def test_key_follows_content(self):
+        """Test that frames with the same contents share a key and other arguments count."""
+        self.assertEqual(self.key(self.df), self.key(self.df.copy()))
+        self.assertNotEqual(self.key(self.df), self.key(self.df, "housing_prices"))
+    
+        for changed in [
+            self.df.drop_duplicates(),
+            self.df.fillna(0),
+            self.df.iloc[::-1],
+            self.df.astype({"contract": "category"}),
+            self.df.rename(columns={"contract": "plan"}),
+        ]:
+            self.assertNotEqual(self.key(changed), self.key(self.df))
+        
+    def test_in_place_changes_change_key(self):
+        """Test that the key is computed from the data at call time, not remembered."""
+        df = self.df.copy()
+        before = self.key(df)
+        df.loc[0, "tenure"] = 2
+        self.assertNotEqual(self.key(df), before)
+    
+        self.assertNotEqual(frame_content_hash(df["tenure"]), frame_content_hash(self.df["tenure"]))
+        self.assertEqual(frame_content_hash(df["contract"]), frame_content_hash(self.df["contract"]))
+        
+    def test_unhashable_values_fall_back(self):
+        """Test that frames holding unhashable values still get a key."""
+        df = pd.DataFrame({"tags": [["a"], ["b", "c"]]})
+        with self.assertRaises(TypeError):
+            frame_content_hash(df)
+        self.assertIsNotNone(self.key(df))
+
+
+class TestProcessedStorage(unittest.TestCase):
+    """Test cases for writing and reading processed dataset splits."""
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+        os.makedirs("data/processed")
+        self.enterContext(disable_run_logger())
+        self.enterContext(mock.patch("flows.utils.create_markdown_artifact"))
+        
+        self.df = pd.DataFrame({
+            "contract": pd.Categorical(["Month-to-month", "One year", "Two year", "One year"]),
+            "partner": pd.array([True, False, None, True], dtype="boolean"),
+            "tenure": pd.array([1, 12, 24, 72], dtype="int8"),
+            "charges": pd.array([29.85, 56.95, None, 42.3], dtype="float32"),
+        })
+    
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+    
+    def test_parquet_round_trip(self):
+        """Test that Parquet splits keep their values and compact dtypes."""
+        path = save_dataset.fn(self.df, "customer_churn", suffix="train")
+        self.assertEqual(path, Path("data/processed/customer_churn_train.parquet"))
+        
+        pd.testing.assert_frame_equal(read_processed_dataset("customer_churn", "train"), self.df)
+        pd.testing.assert_frame_equal(
+            read_processed_dataset("customer_churn", "train", columns=["tenure"]), self.df[["tenure"]]
+        )
+    
+    def test_writer_append(self):
+        """Test that an appending writer keeps the existing rows."""
+        with DatasetWriter("customer_churn", "train") as writer:
+            writer.write(self.df.iloc[:2])
+        with DatasetWriter("customer_churn", "train", append=True) as writer:
+            writer.write(self.df.iloc[2:])
+        
+        pd.testing.assert_frame_equal(read_processed_dataset("customer_churn", "train"), self.df)
+        self.assertEqual(os.listdir("data/processed"), ["customer_churn_train.parquet"])
+    
+    def test_csv_fallback(self):
+        """Test that splits written as CSV before the format changed are still read."""
+        save_dataset.fn(self.df, "customer_churn", suffix="test", file_format="csv")
+        
+        df = read_processed_dataset("customer_churn", "test")
+        self.assertEqual(df["tenure"].tolist(), [1, 12, 24, 72])
+        self.assertEqual(df["contract"].tolist(), self.df["contract"].tolist())
+        with self.assertRaises(FileNotFoundError):
+            read_processed_dataset("customer_churn", "val")
+
+
+if __name__ == "__main__":
+    unittest.main()
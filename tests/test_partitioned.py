@@ -0,0 +1,68 @@
+"""
+Tests for partitioned Parquet datasets.
+"""
+
+import os
+import tempfile
+import unittest
+import pandas as pd
+from flows.partitioned import PartitionedDatasetWriter, iter_partitioned_chunks, read_partitioned
+
+
+class TestPartitioned(unittest.TestCase):
+    """Test cases for writing and reading partitioned datasets."""
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "churn")
+        self.df = pd.DataFrame({
+            "customer_id": range(6),
+            "contract_type": ["Month-to-month", "One year", "Two year"] * 2,
+            "tenure": [1, 12, 24, 3, 18, 36],
+        })
+        with PartitionedDatasetWriter(self.path, ["contract_type"]) as writer:
+            writer.write(self.df)
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def test_filters_and_projection(self):
+        """Test that only matching rows and requested columns are read."""
+        df = read_partitioned(
+            self.path,
+            columns=["customer_id", "tenure"],
+            filters=[("contract_type", "==", "One year"), ("tenure", ">", 12)],
+        )
+        self.assertEqual(list(df.columns), ["customer_id", "tenure"])
+        self.assertEqual(df["customer_id"].tolist(), [4])
+    
+    def test_append_keeps_other_partitions(self):
+        """Test that appending only adds files to the new rows' partitions."""
+        two_year = os.path.join(self.path, "contract_type=Two%20year")
+        files = sorted(os.listdir(two_year))
+        
+        new = pd.DataFrame({"customer_id": [6], "contract_type": ["One year"], "tenure": [5]})
+        with PartitionedDatasetWriter(self.path, ["contract_type"], mode="append") as writer:
+            writer.write(new)
+        
+        self.assertEqual(sorted(os.listdir(two_year)), files)
+        self.assertEqual(len(read_partitioned(self.path)), 7)
+    
+    def test_replace_partitions(self):
+        """Test that only the partitions in the new data are replaced."""
+        new = pd.DataFrame({"customer_id": [6], "contract_type": ["One year"], "tenure": [5]})
+        with PartitionedDatasetWriter(self.path, ["contract_type"], mode="replace_partitions") as writer:
+            writer.write(new)
+        
+        df = read_partitioned(self.path).sort_values("customer_id")
+        self.assertEqual(df["customer_id"].tolist(), [0, 2, 3, 5, 6])
+    
+    def test_chunks(self):
+        """Test that chunked reads return every matching row."""
+        chunks = list(iter_partitioned_chunks(self.path, 1, filters=[("tenure", "<", 20)]))
+        self.assertEqual(sum(len(chunk) for chunk in chunks), 4)
+        self.assertTrue(all(len(chunk) == 1 for chunk in chunks))
+
+
+if __name__ == "__main__":
+    unittest.main()
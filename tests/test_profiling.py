@@ -0,0 +1,62 @@
+"""
+Tests for the dataset profiler used by the data processing flows.
+"""
+
+import unittest
+import numpy as np
+import pandas as pd
+from flows.profiling import profile_dataframe, hyperloglog_count
+
+
+class TestProfiling(unittest.TestCase):
+    """Test cases for dataset profiling."""
+    
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.df = pd.DataFrame({
+            "tenure": rng.integers(0, 72, 500),
+            "charges": rng.uniform(10, 120, 500),
+            "contract": rng.choice(["Month-to-month", "One year", "Two year"], 500),
+        })
+        self.df.loc[::25, "charges"] = np.nan
+        self.df["tenure_group"] = pd.cut(self.df["tenure"], bins=[0, 24, 48, 72])
+    
+    def test_exact_profile_matches_pandas(self):
+        """Test that exact statistics match the per-column pandas results."""
+        analysis = profile_dataframe(self.df, "test", approximate=False)
+        
+        self.assertEqual(analysis["shape"], self.df.shape)
+        self.assertEqual(analysis["missing_values"]["charges"], 20)
+        
+        for col, stats in analysis["numeric_stats"].items():
+            for stat, value in stats.items():
+                self.assertAlmostEqual(value, getattr(self.df[col], stat)(), places=8)
+        
+        for col, stats in analysis["categorical_stats"].items():
+            self.assertEqual(stats["unique_values"], self.df[col].nunique())
+            self.assertEqual(stats["top_values"], self.df[col].value_counts().head(5).to_dict())
+    
+    def test_nullable_and_empty_numeric_columns(self):
+        """Test that nullable and all-missing numeric columns are profiled per column."""
+        df = pd.DataFrame({
+            "seats": pd.array([1, None, 3, 4], dtype="Int16"),
+            "discount": [np.nan] * 4,
+        })
+        stats = profile_dataframe(df, "test", approximate=False)["numeric_stats"]
+        
+        self.assertEqual((stats["seats"]["min"], stats["seats"]["max"], stats["seats"]["median"]), (1.0, 4.0, 3.0))
+        self.assertAlmostEqual(stats["seats"]["std"], df["seats"].std(), places=8)
+        self.assertTrue(all(np.isnan(value) for value in stats["discount"].values()))
+    
+    def test_hyperloglog_count(self):
+        """Test that HyperLogLog estimates are close to the true distinct count."""
+        self.assertEqual(hyperloglog_count(pd.Series([], dtype=object)), 0)
+        self.assertEqual(hyperloglog_count(pd.Series(["a", "b", "a", None])), 2)
+        
+        values = pd.Series(np.arange(200_000) % 50_000).astype(str)
+        estimate = hyperloglog_count(values)
+        self.assertLess(abs(estimate - 50_000) / 50_000, 0.03)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,152 @@
+"""
+Tests for chunked batch scoring.
+"""
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+import joblib
+import numpy as np
+import pandas as pd
+from prefect.logging import disable_run_logger
+from sklearn.compose import ColumnTransformer
+from sklearn.impute import SimpleImputer
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+from flows.data_flows import clean_dataset, compute_chunk_statistics, transform_dataset
+from flows.ml_flows import batch_predict
+from flows.scoring import score_chunks, write_predictions
+from flows.utils import download_dataset, load_dataset, load_model
+
+
+class TestScoring(unittest.TestCase):
+    """Test cases for batch scoring."""
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        rng = np.random.default_rng(0)
+        self.df = pd.DataFrame({
+            "customerID": [f"C{i:04d}" for i in range(1000)],
+            "tenure": rng.integers(0, 72, 1000),
+            "contract": rng.choice(["Month-to-month", "One year", "Two year"], 1000),
+        })
+        y = (self.df["tenure"] > 36).astype(int)
+        
+        self.model = Pipeline([
+            ("preprocessor", ColumnTransformer([
+                ("num", StandardScaler(), ["tenure"]),
+                ("cat", OneHotEncoder(handle_unknown="ignore"), ["contract"]),
+            ])),
+            ("model", LogisticRegression()),
+        ]).fit(self.df[["tenure", "contract"]], y)
+        self.model_path = os.path.join(self.tmp.name, "model.joblib")
+        joblib.dump(self.model, self.model_path)
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def test_parallel_scoring_matches_predict(self):
+        """Test that worker processes score chunks in input order."""
+        chunks = (self.df.iloc[start:start + 150] for start in range(0, len(self.df), 150))
+        output_path = os.path.join(self.tmp.name, "predictions.parquet")
+        rows, n_chunks = write_predictions(
+            score_chunks(self.model, self.model_path, chunks, ["customerID"], max_workers=2), output_path
+        )
+        
+        self.assertEqual((rows, n_chunks), (1000, 7))
+        result = pd.read_parquet(output_path)
+        self.assertEqual(list(result.columns), ["customerID", "prediction", "probability_0", "probability_1"])
+        self.assertEqual(result["customerID"].tolist(), self.df["customerID"].tolist())
+        np.testing.assert_array_equal(result["prediction"], self.model.predict(self.df))
+    
+    def test_empty_input(self):
+        """Test that no output file is left behind when there is nothing to score."""
+        output_path = os.path.join(self.tmp.name, "predictions.parquet")
+        with self.assertRaises(ValueError):
+            write_predictions(score_chunks(self.model, self.model_path, iter([])), output_path)
+        self.assertEqual(os.listdir(self.tmp.name), ["model.joblib"])
+
+
+class TestBatchPredict(unittest.TestCase):
+    """Test cases for scoring raw dataset files with the batch prediction flow."""
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+        os.makedirs("data/raw")
+        
+        self.enterContext(disable_run_logger())
+        for module in ["data_flows", "ml_flows", "utils"]:
+            self.enterContext(mock.patch(f"flows.{module}.create_markdown_artifact"))
+        self.enterContext(mock.patch("flows.ml_flows.log_flow_run_info"))
+        for name, task in [
+            ("download_dataset", download_dataset),
+            ("compute_chunk_statistics", compute_chunk_statistics),
+            ("load_model", load_model),
+        ]:
+            self.enterContext(mock.patch(f"flows.ml_flows.{name}", task.fn))
+        
+        # Raw churn rows, with blank TotalCharges and Yes/No columns to clean
+        ids = np.arange(400)
+        raw = pd.DataFrame({
+            "customerID": [f"C{i:04d}" for i in ids],
+            "tenure": ids % 72 + 1,
+            "Contract": np.array(["Month-to-month", "One year", "Two year"])[ids % 3],
+            "Partner": np.where(ids % 2 == 0, "Yes", "No"),
+            "MonthlyCharges": np.round(20 + ids % 50 * 1.5, 2),
+            "TotalCharges": [" " if i % 37 == 0 else f"{(i % 72 + 1) * 30.0:.1f}" for i in ids],
+            "Churn": np.where((ids % 3 == 0) | (ids % 72 < 6), "Yes", "No"),
+        })
+        raw.to_csv("data/raw/customer_churn.csv", index=False)
+        raw.drop(columns="Churn").to_csv("new_customers.csv", index=False)
+        
+        # A model trained on the in-memory processed rows
+        self.processed = transform_dataset.fn(
+            clean_dataset.fn(load_dataset.fn(Path("data/raw/customer_churn.csv")), "customer_churn"),
+            "customer_churn",
+        )
+        self.model = Pipeline([
+            ("preprocessor", ColumnTransformer([
+                ("num", Pipeline([("impute", SimpleImputer()), ("scale", StandardScaler())]),
+                 ["tenure", "Partner", "MonthlyCharges", "TotalCharges"]),
+                ("cat", OneHotEncoder(handle_unknown="ignore"), ["Contract", "tenure_group"]),
+            ])),
+            ("model", LogisticRegression()),
+        ]).fit(self.processed.drop(columns=["customerID", "Churn"]), self.processed["Churn"])
+        joblib.dump(self.model, "model.joblib")
+    
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+    
+    def test_scores_raw_csv(self):
+        """Test that raw rows are cleaned and transformed like the training data before scoring."""
+        expected = self.model.predict(self.processed)
+        
+        for max_workers in [1, 2]:
+            summary = batch_predict.fn(
+                "customer_churn",
+                "new_customers.csv",
+                model_path="model.joblib",
+                output_path="predictions.parquet",
+                chunksize=64,
+                max_workers=max_workers,
+            )
+            self.assertEqual((summary["rows"], summary["chunks"]), (400, 7))
+            
+            result = pd.read_parquet("predictions.parquet")
+            self.assertEqual(result["customerID"].tolist(), self.processed["customerID"].tolist())
+            np.testing.assert_array_equal(result["prediction"], expected)
+        
+        # Processed rows are scored as they are
+        self.processed.to_parquet("processed.parquet")
+        batch_predict.fn("customer_churn", "processed.parquet", "model.joblib", "predictions.parquet", preprocess=False)
+        np.testing.assert_array_equal(pd.read_parquet("predictions.parquet")["prediction"], expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
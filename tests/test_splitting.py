@@ -0,0 +1,61 @@
+"""
+Tests for the hash-based dataset splitting engine.
+"""
+
+import unittest
+import numpy as np
+import pandas as pd
+from flows.splitting import assign_splits_by_hash, split_indices
+
+
+class TestSplitting(unittest.TestCase):
+    """Test cases for hash-based splitting."""
+    
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.df = pd.DataFrame({
+            "customer_id": [f"{i:05d}-XYZ" for i in range(10_000)],
+            "tenure": rng.integers(0, 72, 10_000),
+            "label": rng.choice(["a", "b", "c"], 10_000, p=[0.6, 0.3, 0.1]),
+        })
+    
+    def test_split_sizes_and_coverage(self):
+        """Test that every row lands in exactly one split of about the right size."""
+        indices = split_indices(self.df, key="customer_id", test_size=0.2, val_size=0.1)
+        
+        combined = np.sort(np.concatenate(list(indices.values())))
+        np.testing.assert_array_equal(combined, np.arange(len(self.df)))
+        self.assertAlmostEqual(len(indices["test"]) / len(self.df), 0.2, delta=0.02)
+        self.assertAlmostEqual(len(indices["val"]) / len(self.df), 0.1, delta=0.02)
+    
+    def test_assignment_is_stable_when_rows_are_added(self):
+        """Test that existing rows keep their split when new rows arrive."""
+        before = assign_splits_by_hash(self.df["customer_id"].iloc[:6000])
+        after = assign_splits_by_hash(self.df["customer_id"].sample(frac=1, random_state=1))
+        after = pd.Series(after, index=self.df["customer_id"].sample(frac=1, random_state=1))
+        
+        np.testing.assert_array_equal(before, after.loc[self.df["customer_id"].iloc[:6000]].to_numpy())
+    
+    def test_seed_changes_assignment(self):
+        """Test that a different seed gives a different assignment."""
+        first = assign_splits_by_hash(self.df["customer_id"], random_state=1)
+        second = assign_splits_by_hash(self.df["customer_id"], random_state=2)
+        self.assertFalse(np.array_equal(first, second))
+    
+    def test_stratified_split_matches_proportions(self):
+        """Test that stratified splits keep the label proportions exactly."""
+        indices = split_indices(self.df, key="customer_id", stratify="label")
+        
+        overall = self.df["label"].value_counts()
+        test_counts = self.df["label"].iloc[indices["test"]].value_counts()
+        for label, count in overall.items():
+            self.assertEqual(test_counts[label], round(count * 0.2))
+    
+    def test_invalid_sizes(self):
+        """Test that split sizes adding up to the whole dataset are rejected."""
+        with self.assertRaises(ValueError):
+            split_indices(self.df, test_size=0.6, val_size=0.4)
+
+
+if __name__ == "__main__":
+    unittest.main()
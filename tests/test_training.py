@@ -0,0 +1,161 @@
+"""
+Tests for the model training helpers.
+"""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+import pandas as pd
+from sklearn.compose import ColumnTransformer
+from sklearn.ensemble import HistGradientBoostingClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import cross_val_score
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder, OrdinalEncoder, StandardScaler
+from flows.config import FOLD_CACHE_SETTINGS
+from flows.folds import FoldEnsemble, build_fold_cache, cross_validate_folds, evict_fold_caches, fold_cache_key
+from flows.ml_flows import allocate_cores, categorical_feature_indices, create_model, resolve_engine
+
+
+class TestTraining(unittest.TestCase):
+    """Test cases for model training."""
+    
+    def test_allocate_cores(self):
+        """Test that the core budget is split without oversubscription."""
+        self.assertEqual(allocate_cores(3, budget=12), (3, 4))
+        self.assertEqual(allocate_cores(3, budget=2), (2, 1))
+        self.assertEqual(allocate_cores(1, budget=8), (1, 8))
+        for n_models, budget in [(3, 1), (3, 7), (6, 16)]:
+            parallel, cores = allocate_cores(n_models, budget=budget)
+            self.assertLessEqual(parallel * cores, budget)
+
+    def test_fold_cache_matches_pipeline_cv(self):
+        """Test that precomputed folds give the scores of refitting per fold."""
+        rng = np.random.default_rng(0)
+        X = pd.DataFrame({
+            "tenure": rng.integers(0, 72, 200),
+            "charges": rng.normal(60, 20, 200),
+            "contract": rng.choice(["Month-to-month", "One year", "Two year"], 200),
+        })
+        y = pd.Series((X["tenure"] + rng.normal(0, 10, 200) > 36).astype(int))
+        preprocessor = ColumnTransformer([
+            ("num", StandardScaler(), ["tenure", "charges"]),
+            ("cat", OneHotEncoder(handle_unknown="ignore"), ["contract"]),
+        ])
+        model = LogisticRegression()
+        
+        original_dir = FOLD_CACHE_SETTINGS["cache_dir"]
+        with tempfile.TemporaryDirectory() as cache_dir:
+            FOLD_CACHE_SETTINGS["cache_dir"] = cache_dir
+            try:
+                folds = build_fold_cache(X, y, preprocessor, 5, classification=True)
+                self.assertFalse(folds["cached"])
+                self.assertEqual(folds["preprocessor_fits"], 6)
+                self.assertTrue(build_fold_cache(X, y, preprocessor, 5, classification=True)["cached"])
+                
+                results = cross_validate_folds(model, folds, y, "accuracy")
+            finally:
+                FOLD_CACHE_SETTINGS["cache_dir"] = original_dir
+        
+        expected = cross_val_score(
+            Pipeline([("preprocessor", preprocessor), ("model", model)]), X, y, cv=5, scoring="accuracy"
+        )
+        np.testing.assert_allclose(results["test_score"], expected)
+        
+        # The fold models score raw data and combine into a deployable model
+        ensemble = FoldEnsemble(results["estimator"])
+        self.assertEqual(ensemble.classes_.tolist(), [0, 1])
+        self.assertEqual(ensemble.predict_proba(X).shape, (200, 2))
+        self.assertGreater((ensemble.predict(X) == y).mean(), expected.mean() - 0.05)
+
+    def test_hist_engine(self):
+        """Test that the hist engine splits on the ordinal-encoded categories."""
+        self.assertEqual(resolve_engine("gradient_boosting", "iris"), "gradient_boosting")
+        self.assertEqual(resolve_engine("gradient_boosting", "iris", engine="hist"), "hist_gradient_boosting")
+        with self.assertRaises(ValueError):
+            resolve_engine("random_forest", "iris", engine="hist")
+        
+        X = pd.DataFrame({
+            "tenure": [1, 12, 24, 36, 48, 60] * 10,
+            "contract": ["Month-to-month", "One year", None, "Two year", "One year", "Two year"] * 10,
+        })
+        y = pd.Series([1, 1, 0, 0, 0, 0] * 10)
+        preprocessor = ColumnTransformer([
+            ("num", "passthrough", ["tenure"]),
+            ("cat", OrdinalEncoder(unknown_value=np.nan, handle_unknown="use_encoded_value"), ["contract"]),
+        ])
+        self.assertEqual(categorical_feature_indices(preprocessor), [1])
+        
+        model = create_model("hist_gradient_boosting", "classification", {"max_iter": 20})
+        model.set_params(categorical_features=categorical_feature_indices(preprocessor))
+        pipeline = Pipeline([("preprocessor", preprocessor), ("model", model)]).fit(X, y)
+        self.assertEqual(pipeline.predict(pd.DataFrame({"tenure": [5], "contract": ["Unknown"]})).shape, (1,))
+
+    def test_hist_hyperparameters(self):
+        """Test that classic boosting hyperparameters map to the hist engine or are rejected."""
+        model = create_model("hist_gradient_boosting", "classification", {"n_estimators": 50, "max_depth": 3})
+        self.assertEqual((model.max_iter, model.max_depth), (50, 3))
+        with self.assertRaises(ValueError):
+            create_model("hist_gradient_boosting", "classification", {"min_samples_split": 4})
+    
+    def test_early_stopping_on_validation_split(self):
+        """Test that fold models stop early on the preprocessed validation split."""
+        rng = np.random.default_rng(0)
+        X = pd.DataFrame({"tenure": rng.integers(0, 72, 300), "charges": rng.normal(60, 20, 300)})
+        y = pd.Series((X["tenure"] + rng.normal(0, 10, 300) > 36).astype(int))
+        X_val, y_val = X.iloc[:50] + 1, y.iloc[:50]
+        model = create_model("hist_gradient_boosting", "classification", {"max_iter": 50, "early_stopping": True})
+        
+        original_dir = FOLD_CACHE_SETTINGS["cache_dir"]
+        with tempfile.TemporaryDirectory() as cache_dir:
+            FOLD_CACHE_SETTINGS["cache_dir"] = cache_dir
+            try:
+                folds = build_fold_cache(X, y, StandardScaler(), 3, classification=True)
+                fit = HistGradientBoostingClassifier.fit
+                with mock.patch.object(HistGradientBoostingClassifier, "fit", autospec=True, side_effect=fit) as spy:
+                    results = cross_validate_folds(model, folds, y, "accuracy", validation=(X_val, y_val))
+            finally:
+                FOLD_CACHE_SETTINGS["cache_dir"] = original_dir
+        
+        self.assertEqual(spy.call_count, 3)
+        for call, estimator in zip(spy.call_args_list, results["estimator"]):
+            # The whole fold is trained on and the split is scaled like it
+            self.assertEqual(len(call.args[2]), 200)
+            np.testing.assert_allclose(call.kwargs["X_val"], estimator["preprocessor"].transform(X_val))
+            self.assertEqual(len(estimator["model"].validation_score_), estimator["model"].n_iter_ + 1)
+
+    def test_fold_cache_key_and_eviction(self):
+        """Test that fold caches are keyed by content hashes and evicted by age and size."""
+        rng = np.random.default_rng(0)
+        X = pd.DataFrame({"tenure": rng.integers(0, 72, 200), "charges": rng.normal(60, 20, 200)})
+        y = pd.Series((X["tenure"] > 36).astype(int))
+        
+        def key(X, y, cv_folds=3):
+            return fold_cache_key(X, y, StandardScaler(), cv_folds, True)
+        
+        self.assertEqual(key(X, y), key(X.copy(), y.copy()))
+        self.assertNotEqual(key(X, y), key(X * 2, y))
+        self.assertNotEqual(key(X, y), key(X, 1 - y))
+        self.assertNotEqual(key(X, y), key(X, y, cv_folds=5))
+        
+        original = dict(FOLD_CACHE_SETTINGS)
+        with tempfile.TemporaryDirectory() as cache_dir:
+            FOLD_CACHE_SETTINGS.update(cache_dir=cache_dir, max_age_days=1, max_size_mb=None)
+            try:
+                old = build_fold_cache(X, y, StandardScaler(), 3, classification=True)
+                os.utime(old["directory"], (0, 0))
+                new = build_fold_cache(X + 1, y, StandardScaler(), 3, classification=True)
+                self.assertEqual(os.listdir(cache_dir), [os.path.basename(new["directory"])])
+                
+                # The least recently used cache goes first when over the size limit
+                FOLD_CACHE_SETTINGS.update(max_age_days=None, max_size_mb=0)
+                self.assertEqual(evict_fold_caches(keep=new["key"]), [])
+                self.assertEqual(evict_fold_caches(), [new["key"]])
+            finally:
+                FOLD_CACHE_SETTINGS.update(original)
+
+
+if __name__ == "__main__":
+    unittest.main()
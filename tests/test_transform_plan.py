@@ -0,0 +1,92 @@
+"""
+Tests for the compiled transformation plans used by the ETL flows.
+"""
+
+import unittest
+import numpy as np
+import pandas as pd
+from flows.transform_plan import compile_transformations, execute_plan
+
+
+class TestTransformPlan(unittest.TestCase):
+    """Test cases for transformation planning."""
+    
+    def setUp(self):
+        self.df = pd.DataFrame({
+            "a": [1.0, np.nan, 3.0, 4.0, np.nan],
+            "b": [10, 20, 30, 40, 50],
+            "c": ["x", "y", None, "y", "x"],
+            "d": ["Yes", "No", "Yes", "No", "Yes"],
+        })
+        self.transformations = [
+            {"type": "rename_columns", "mapping": {"a": "alpha"}},
+            {"type": "rename_columns", "mapping": {"alpha": "first", "b": "second"}},
+            {"type": "create_feature", "name": "double", "expression": "second * 2"},
+            {"type": "fill_missing", "columns": ["first"], "method": "median"},
+            {"type": "fill_missing", "columns": ["c"], "method": "value", "value": "z"},
+            {"type": "encode_categorical", "columns": ["c"], "method": "one_hot"},
+            {"type": "filter_rows", "condition": "second > 10"},
+            {"type": "drop_columns", "columns": ["d"]},
+            {"type": "drop_columns", "columns": ["double"]},
+        ]
+    
+    def test_plan_merges_steps(self):
+        """Test that adjacent renames, fills and drops are merged."""
+        plan = compile_transformations(self.transformations)
+        
+        self.assertEqual(
+            [step["type"] for step in plan],
+            ["rename_columns", "create_feature", "fill_missing",
+             "encode_categorical", "filter_rows", "drop_columns"],
+        )
+        self.assertEqual(plan[0]["mapping"], {"a": "first", "b": "second"})
+        self.assertEqual(plan[-1]["columns"], ["d", "double"])
+    
+    def test_filter_pushdown(self):
+        """Test that filters move ahead of row-independent steps only."""
+        plan = compile_transformations([
+            {"type": "create_feature", "name": "double", "expression": "b * 2"},
+            {"type": "encode_binary", "columns": ["d"]},
+            {"type": "filter_rows", "condition": "b > 10"},
+            {"type": "filter_rows", "condition": "double < 100"},
+        ])
+        
+        self.assertEqual(
+            [step["type"] for step in plan],
+            ["filter_rows", "create_feature", "filter_rows", "encode_binary"],
+        )
+        self.assertEqual(plan[0]["condition"], "b > 10")
+        
+        plan = compile_transformations([
+            {"type": "normalize", "columns": ["b"]},
+            {"type": "filter_rows", "condition": "a > 1"},
+        ])
+        self.assertEqual([step["type"] for step in plan], ["normalize", "filter_rows"])
+    
+    def test_execute_matches_steps(self):
+        """Test that the compiled plan gives the step-by-step result."""
+        expected = self.df.rename(columns={"a": "first", "b": "second"})
+        expected["first"] = expected["first"].fillna(expected["first"].median())
+        expected["c"] = expected["c"].fillna("z")
+        expected = pd.get_dummies(expected, columns=["c"], prefix=["c"])
+        expected = expected.query("second > 10").drop(columns=["d"])
+        
+        result = execute_plan(self.df, compile_transformations(self.transformations))
+        
+        pd.testing.assert_frame_equal(result, expected)
+        self.assertEqual(self.df["a"].isna().sum(), 2)
+    
+    def test_validation(self):
+        """Test that invalid configurations are rejected up front."""
+        for transformations in [
+            [{"type": "unknown"}],
+            [{"type": "filter_rows"}],
+            [{"type": "normalize", "method": "log"}],
+            [{"type": "fill_missing", "method": "value"}],
+        ]:
+            with self.assertRaises(ValueError):
+                compile_transformations(transformations)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+"""
+Tests for the hyperparameter search.
+"""
+
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import StandardScaler
+from flows.config import FOLD_CACHE_SETTINGS, TUNING_SETTINGS
+from flows.folds import build_fold_cache
+from flows.tuning import grid_candidates, run_search, sample_candidates, validate_space
+
+
+class TestTuning(unittest.TestCase):
+    """Test cases for the hyperparameter search."""
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.settings = FOLD_CACHE_SETTINGS["cache_dir"], TUNING_SETTINGS["cache_dir"]
+        FOLD_CACHE_SETTINGS["cache_dir"] = f"{self.tmp.name}/folds"
+        TUNING_SETTINGS["cache_dir"] = f"{self.tmp.name}/trials"
+        
+        rng = np.random.default_rng(0)
+        self.X = pd.DataFrame({"tenure": rng.integers(0, 72, 600), "charges": rng.normal(60, 20, 600)})
+        self.y = pd.Series((self.X["tenure"] + rng.normal(0, 10, 600) > 36).astype(int))
+        self.folds = build_fold_cache(self.X, self.y, StandardScaler(), 3, classification=True)
+    
+    def tearDown(self):
+        FOLD_CACHE_SETTINGS["cache_dir"], TUNING_SETTINGS["cache_dir"] = self.settings
+        self.tmp.cleanup()
+    
+    def test_spaces(self):
+        """Test that grids and sampled candidates follow the declared spaces."""
+        self.assertEqual(len(grid_candidates({"C": [0.1, 1.0], "penalty": ["l1", "l2", None]})), 6)
+        with self.assertRaises(ValueError):
+            grid_candidates({"C": {"low": 0.1, "high": 10.0}})
+        with self.assertRaises(ValueError):
+            validate_space({"C": {"low": 0.0, "high": 10.0, "log": True}})
+        
+        space = {"C": {"low": 0.01, "high": 100.0, "log": True}, "max_iter": {"low": 10, "high": 20, "type": "int"}}
+        for params in sample_candidates(space, 50, np.random.default_rng(0)):
+            self.assertTrue(0.01 <= params["C"] <= 100.0)
+            self.assertIsInstance(params["max_iter"], int)
+    
+    def test_search_resumes_from_cache(self):
+        """Test that a repeated search reuses every cached trial."""
+        space = {"C": {"low": 0.001, "high": 100.0, "log": True}}
+        first = run_search(LogisticRegression(), space, self.folds, self.y, "accuracy", method="random", n_trials=6)
+        self.assertEqual(first["cached_trials"], 0)
+        
+        second = run_search(LogisticRegression(), space, self.folds, self.y, "accuracy", method="random", n_trials=6)
+        self.assertEqual(second["cached_trials"], 6)
+        self.assertEqual(second["best_params"], first["best_params"])
+    
+    def test_halving_ends_on_all_rows(self):
+        """Test that successive halving narrows candidates down to full-data trials."""
+        space = {"C": [0.001, 0.01, 0.1, 1.0, 10.0, 100.0]}
+        search = run_search(LogisticRegression(), space, self.folds, self.y, "accuracy", method="halving")
+        
+        rungs = [t["n_samples"] for t in search["trials"]]
+        self.assertLess(rungs[0], 400)
+        self.assertEqual(rungs.count(rungs[0]), 6)
+        self.assertEqual(rungs.count(None), 2)
+        self.assertIn(search["best_params"]["C"], space["C"])
+
+
+if __name__ == "__main__":
+    unittest.main()